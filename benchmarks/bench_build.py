@@ -0,0 +1,305 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark the build pipeline on a synthetic project. Each stage is timed
+separately: scanning (`Sources`), `ScriptSetProcessor`, `py_compile`,
+`RewriteManifest` and `ZipUpdater`.
+
+Usage:
+    python benchmarks/bench_build.py --output results.json
+    python benchmarks/bench_build.py --baseline results.json
+
+With `--baseline`, the medians are compared to the saved results and the
+exit code is 1 if a stage is slower than the tolerance allows.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+from typing import Any, TypeVar
+from zipfile import ZIP_DEFLATED, ZipFile
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(ROOT_DIR / "py4lo"))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import toml
+from blob_cache import BlobCache
+from bytecode_compiler import BYTECODE_DIR_NAME, BytecodeCompiler
+from callbacks import (
+    ARC_SCRIPTS_PATH,
+    AddAssets,
+    AddScripts,
+    IgnoreItem,
+    RewriteManifest,
+)
+from compression_policy import create_compression_policy
+from core.asset import deduplicate_assets
+from core.script_hashes import create_script_hashes
+from core.source_dest import Destinations, Sources
+from directives import DirectiveProvider
+from script_set_processor import ScriptSetProcessor
+from synthetic_project import (
+    ProjectParameters,
+    SyntheticProject,
+    generate_project,
+)
+from zip_updater import ZipUpdaterBuilder
+
+RESULTS_VERSION = 1
+STAGES = ("scan", "script_set_processor", "py_compile", "rewrite_manifest",
+          "zip_updater")
+T = TypeVar('T')
+
+
+class StageTimer:
+    """Collect the durations of the stages, run after run"""
+
+    def __init__(self):
+        self.durations = {stage: [] for stage in STAGES
+                          }  # type: dict[str, list[float]]
+
+    def time(self, stage: str, func: Callable[[], T]) -> T:
+        """
+        @param stage: the stage name
+        @param func: the function to time
+        @return: the result of the function
+        """
+        start = time.perf_counter()
+        ret = func()
+        self.durations[stage].append(time.perf_counter() - start)
+        return ret
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {stage: {
+            "min": min(durations),
+            "median": statistics.median(durations),
+            "mean": statistics.fmean(durations),
+            "runs": durations,
+        } for stage, durations in self.durations.items() if durations}
+
+
+def run_once(logger: logging.Logger, project: SyntheticProject,
+             work_dir: Path, timer: StageTimer,
+             blob_cache: BlobCache | None):
+    """
+    Run the pipeline once, as `UpdateCommand` does, stage by stage.
+    """
+    python_version = "{}.{}".format(*sys.version_info[:2])
+    sources = Sources(project.source_ods_file, project.inc_dir,
+                      ROOT_DIR / "lib", project.src_dir, [], project.opt_dir,
+                      project.assets_dir, [], project.root / "test")
+    destinations = Destinations(work_dir / "dest.ods", work_dir / "temp",
+                                Path("Scripts/python"), Path("Assets"))
+
+    def scan():
+        return sources.get_src_scripts(), sources.get_assets()
+
+    source_scripts, source_assets = timer.time("scan", scan)
+
+    def process():
+        directive_provider = DirectiveProvider.create(
+            logger, sources, destinations.temp_dir)
+        return ScriptSetProcessor(
+            logger, destinations.temp_dir, python_version,
+            directive_provider, source_scripts).process()
+
+    temp_scripts = timer.time("script_set_processor", process)
+
+    bytecode_compiler = BytecodeCompiler(logger, sys.executable,
+                                         python_version)
+    temp_scripts = temp_scripts + timer.time(
+        "py_compile", lambda: bytecode_compiler.compile(
+            temp_scripts, destinations.temp_dir.joinpath(BYTECODE_DIR_NAME)))
+
+    scripts = destinations.to_destination_scripts(temp_scripts)
+    scripts.append(create_script_hashes(scripts, destinations.dest_dir))
+    assets = deduplicate_assets(
+        destinations.to_destination_assets(source_assets))
+
+    def rewrite_manifest():
+        with ZipFile(project.source_ods_file) as zin, ZipFile(
+                BytesIO(), "w", compression=ZIP_DEFLATED) as zout:
+            RewriteManifest(scripts, assets).call(
+                zin, zout, zin.getinfo("META-INF/manifest.xml"))
+
+    timer.time("rewrite_manifest", rewrite_manifest)
+
+    compression_policy = create_compression_policy(
+        logger, _load_default_toml()["dest"].get("compression", {}))
+    zip_updater = (
+        ZipUpdaterBuilder(logger)
+        .item(IgnoreItem(ARC_SCRIPTS_PATH))
+        .item(RewriteManifest(scripts, assets))
+        .after(AddScripts(logger, scripts))
+        .after(AddAssets(assets, compression_policy, blob_cache))
+        .build()
+    )
+    timer.time("zip_updater", lambda: zip_updater.update(
+        project.source_ods_file, destinations.dest_ods_file))
+
+
+def _load_default_toml() -> dict[str, Any]:
+    return toml.load(ROOT_DIR / "default-py4lo.toml")
+
+
+def run_benchmark(parameters: ProjectParameters, repeat: int,
+                  use_blob_cache: bool = False,
+                  project_dir: Path | None = None) -> dict[str, Any]:
+    """
+    @param parameters: the synthetic project parameters
+    @param repeat: the number of runs
+    @param use_blob_cache: if True, the assets compressed blobs are cached
+    (hence, the first run is cold and the others are warm)
+    @param project_dir: the project directory, or None for a temp dir
+    @return: the results, as a JSON-serializable dict
+    """
+    logger = logging.getLogger("py4lo.benchmarks")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        if project_dir is None:
+            project_dir = tmp_dir / "project"
+        project = generate_project(project_dir, parameters)
+        if use_blob_cache:
+            blob_cache = BlobCache(logger, tmp_dir / "assets-cache")
+        else:
+            blob_cache = None
+
+        timer = StageTimer()
+        for i in range(repeat):
+            work_dir = tmp_dir / f"run_{i}"
+            work_dir.mkdir()
+            run_once(logger, project, work_dir, timer, blob_cache)
+        dest_size = (tmp_dir / f"run_{repeat - 1}" / "dest.ods").stat().st_size
+
+        return {
+            "version": RESULTS_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": parameters.to_dict(),
+            "repeat": repeat,
+            "blob_cache": use_blob_cache,
+            "sizes": {
+                "source_ods": project.source_ods_file.stat().st_size,
+                "dest_ods": dest_size,
+            },
+            "stages": timer.summary(),
+        }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any],
+            tolerance: float, min_delta: float = 0.001
+            ) -> tuple[list[str], bool]:
+    """
+    Compare the medians of the stages.
+
+    @param baseline: the saved results
+    @param current: the new results
+    @param tolerance: the accepted slowdown (0.1 = 10 %)
+    @param min_delta: the differences below this duration (in s) are noise
+    @return: the report lines and True if there is a regression
+    """
+    lines = []
+    if baseline.get("parameters") != current.get("parameters"):
+        lines.append("Warning: the parameters differ from the baseline")
+    lines.append("{:<22} {:>12} {:>12} {:>8}".format(
+        "stage", "baseline ms", "current ms", "ratio"))
+    regression = False
+    for stage in STAGES:
+        try:
+            old = baseline["stages"][stage]["median"]
+            new = current["stages"][stage]["median"]
+        except KeyError:
+            continue
+        ratio = new / old if old else float("inf")
+        if abs(new - old) < min_delta:
+            status = ""
+        elif ratio > 1 + tolerance:
+            status = "SLOWER"
+            regression = True
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = ""
+        lines.append(f"{stage:<22} {old * 1000:>12.2f} {new * 1000:>12.2f}"
+                     f" {ratio:>8.2f} {status}".rstrip())
+    return lines, regression
+
+
+def get_args(argv: list[str]) -> argparse.Namespace:
+    defaults = ProjectParameters()
+    parser = argparse.ArgumentParser(
+        description="Benchmark the py4lo build pipeline")
+    parser.add_argument("--modules", type=int, default=defaults.modules)
+    parser.add_argument("--directive-density", type=float,
+                        default=defaults.directive_density,
+                        help="probability of a directive before a function")
+    parser.add_argument("--assets", type=int, default=defaults.assets)
+    parser.add_argument("--ods-rows", type=int, default=defaults.ods_rows)
+    parser.add_argument("--ods-pictures", type=int,
+                        default=defaults.ods_pictures)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--blob-cache", action="store_true",
+                        help="cache the compressed assets between runs")
+    parser.add_argument("--project-dir", type=Path,
+                        help="keep the synthetic project in this directory")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="write the JSON results to this file")
+    parser.add_argument("-b", "--baseline", type=Path,
+                        help="compare the results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="accepted slowdown vs the baseline")
+    parser.add_argument("--min-delta", type=float, default=0.001,
+                        help="ignore the differences below (in seconds)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = get_args(argv)
+    parameters = ProjectParameters(
+        args.modules, args.directive_density, args.assets, args.ods_rows,
+        args.ods_pictures, args.seed)
+    results = run_benchmark(parameters, args.repeat, args.blob_cache,
+                            args.project_dir)
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text, encoding="utf-8")
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    lines, regression = compare(baseline, results, args.tolerance,
+                                 args.min_delta)
+    print("\n".join(lines), file=sys.stderr)
+    return 1 if regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
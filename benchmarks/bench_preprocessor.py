@@ -0,0 +1,127 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Benchmark the directive preprocessor on files of growing sizes: the time
+and the allocation peak per line should stay flat.
+
+Usage:
+    python benchmarks/bench_preprocessor.py --lines 1000 10000 100000
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(ROOT_DIR / "py4lo"))
+
+from directive_processor import DirectiveProcessor
+from directives import DirectiveProvider
+from script_set_processor import _ContentParser
+
+# one block of 10 lines: code, comments and a branch
+_BLOCK = """\
+# a comment
+def f_{i}(*_args):
+    # another comment
+    return {i}
+
+# py4lo: if $python_version >= 3.0
+X_{i} = 3
+# py4lo: else
+X_{i} = 2
+# py4lo: endif"""
+
+
+def write_source(path: Path, lines: int):
+    """
+    @param path: the path of the source file
+    @param lines: the approximate number of lines
+    """
+    path.write_text("\n".join(_BLOCK.format(i=i)
+                              for i in range(lines // 10)) + "\n",
+                    encoding="utf-8")
+
+
+def parse(logger: logging.Logger, path: Path):
+    directive_provider = DirectiveProvider(logger, {})
+    directive_processor = DirectiveProcessor.create(
+        None, directive_provider, "3.11", None)
+    _ContentParser(logger, directive_processor, path).parse(True)
+
+
+def run_benchmark(sizes: list[int], repeat: int) -> list[dict[str, Any]]:
+    """
+    @param sizes: the number of lines of the files
+    @param repeat: the number of runs
+    @return: one result by size
+    """
+    logger = logging.getLogger("py4lo.benchmarks")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp, f"source_{size}.py")
+            write_source(path, size)
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                parse(logger, path)
+                durations.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            parse(logger, path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            median = statistics.median(durations)
+            results.append({
+                "lines": size,
+                "median": median,
+                "us_per_line": median / size * 1e6,
+                "peak_alloc": peak,
+                "peak_alloc_per_line": peak / size,
+            })
+    return results
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the py4lo directive preprocessor")
+    parser.add_argument("--lines", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", type=Path,
+                        help="write the JSON results to this file")
+    args = parser.parse_args(argv)
+    text = json.dumps(run_benchmark(args.lines, args.repeat), indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text, encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,197 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Generate a synthetic py4lo project: modules with directives, assets of
+mixed sizes and a large source .ods file. The generation is deterministic
+(seeded), hence two runs with the same parameters are comparable.
+"""
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+DIRECTIVE_KINDS = ("include", "embed lib", "embed script", "branch")
+EMBEDDED_LIBS = ("py4lo_typing", "py4lo_commons", "py4lo_helper", "py4lo_io",
+                 "py4lo_ods")
+FUNCTIONS_PER_MODULE = 20
+INCLUDES = 5
+OPT_SCRIPTS = 5
+
+_MANIFEST_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.3">
+ <manifest:file-entry manifest:full-path="/" manifest:version="1.3" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>
+ <manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>
+ <manifest:file-entry manifest:full-path="styles.xml" manifest:media-type="text/xml"/>
+"""
+_CONTENT_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" office:version="1.3">
+<office:body><office:spreadsheet><table:table table:name="Sheet1">
+"""
+_CONTENT_TAIL = """</table:table></office:spreadsheet></office:body>
+</office:document-content>
+"""
+
+
+@dataclass(frozen=True)
+class ProjectParameters:
+    """The parameters of a synthetic project"""
+    modules: int = 50
+    directive_density: float = 0.2  # directives per function
+    assets: int = 20
+    ods_rows: int = 20000
+    ods_pictures: int = 4
+    seed: int = 42
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class SyntheticProject:
+    """The paths of a generated project"""
+    root: Path
+    src_dir: Path
+    inc_dir: Path
+    opt_dir: Path
+    assets_dir: Path
+    source_ods_file: Path
+
+
+def generate_project(root: Path, parameters: ProjectParameters
+                     ) -> SyntheticProject:
+    """
+    @param root: the project directory (created if necessary)
+    @param parameters: the parameters
+    @return: the project
+    """
+    rnd = random.Random(parameters.seed)
+    project = SyntheticProject(
+        root, root / "src" / "main", root / "inc", root / "src" / "opt",
+        root / "src" / "assets", root / "source.ods")
+    for d in (project.src_dir, project.inc_dir, project.opt_dir,
+              project.assets_dir):
+        d.mkdir(parents=True, exist_ok=True)
+
+    for i in range(INCLUDES):
+        _write(project.inc_dir / f"inc_{i}.py", _functions(f"inc_{i}", 5))
+    for i in range(OPT_SCRIPTS):
+        _write(project.opt_dir / f"opt_{i}.py", _functions(f"opt_{i}", 5))
+    embedded = set()  # type: set[int]
+    for i in range(parameters.modules):
+        _write(project.src_dir / f"mod_{i}.py",
+               _module(i, parameters.directive_density, rnd, embedded))
+    for i in range(parameters.assets):
+        _write_asset(project.assets_dir, i, rnd)
+    _write_ods(project.source_ods_file, parameters, rnd)
+    return project
+
+
+def _write(path: Path, text: str):
+    path.write_text(text, encoding="utf-8")
+
+
+def _functions(prefix: str, count: int) -> str:
+    return "".join(_function(f"{prefix}_f{j}") for j in range(count))
+
+
+def _function(name: str) -> str:
+    return (f"\n\ndef {name}(*_args):\n"
+            f"    \"\"\"The function {name}\"\"\"\n"
+            f"    values = [x * x for x in range(10)]\n"
+            f"    return sum(values)\n")
+
+
+def _module(i: int, density: float, rnd: random.Random,
+            embedded: set[int]) -> str:
+    lines = ["# py4lo: embed lib py4lo_typing"]
+    for j in range(FUNCTIONS_PER_MODULE):
+        if rnd.random() < density:
+            lines.append(_directive(rnd, embedded))
+        lines.append(_function(f"mod_{i}_f{j}"))
+    return "\n".join(lines) + "\n"
+
+
+def _directive(rnd: random.Random, embedded: set[int]) -> str:
+    kind = rnd.choice(DIRECTIVE_KINDS)
+    if kind == "embed script" and len(embedded) < OPT_SCRIPTS:
+        # an opt script is embedded once: the archive has no duplicate entry
+        k = min(set(range(OPT_SCRIPTS)) - embedded)
+        embedded.add(k)
+        return f"# py4lo: embed script opt_{k}.py"
+    elif kind in ("include", "embed script"):
+        return f"# py4lo: include inc_{rnd.randrange(INCLUDES)}.py"
+    elif kind == "embed lib":
+        return f"# py4lo: embed lib {rnd.choice(EMBEDDED_LIBS)}"
+    else:
+        return ("# py4lo: if $python_version >= 3.0\n"
+                "BRANCH = 'py3'\n"
+                "# py4lo: elif $python_version >= 2.0\n"
+                "BRANCH = 'py2'\n"
+                "# py4lo: else\n"
+                "BRANCH = None\n"
+                "# py4lo: endif")
+
+
+def _write_asset(assets_dir: Path, i: int, rnd: random.Random):
+    """Mixed sizes and kinds: small texts, medium incompressible pictures
+    and large csv files"""
+    kind = i % 3
+    if kind == 0:
+        _write(assets_dir / f"asset_{i}.txt",
+               "\n".join(f"line {j}" for j in range(rnd.randrange(100, 500))))
+    elif kind == 1:
+        (assets_dir / f"asset_{i}.png").write_bytes(
+            rnd.randbytes(rnd.randrange(32, 256) * 1024))
+    else:
+        _write(assets_dir / f"asset_{i}.csv",
+               "\n".join(f"{j},{rnd.random()},value {j % 97}"
+                         for j in range(rnd.randrange(10000, 40000))))
+
+
+def _write_ods(path: Path, parameters: ProjectParameters,
+               rnd: random.Random):
+    pictures = [f"Pictures/picture_{i}.png"
+                for i in range(parameters.ods_pictures)]
+    manifest = _MANIFEST_HEAD + "".join(
+        f' <manifest:file-entry manifest:full-path="{p}"'
+        f' manifest:media-type="image/png"/>\n' for p in pictures
+    ) + "</manifest:manifest>\n"
+    with ZipFile(path, "w", compression=ZIP_DEFLATED) as zout:
+        zout.writestr("mimetype", "application/vnd.oasis.opendocument"
+                                  ".spreadsheet", compress_type=ZIP_STORED)
+        zout.writestr("META-INF/manifest.xml", manifest)
+        zout.writestr("styles.xml", "<?xml version=\"1.0\"?><office:document"
+                                    "-styles xmlns:office=\"urn:oasis:names"
+                                    ":tc:opendocument:xmlns:office:1.0\"/>")
+        with zout.open("content.xml", "w") as f:
+            f.write(_CONTENT_HEAD.encode("utf-8"))
+            for r in range(parameters.ods_rows):
+                f.write(_row(r, rnd).encode("utf-8"))
+            f.write(_CONTENT_TAIL.encode("utf-8"))
+        for picture in pictures:
+            zout.writestr(picture, rnd.randbytes(128 * 1024),
+                          compress_type=ZIP_STORED)
+
+
+def _row(r: int, rnd: random.Random) -> str:
+    return ("<table:table-row>"
+            f"<table:table-cell><text:p>row {r}</text:p></table:table-cell>"
+            f"<table:table-cell office:value-type=\"float\""
+            f" office:value=\"{rnd.random()}\"/>"
+            "</table:table-row>\n")
@@ -34,3 +34,166 @@ else:
     spath = uno.fileUrlToSystemPath(doc.URL+'/Scripts/python')
     if spath not in sys.path:
         sys.path.insert(0, spath)
+
+    def _py4lo_get_document_finder():
+        """Return the document finder. Install it on the first call."""
+        for finder in sys.meta_path:
+            if getattr(finder, "py4lo_document_finder", False):
+                return finder
+
+        import importlib.abc
+        import importlib.util
+        import marshal
+        import os
+        import zipfile
+
+        scripts_dir = "Scripts/python/"
+        # process-wide cache: (doc path, entry name, entry CRC) -> code
+        # object. The doc path is part of the key: the code objects hold
+        # the origin of the module.
+        code_cache = {}
+
+        class DocumentArchive:
+            """The scripts of a document, indexed by module name"""
+
+            def __init__(self, doc_path):
+                self.doc_path = doc_path
+                self.stamp = self._get_stamp()
+                self._infos = {}
+                self._data = {}
+                with zipfile.ZipFile(doc_path) as z:
+                    for info in z.infolist():
+                        name = info.filename
+                        if (not name.startswith(scripts_dir)
+                                or name.endswith("/")):
+                            continue
+                        self._infos[name] = info
+                        if name.endswith(".pyc") or (
+                                (doc_path, name, info.CRC) not in code_cache):
+                            self._data[name] = z.read(name)
+
+                # forget the code of the previous versions of the document
+                for key in list(code_cache):
+                    if key[0] == doc_path and (
+                            key[1] not in self._infos
+                            or self._infos[key[1]].CRC != key[2]):
+                        del code_cache[key]
+
+                # module name -> (entry name, is package)
+                self.modules = {}
+                for name in self._infos:
+                    if not name.endswith(".py"):
+                        continue
+                    parts = name[len(scripts_dir):-len(".py")].split("/")
+                    if parts[-1] == "__init__":
+                        self.modules[".".join(parts[:-1])] = (name, True)
+                    else:
+                        self.modules[".".join(parts)] = (name, False)
+
+            def _get_stamp(self):
+                stat = os.stat(self.doc_path)
+                return stat.st_mtime_ns, stat.st_size
+
+            def is_fresh(self):
+                try:
+                    return self.stamp == self._get_stamp()
+                except OSError:
+                    return False
+
+            def get_origin(self, name):
+                return self.doc_path + "/" + name
+
+            def get_code(self, name):
+                key = (self.doc_path, name, self._infos[name].CRC)
+                code = code_cache.get(key)
+                if code is None:
+                    source = self._get_data(name)
+                    code = self._get_bytecode(name, source)
+                    if code is None:
+                        code = compile(source, self.get_origin(name), "exec",
+                                       dont_inherit=True)
+                    code_cache[key] = code
+                return code
+
+            def _get_bytecode(self, name, source):
+                data = self._data.get(name + "c")
+                if (data is None
+                        or data[:4] != importlib.util.MAGIC_NUMBER
+                        or not int.from_bytes(data[4:8], "little") & 1
+                        or data[8:16] != importlib.util.source_hash(source)):
+                    return None
+                return marshal.loads(data[16:])  # nosec: B302
+
+            def get_source(self, name):
+                return self._get_data(name).decode("utf-8")
+
+            def _get_data(self, name):
+                data = self._data.get(name)
+                if data is None:
+                    with zipfile.ZipFile(self.doc_path) as z:
+                        data = z.read(name)
+                return data
+
+        class DocumentLoader(importlib.abc.Loader):
+            """Load a module from the document archive"""
+
+            def __init__(self, archive, name):
+                self._archive = archive
+                self._name = name
+
+            def create_module(self, spec):
+                return None
+
+            def exec_module(self, module):
+                exec(self._archive.get_code(self._name),  # nosec: B102 # noqa: S102
+                     module.__dict__)
+
+            def get_source(self, _fullname):
+                return self._archive.get_source(self._name)
+
+        class DocumentFinder(importlib.abc.MetaPathFinder):
+            """Find the modules in the archive of the current document"""
+            py4lo_document_finder = True
+
+            def __init__(self):
+                self._archives = {}
+                self._current = None
+
+            def set_document(self, doc_path):
+                archive = self._archives.get(doc_path)
+                if archive is None or not archive.is_fresh():
+                    archive = DocumentArchive(doc_path)
+                    self._archives[doc_path] = archive
+                self._current = archive
+
+            def find_spec(self, fullname, _path=None, _target=None):
+                archive = self._current
+                if archive is None or fullname not in archive.modules:
+                    return None
+                name, is_package = archive.modules[fullname]
+                origin = archive.get_origin(name)
+                spec = importlib.util.spec_from_loader(
+                    fullname, DocumentLoader(archive, name), origin=origin,
+                    is_package=is_package)
+                spec.has_location = True
+                if is_package:
+                    spec.submodule_search_locations.append(
+                        origin.rsplit("/", 1)[0])
+                return spec
+
+            def invalidate_caches(self):
+                self._archives.clear()
+
+        document_finder = DocumentFinder()
+        sys.meta_path.insert(0, document_finder)
+        return document_finder
+
+    # load the modules straight from the document archive. If it fails, the
+    # modules will be found in the sys.path (see above).
+    # noinspection PyBroadException
+    try:
+        _py4lo_get_document_finder().set_document(
+            uno.fileUrlToSystemPath(doc.URL))
+    except Exception: # nosec: B110 # noqa: S110
+        pass
+    del _py4lo_get_document_finder
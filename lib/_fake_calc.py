@@ -0,0 +1,744 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+An in-memory stand-in for a LibreOffice Calc document, to run and measure
+the py4lo libs without LibreOffice.
+
+It implements the subset of the UNO API used by py4lo: sheets, cells,
+ranges (`DataArray`, `FormulaArray`), cursors, rows and columns,
+`NumberFormats` and the `UndoManager`. Formulas are stored, not evaluated.
+
+Every UNO call (method call or property access) is counted and may be slowed
+down by a fixed latency, to emulate the UNO bridge:
+
+```
+engine = FakeCalcEngine(latency=20e-6)
+oDoc = engine.create_document()
+oSheet = oDoc.Sheets.getByIndex(0)
+oSheet.getCellRangeByPosition(0, 0, 1, 1).DataArray = (("a", 1), ("b", 2))
+print(engine.total_calls, engine.call_counts.most_common(3))
+```
+"""
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from _mock_constants import NumberFormat
+
+##############################
+# # DO NOT EMBED THIS FILE # #
+##############################
+
+MAX_COLUMN = 16383
+MAX_ROW = 1048575
+DEFAULT_COLUMN_WIDTH = 2258
+
+
+class FakeCalcEngine:
+    """
+    The engine counts the UNO calls and applies the latency.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        @param latency: the duration of each UNO call, in seconds
+        """
+        self.latency = latency
+        self.call_counts: Counter[str] = Counter()
+
+    def create_document(self, sheet_names: Sequence[str] = ("Sheet1",)
+                        ) -> "FakeDocument":
+        """
+        @param sheet_names: the names of the sheets
+        @return: a new document
+        """
+        return FakeDocument(self, sheet_names)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.call_counts.values())
+
+    def reset_counts(self):
+        self.call_counts.clear()
+
+    def call(self, name: str):
+        """
+        Record a UNO call.
+
+        @param name: the name of the call, e.g. "Cell.Value"
+        """
+        self.call_counts[name] += 1
+        if self.latency > 0:
+            # time.sleep is too coarse for a few microseconds
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+
+
+class _Struct:
+    """A UNO struct"""
+    typeName = "struct"
+
+    def __init__(self, **kwargs: Any):
+        self.__dict__.update(kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Struct) and self.__dict__ == other.__dict__
+
+    def __repr__(self) -> str:
+        return f"Struct({self.__dict__})"
+
+
+class _EnumValue:
+    """A UNO enum value, e.g. `oCell.Type.value == "TEXT"`"""
+    typeName = "enum"
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+EMPTY = _EnumValue("EMPTY")
+VALUE = _EnumValue("VALUE")
+TEXT = _EnumValue("TEXT")
+FORMULA = _EnumValue("FORMULA")
+
+
+class _CellData:
+    """The content of a cell"""
+    __slots__ = ("formula", "value")
+
+    def __init__(self, value: Any = None, formula: Optional[str] = None):
+        self.value = value  # None, float or str
+        self.formula = formula
+
+
+def _value_to_string(value: Any) -> str:
+    if value is None:
+        return ""
+    elif isinstance(value, str):
+        return value
+    elif float(value).is_integer():
+        return str(int(value))
+    else:
+        return repr(float(value))
+
+
+class FakeDocument:
+    """A spreadsheet document"""
+
+    def __init__(self, engine: FakeCalcEngine, sheet_names: Sequence[str]):
+        self._engine = engine
+        self._sheets = FakeSheets(engine, self, sheet_names)
+        self._number_formats = FakeNumberFormats(engine)
+        self._undo_manager = FakeUndoManager(engine)
+        self._controller = _FakeController(engine, self)
+
+    @property
+    def Sheets(self) -> "FakeSheets":
+        self._engine.call("Document.Sheets")
+        return self._sheets
+
+    @property
+    def NumberFormats(self) -> "FakeNumberFormats":
+        self._engine.call("Document.NumberFormats")
+        return self._number_formats
+
+    @property
+    def UndoManager(self) -> "FakeUndoManager":
+        self._engine.call("Document.UndoManager")
+        return self._undo_manager
+
+    @property
+    def CurrentController(self) -> "_FakeController":
+        self._engine.call("Document.CurrentController")
+        return self._controller
+
+    @property
+    def NullDate(self) -> _Struct:
+        self._engine.call("Document.NullDate")
+        return _Struct(Year=1899, Month=12, Day=30)
+
+    @property
+    def URL(self) -> str:
+        self._engine.call("Document.URL")
+        return ""
+
+
+class _FakeController:
+    def __init__(self, engine: FakeCalcEngine, oDoc: FakeDocument):
+        self._engine = engine
+        self._oDoc = oDoc
+        self._active_sheet: Optional[FakeSheet] = None
+
+    @property
+    def ActiveSheet(self) -> "FakeSheet":
+        self._engine.call("Controller.ActiveSheet")
+        if self._active_sheet is None:
+            return self._oDoc._sheets._sheets[0]
+        return self._active_sheet
+
+    @ActiveSheet.setter
+    def ActiveSheet(self, oSheet: "FakeSheet"):
+        self._engine.call("Controller.ActiveSheet")
+        self._active_sheet = oSheet
+
+    def setActiveSheet(self, oSheet: "FakeSheet"):
+        self._engine.call("Controller.setActiveSheet")
+        self._active_sheet = oSheet
+
+    def select(self, _obj: Any) -> bool:
+        self._engine.call("Controller.select")
+        return True
+
+
+class FakeSheets:
+    """The sheets of a document"""
+
+    def __init__(self, engine: FakeCalcEngine, oDoc: FakeDocument,
+                 sheet_names: Sequence[str]):
+        self._engine = engine
+        self._oDoc = oDoc
+        self._sheets = [FakeSheet(engine, oDoc, name, i)
+                        for i, name in enumerate(sheet_names)]
+
+    @property
+    def Count(self) -> int:
+        self._engine.call("Sheets.Count")
+        return len(self._sheets)
+
+    @property
+    def ElementNames(self) -> Tuple[str, ...]:
+        self._engine.call("Sheets.ElementNames")
+        return tuple(s._name for s in self._sheets)
+
+    def getByIndex(self, i: int) -> "FakeSheet":
+        self._engine.call("Sheets.getByIndex")
+        return self._sheets[i]
+
+    def getByName(self, name: str) -> "FakeSheet":
+        self._engine.call("Sheets.getByName")
+        for oSheet in self._sheets:
+            if oSheet._name == name:
+                return oSheet
+        raise KeyError(name)
+
+    def hasByName(self, name: str) -> bool:
+        self._engine.call("Sheets.hasByName")
+        return any(s._name == name for s in self._sheets)
+
+    def insertNewByName(self, name: str, position: int):
+        self._engine.call("Sheets.insertNewByName")
+        self._sheets.insert(position,
+                            FakeSheet(self._engine, self._oDoc, name, 0))
+        for i, oSheet in enumerate(self._sheets):
+            oSheet._index = i
+
+    def removeByName(self, name: str):
+        self._engine.call("Sheets.removeByName")
+        self._sheets = [s for s in self._sheets if s._name != name]
+        for i, oSheet in enumerate(self._sheets):
+            oSheet._index = i
+
+
+class FakeRange:
+    """A cell range"""
+
+    def __init__(self, oSheet: "FakeSheet", c0: int, r0: int, c1: int,
+                 r1: int):
+        if not (0 <= c0 <= c1 <= MAX_COLUMN and 0 <= r0 <= r1 <= MAX_ROW):
+            raise IndexError((c0, r0, c1, r1))
+        self._engine = oSheet._engine
+        self._oSheet = oSheet
+        self._c0 = c0
+        self._r0 = r0
+        self._c1 = c1
+        self._r1 = r1
+
+    def _call(self, name: str):
+        self._engine.call("Range." + name)
+
+    @property
+    def Spreadsheet(self) -> "FakeSheet":
+        self._call("Spreadsheet")
+        return self._oSheet
+
+    @property
+    def RangeAddress(self) -> _Struct:
+        self._call("RangeAddress")
+        return _Struct(Sheet=self._oSheet._index, StartColumn=self._c0,
+                       StartRow=self._r0, EndColumn=self._c1,
+                       EndRow=self._r1)
+
+    def getCellByPosition(self, c: int, r: int) -> "FakeCell":
+        self._call("getCellByPosition")
+        return self._oSheet._cell(self._c0 + c, self._r0 + r)
+
+    def getCellRangeByPosition(self, c0: int, r0: int, c1: int, r1: int
+                               ) -> "FakeRange":
+        self._call("getCellRangeByPosition")
+        return FakeRange(self._oSheet, self._c0 + c0, self._r0 + r0,
+                         self._c0 + c1, self._r0 + r1)
+
+    @property
+    def DataArray(self) -> Tuple[Tuple[Any, ...], ...]:
+        self._call("DataArray")
+        return self._oSheet._get_array(self._c0, self._r0, self._c1, self._r1,
+                                       _data_array_value)
+
+    @DataArray.setter
+    def DataArray(self, data_array: Sequence[Sequence[Any]]):
+        self._call("DataArray")
+        self._oSheet._set_array(self._c0, self._r0, self._c1, self._r1,
+                                data_array, _data_array_cell)
+
+    @property
+    def FormulaArray(self) -> Tuple[Tuple[str, ...], ...]:
+        self._call("FormulaArray")
+        return self._oSheet._get_array(self._c0, self._r0, self._c1, self._r1,
+                                       _formula_array_value)
+
+    @FormulaArray.setter
+    def FormulaArray(self, formula_array: Sequence[Sequence[Any]]):
+        self._call("FormulaArray")
+        self._oSheet._set_array(self._c0, self._r0, self._c1, self._r1,
+                                formula_array, _formula_array_cell)
+
+    @property
+    def NumberFormat(self) -> int:
+        self._call("NumberFormat")
+        return self._oSheet._number_format(self._c0, self._r0)
+
+    @NumberFormat.setter
+    def NumberFormat(self, key: int):
+        self._call("NumberFormat")
+        for r in range(self._r0, self._r1 + 1):
+            for c in range(self._c0, self._c1 + 1):
+                self._oSheet._formats[(c, r)] = key
+
+    @property
+    def Rows(self) -> "FakeRowsColumns":
+        self._call("Rows")
+        return FakeRowsColumns(self._oSheet, "Row", self._r0, self._r1)
+
+    @property
+    def Columns(self) -> "FakeRowsColumns":
+        self._call("Columns")
+        return FakeRowsColumns(self._oSheet, "Column", self._c0, self._c1)
+
+
+def _data_array_value(data: Optional[_CellData]) -> Any:
+    if data is None:
+        return ""
+    elif data.formula is not None:
+        return data.value if data.value is not None else 0.0
+    else:
+        return data.value
+
+
+def _data_array_cell(value: Any) -> Optional[_CellData]:
+    if value is None or value == "":
+        return None
+    elif isinstance(value, str):
+        return _CellData(value)
+    else:
+        return _CellData(float(value))
+
+
+def _formula_array_value(data: Optional[_CellData]) -> str:
+    if data is None:
+        return ""
+    elif data.formula is not None:
+        return data.formula
+    else:
+        return _value_to_string(data.value)
+
+
+def _formula_array_cell(value: Any) -> Optional[_CellData]:
+    if not isinstance(value, str):
+        return _data_array_cell(value)
+    elif value == "":
+        return None
+    elif value.startswith("="):
+        return _CellData(None, value)
+    try:
+        return _CellData(float(value))
+    except ValueError:
+        return _CellData(value)
+
+
+class FakeSheet(FakeRange):
+    """A sheet: the whole range and the content of the cells"""
+
+    def __init__(self, engine: FakeCalcEngine, oDoc: FakeDocument,
+                 name: str, index: int):
+        self._engine = engine
+        self._oDoc = oDoc
+        self._name = name
+        self._index = index
+        self._cells: Dict[Tuple[int, int], _CellData] = {}
+        self._formats: Dict[Tuple[int, int], int] = {}
+        self._column_props: Dict[int, Dict[str, Any]] = {}
+        self._row_props: Dict[int, Dict[str, Any]] = {}
+        self._print_areas: List[_Struct] = []
+        self._title_rows: Optional[_Struct] = None
+        FakeRange.__init__(self, self, 0, 0, MAX_COLUMN, MAX_ROW)
+
+    def _call(self, name: str):
+        self._engine.call("Sheet." + name)
+
+    @property
+    def Name(self) -> str:
+        self._call("Name")
+        return self._name
+
+    @Name.setter
+    def Name(self, name: str):
+        self._call("Name")
+        self._name = name
+
+    @property
+    def DrawPage(self) -> _Struct:
+        self._call("DrawPage")
+        return _Struct(Forms=_Struct(Parent=self._oDoc))
+
+    def createCursor(self) -> "FakeCursor":
+        self._call("createCursor")
+        return FakeCursor(self)
+
+    def setPrintAreas(self, addresses: Sequence[_Struct]):
+        self._call("setPrintAreas")
+        self._print_areas = list(addresses)
+
+    def getPrintAreas(self) -> Tuple[_Struct, ...]:
+        self._call("getPrintAreas")
+        return tuple(self._print_areas)
+
+    def setPrintTitleRows(self, _value: bool):
+        self._call("setPrintTitleRows")
+
+    def setTitleRows(self, address: _Struct):
+        self._call("setTitleRows")
+        self._title_rows = address
+
+    # internal API: not counted
+    def _cell(self, c: int, r: int) -> "FakeCell":
+        if not (0 <= c <= MAX_COLUMN and 0 <= r <= MAX_ROW):
+            raise IndexError((c, r))
+        return FakeCell(self, c, r)
+
+    def _number_format(self, c: int, r: int) -> int:
+        key = self._formats.get((c, r))
+        if key is None:
+            key = self._column_props.get(c, {}).get("NumberFormat", 0)
+        return key
+
+    def _get_array(self, c0: int, r0: int, c1: int, r1: int,
+                   to_value: Any) -> Tuple[Tuple[Any, ...], ...]:
+        get = self._cells.get
+        return tuple(
+            tuple(to_value(get((c, r))) for c in range(c0, c1 + 1))
+            for r in range(r0, r1 + 1))
+
+    def _set_array(self, c0: int, r0: int, c1: int, r1: int,
+                   array: Sequence[Sequence[Any]], to_cell: Any):
+        if len(array) != r1 - r0 + 1 or any(
+                len(row) != c1 - c0 + 1 for row in array):
+            raise ValueError("The array doesn't fit the range")
+        self._oDoc._undo_manager._add_action(len(array) * (c1 - c0 + 1))
+        for r, row in enumerate(array, r0):
+            for c, value in enumerate(row, c0):
+                self._set_data((c, r), to_cell(value))
+
+    def _set_data(self, key: Tuple[int, int], data: Optional[_CellData]):
+        if data is None:
+            self._cells.pop(key, None)
+        else:
+            self._cells[key] = data
+
+    def _used_area(self) -> Tuple[int, int, int, int]:
+        if not self._cells:
+            return 0, 0, 0, 0
+        cols = [c for c, _ in self._cells]
+        rows = [r for _, r in self._cells]
+        return min(cols), min(rows), max(cols), max(rows)
+
+
+class FakeCell(FakeRange):
+    """A cell"""
+
+    def __init__(self, oSheet: FakeSheet, c: int, r: int):
+        self._engine = oSheet._engine
+        self._oSheet = oSheet
+        self._c0 = self._c1 = c
+        self._r0 = self._r1 = r
+
+    def _call(self, name: str):
+        self._engine.call("Cell." + name)
+
+    @property
+    def _data(self) -> Optional[_CellData]:
+        return self._oSheet._cells.get((self._c0, self._r0))
+
+    @property
+    def CellAddress(self) -> _Struct:
+        self._call("CellAddress")
+        return _Struct(Sheet=self._oSheet._index, Column=self._c0,
+                       Row=self._r0)
+
+    @property
+    def Type(self) -> _EnumValue:
+        self._call("Type")
+        data = self._data
+        if data is None:
+            return EMPTY
+        elif data.formula is not None:
+            return FORMULA
+        elif isinstance(data.value, str):
+            return TEXT
+        else:
+            return VALUE
+
+    @property
+    def FormulaResultType(self) -> _EnumValue:
+        self._call("FormulaResultType")
+        data = self._data
+        if data is None:
+            return VALUE
+        return TEXT if isinstance(data.value, str) else VALUE
+
+    @property
+    def Value(self) -> float:
+        self._call("Value")
+        data = self._data
+        if data is None or isinstance(data.value, str) or data.value is None:
+            return 0.0
+        return data.value
+
+    @Value.setter
+    def Value(self, value: float):
+        self._call("Value")
+        self._oSheet._set_data((self._c0, self._r0), _CellData(float(value)))
+
+    @property
+    def String(self) -> str:
+        self._call("String")
+        data = self._data
+        return "" if data is None else _value_to_string(data.value)
+
+    @String.setter
+    def String(self, value: str):
+        self._call("String")
+        self._oSheet._set_data((self._c0, self._r0),
+                               _CellData(value) if value else None)
+
+    @property
+    def Formula(self) -> str:
+        self._call("Formula")
+        return _formula_array_value(self._data)
+
+    @Formula.setter
+    def Formula(self, value: str):
+        self._call("Formula")
+        self._oSheet._set_data((self._c0, self._r0),
+                               _formula_array_cell(value))
+
+
+class FakeCursor(FakeRange):
+    """A sheet cell cursor"""
+
+    def __init__(self, oSheet: FakeSheet):
+        FakeRange.__init__(self, oSheet, 0, 0, 0, 0)
+
+    def _call(self, name: str):
+        self._engine.call("Cursor." + name)
+
+    def gotoStartOfUsedArea(self, expand: bool):
+        self._call("gotoStartOfUsedArea")
+        c0, r0, _, _ = self._oSheet._used_area()
+        if expand:
+            self._c0, self._r0 = c0, r0
+        else:
+            self._c0 = self._c1 = c0
+            self._r0 = self._r1 = r0
+
+    def gotoEndOfUsedArea(self, expand: bool):
+        self._call("gotoEndOfUsedArea")
+        _, _, c1, r1 = self._oSheet._used_area()
+        if expand:
+            self._c1, self._r1 = c1, r1
+        else:
+            self._c0 = self._c1 = c1
+            self._r0 = self._r1 = r1
+
+
+class FakeRowsColumns:
+    """The rows or the columns of a range"""
+
+    def __init__(self, oSheet: FakeSheet, kind: str, start: int, end: int):
+        self._engine = oSheet._engine
+        self._oSheet = oSheet
+        self._kind = kind
+        self._start = start
+        self._end = end
+
+    @property
+    def Count(self) -> int:
+        self._engine.call(self._kind + "s.Count")
+        return self._end - self._start + 1
+
+    def getByIndex(self, i: int) -> "FakeRowColumn":
+        self._engine.call(self._kind + "s.getByIndex")
+        if self._kind == "Row":
+            props = self._oSheet._row_props
+        else:
+            props = self._oSheet._column_props
+        return FakeRowColumn(self._engine, self._kind,
+                             props.setdefault(self._start + i, {}))
+
+
+class FakeRowColumn:
+    """A row or a column: a bag of properties"""
+
+    def __init__(self, engine: FakeCalcEngine, kind: str,
+                 props: Dict[str, Any]):
+        object.__setattr__(self, "_engine", engine)
+        object.__setattr__(self, "_kind", kind)
+        object.__setattr__(self, "_props", props)
+
+    def __getattr__(self, name: str) -> Any:
+        self._engine.call(self._kind + "." + name)
+        if name == "Width":
+            return self._props.get(name, DEFAULT_COLUMN_WIDTH)
+        return self._props.get(name)
+
+    def __setattr__(self, name: str, value: Any):
+        self._engine.call(self._kind + "." + name)
+        self._props[name] = value
+
+
+class FakeNumberFormats:
+    """The number formats of a document"""
+    _STANDARD_FORMATS = (
+        (0, "General", NumberFormat.NUMBER),
+        (36, "MM/DD/YY", NumberFormat.DATE),
+        (40, "HH:MM:SS", NumberFormat.TIME),
+        (46, "MM/DD/YY HH:MM", NumberFormat.DATETIME),
+        (99, "BOOLEAN", NumberFormat.LOGICAL),
+        (100, "@", NumberFormat.TEXT),
+    )
+
+    def __init__(self, engine: FakeCalcEngine):
+        self._engine = engine
+        self._formats = {
+            key: _Struct(FormatString=fmt, Type=fmt_type)
+            for key, fmt, fmt_type in self._STANDARD_FORMATS
+        }
+        self._next_key = 200
+
+    def getStandardFormat(self, fmt_type: int, _locale: Any) -> int:
+        self._engine.call("NumberFormats.getStandardFormat")
+        for key, _, standard_type in self._STANDARD_FORMATS:
+            if standard_type == fmt_type:
+                return key
+        return 0
+
+    def getByKey(self, key: int) -> _Struct:
+        self._engine.call("NumberFormats.getByKey")
+        return self._formats[key]
+
+    def queryKey(self, fmt: str, _locale: Any, _scan: bool) -> int:
+        self._engine.call("NumberFormats.queryKey")
+        for key, struct in self._formats.items():
+            if struct.FormatString == fmt:
+                return key
+        return -1
+
+    def addNew(self, fmt: str, _locale: Any) -> int:
+        self._engine.call("NumberFormats.addNew")
+        key = self._next_key
+        self._next_key += 1
+        self._formats[key] = _Struct(FormatString=fmt,
+                                     Type=_guess_format_type(fmt))
+        return key
+
+
+def _guess_format_type(fmt: str) -> int:
+    upper = fmt.upper()
+    has_date = "YY" in upper or "DD" in upper
+    has_time = "HH" in upper or "SS" in upper
+    if has_date and has_time:
+        return NumberFormat.DATETIME
+    elif has_date:
+        return NumberFormat.DATE
+    elif has_time:
+        return NumberFormat.TIME
+    elif "%" in fmt:
+        return NumberFormat.PERCENT
+    else:
+        return NumberFormat.NUMBER
+
+
+class FakeUndoManager:
+    """
+    The undo manager. Records the actions (as a count of cells) to measure
+    the memory used by the undo stack.
+    """
+
+    def __init__(self, engine: FakeCalcEngine):
+        self._engine = engine
+        self._lock_count = 0
+        self._context_depth = 0
+        self.contexts: List[Optional[str]] = []
+        self.actions: List[int] = []
+
+    def enterUndoContext(self, title: str):
+        self._engine.call("UndoManager.enterUndoContext")
+        self._enter(title)
+
+    def enterHiddenUndoContext(self):
+        self._engine.call("UndoManager.enterHiddenUndoContext")
+        self._enter(None)
+
+    def _enter(self, title: Optional[str]):
+        if self._context_depth == 0 and not self._lock_count:
+            self.contexts.append(title)
+        self._context_depth += 1
+
+    def leaveUndoContext(self):
+        self._engine.call("UndoManager.leaveUndoContext")
+        if self._context_depth == 0:
+            raise RuntimeError("No undo context")
+        self._context_depth -= 1
+
+    def lock(self):
+        self._engine.call("UndoManager.lock")
+        self._lock_count += 1
+
+    def unlock(self):
+        self._engine.call("UndoManager.unlock")
+        if self._lock_count == 0:
+            raise RuntimeError("Undo manager is not locked")
+        self._lock_count -= 1
+
+    def isLocked(self) -> bool:
+        self._engine.call("UndoManager.isLocked")
+        return self._lock_count > 0
+
+    def _add_action(self, cell_count: int):
+        if not self._lock_count:
+            self.actions.append(cell_count)
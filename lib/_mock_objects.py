@@ -47,6 +47,10 @@ class uno:
     def Any(name: str, value: Any) -> Any:
         return value
 
+    @staticmethod
+    def ByteSequence(value: bytes) -> bytes:
+        return value
+
 
 class unohelper:
     class Base:
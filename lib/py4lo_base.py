@@ -20,28 +20,61 @@
 A set of command to pilot a LibreOffice Base document.
 """
 
+import datetime as dt
 import logging
 import time
 from pathlib import Path
-from typing import Iterable, Mapping, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 from py4lo_helper import (
+    DataArrayCopier,
+    DatesHelper,
     create_uno_service,
+    create_uno_struct,
+    from_uno_date,
+    parent_doc,
     remove_all,
     to_items,
+    to_uno_date,
     uno_path_to_url,
 )
 from py4lo_typing import (
+    DATA_ROW,
+    UnoCell,
     UnoDBAccess,
     UnoDBConnection,
     UnoDBContext,
     UnoDBDrop,
+    UnoDBPreparedStatement,
+    UnoDBResultSet,
     UnoDBStatement,
     UnoDBTable,
+    UnoRange,
+    UnoStruct,
     lazy,
 )
 
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
 try:
+    # noinspection PyUnresolvedReferences,PyPackageRequirements
+    import uno
+
     class DataType:
         # noinspection PyUnresolvedReferences,PyPackageRequirements
         from com.sun.star.sdbc.DataType import (
@@ -90,6 +123,7 @@ except ImportError:
         ColumnValue,  # noqa: F401
         DataType,
     )
+    from _mock_objects import uno  # type: ignore[assignment]
 
 
 class BaseTableBuilder:
@@ -142,6 +176,669 @@ class BaseTableBuilder:
         self._oCols.appendByDescriptor(oCol)
 
 
+def _type_value(sql_type: Any) -> int:
+    # DataType constants are int, but the mock DataType is an enum
+    return getattr(sql_type, "value", sql_type)
+
+
+_INT_TYPES = {_type_value(t) for t in (
+    DataType.TINYINT, DataType.SMALLINT, DataType.INTEGER)}
+_LONG_TYPES = {_type_value(DataType.BIGINT)}
+_DOUBLE_TYPES = {_type_value(t) for t in (
+    DataType.FLOAT, DataType.REAL, DataType.DOUBLE, DataType.NUMERIC,
+    DataType.DECIMAL)}
+_BOOLEAN_TYPES = {_type_value(t) for t in (DataType.BIT, DataType.BOOLEAN)}
+_BYTES_TYPES = {_type_value(t) for t in (
+    DataType.BINARY, DataType.VARBINARY, DataType.LONGVARBINARY,
+    DataType.BLOB)}
+_DATE_TYPE = _type_value(DataType.DATE)
+_TIME_TYPE = _type_value(DataType.TIME)
+_TIMESTAMP_TYPE = _type_value(DataType.TIMESTAMP)
+
+
+def _from_uno_time(oTime: UnoStruct) -> dt.time:
+    # noinspection PyUnresolvedReferences
+    return dt.time(oTime.Hours, oTime.Minutes, oTime.Seconds,
+                   oTime.NanoSeconds // 1000)
+
+
+def _from_uno_date_time(oDateTime: UnoStruct) -> dt.datetime:
+    # noinspection PyUnresolvedReferences
+    return dt.datetime(oDateTime.Year, oDateTime.Month, oDateTime.Day,
+                       oDateTime.Hours, oDateTime.Minutes, oDateTime.Seconds,
+                       oDateTime.NanoSeconds // 1000)
+
+
+def _create_getter(oResultSet: UnoDBResultSet, sql_type: int
+                   ) -> Tuple[Callable[[int], Any],
+                              Optional[Callable[[Any], Any]]]:
+    """
+    @param oResultSet: the result set
+    @param sql_type: the type of the column (see: com.sun.star.sdbc.DataType)
+    @return: the function that returns the UNO value of a column, and the
+    function that converts a non NULL value to a Python value, or None. A
+    NULL date is a zeroed struct: it must not be converted.
+    """
+    if sql_type in _INT_TYPES:
+        return oResultSet.getInt, None
+    elif sql_type in _LONG_TYPES:
+        return oResultSet.getLong, None
+    elif sql_type in _DOUBLE_TYPES:
+        return oResultSet.getDouble, None
+    elif sql_type in _BOOLEAN_TYPES:
+        return oResultSet.getBoolean, None
+    elif sql_type in _BYTES_TYPES:
+        return oResultSet.getBytes, lambda v: bytes(v.value)
+    elif sql_type == _DATE_TYPE:
+        return oResultSet.getDate, from_uno_date
+    elif sql_type == _TIME_TYPE:
+        return oResultSet.getTime, _from_uno_time
+    elif sql_type == _TIMESTAMP_TYPE:
+        return oResultSet.getTimestamp, _from_uno_date_time
+    else:
+        return oResultSet.getString, None
+
+
+def read_result_set(oResultSet: UnoDBResultSet) -> Iterator[Tuple[Any, ...]]:
+    """
+    Stream a result set as typed rows. The getter of each column is
+    chosen once, from the metadata of the result set. A NULL value is
+    `None`.
+
+    @param oResultSet: the result set (see: com.sun.star.sdbc.XResultSet)
+    @return: an iterator over the rows, as tuples
+    """
+    oMetaData = oResultSet.getMetaData()
+    col_count = oMetaData.getColumnCount()
+    getters = [
+        (i, *_create_getter(oResultSet, oMetaData.getColumnType(i)))
+        for i in range(1, col_count + 1)
+    ]
+    wasNull = oResultSet.wasNull
+    while oResultSet.next():
+        row = []
+        for i, getter, converter in getters:
+            value = getter(i)
+            if wasNull():
+                row.append(None)
+            elif converter is None:
+                row.append(value)
+            else:
+                row.append(converter(value))
+        yield tuple(row)
+
+
+def _to_data_value(value: Any, dates_helper: DatesHelper) -> Any:
+    if value is None:
+        return ""
+    elif isinstance(value, dt.datetime) and value.tzinfo is None:
+        return dates_helper.date_to_float(
+            value.replace(tzinfo=dt.timezone.utc))
+    elif isinstance(value, (dt.date, dt.time)):
+        return dates_helper.date_to_float(value)
+    elif isinstance(value, bytes):
+        return value.hex()
+    else:
+        return value
+
+
+class BasePreparedStatement:
+    """
+    A wrapper for a prepared statement
+    (see: com.sun.star.sdbc.XPreparedStatement). Use `BaseDB.prepare`.
+
+    Parameters are 1-based, as in the UNO API. The `set_...` methods accept
+    `None` (this is the same as a `set_null` call).
+
+    Example:
+    ```
+    with base_db.prepare("INSERT INTO persons VALUES(?, ?)") as stmt:
+        stmt.execute_batch([(1, "John"), (2, "Jane")])
+    ```
+    """
+    _logger = logging.getLogger(__name__)
+
+    def __init__(self, oConnection: UnoDBConnection,
+                 oStatement: UnoDBPreparedStatement):
+        """
+        @param oConnection: the connection (a com.sun.star.sdbc.XConnection object)
+        @param oStatement: the prepared statement
+        """
+        self._oConnection = oConnection
+        self._oStatement = oStatement
+
+    def __enter__(self) -> "Self":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def set_null(self, i: int, sql_type: DataType = DataType.VARCHAR):
+        """
+        @param i: the index of the parameter
+        @param sql_type: the type of the column (see: com.sun.star.sdbc.DataType)
+        """
+        self._oStatement.setNull(i, sql_type)
+
+    def set_boolean(self, i: int, v: Optional[bool]):
+        """
+        Set a boolean parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.BOOLEAN)
+        else:
+            self._oStatement.setBoolean(i, v)
+
+    def set_int(self, i: int, v: Optional[int]):
+        """
+        Set an int (32 bits) parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.INTEGER)
+        else:
+            self._oStatement.setInt(i, v)
+
+    def set_long(self, i: int, v: Optional[int]):
+        """
+        Set an int (64 bits) parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.BIGINT)
+        else:
+            self._oStatement.setLong(i, v)
+
+    def set_double(self, i: int, v: Optional[float]):
+        """
+        Set a float parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.DOUBLE)
+        else:
+            self._oStatement.setDouble(i, v)
+
+    def set_string(self, i: int, v: Optional[str]):
+        """
+        Set a string parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.VARCHAR)
+        else:
+            self._oStatement.setString(i, v)
+
+    def set_bytes(self, i: int, v: Optional[bytes]):
+        """
+        Set bytes parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.VARBINARY)
+        else:
+            self._oStatement.setBytes(i, uno.ByteSequence(v))
+
+    def set_date(self, i: int, v: Optional[dt.date]):
+        """
+        Set a date parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.DATE)
+        else:
+            self._oStatement.setDate(i, to_uno_date(v))
+
+    def set_time(self, i: int, v: Optional[dt.time]):
+        """
+        Set a time parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.TIME)
+        else:
+            self._oStatement.setTime(i, create_uno_struct(
+                "com.sun.star.util.Time", Hours=v.hour, Minutes=v.minute,
+                Seconds=v.second, NanoSeconds=v.microsecond * 1000))
+
+    def set_timestamp(self, i: int, v: Optional[dt.datetime]):
+        """
+        Set a datetime parameter.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self._oStatement.setNull(i, DataType.TIMESTAMP)
+        else:
+            self._oStatement.setTimestamp(i, create_uno_struct(
+                "com.sun.star.util.DateTime", Year=v.year, Month=v.month,
+                Day=v.day, Hours=v.hour, Minutes=v.minute, Seconds=v.second,
+                NanoSeconds=v.microsecond * 1000))
+
+    def set(self, i: int, v: Any):
+        """
+        Set a parameter, the `set_...` method depends on the Python type
+        of the value.
+
+        @param i: the index of the parameter
+        @param v: the value
+        """
+        if v is None:
+            self.set_null(i)
+        elif isinstance(v, bool):
+            self.set_boolean(i, v)
+        elif isinstance(v, int):
+            if -2 ** 31 <= v < 2 ** 31:
+                self.set_int(i, v)
+            else:
+                self.set_long(i, v)
+        elif isinstance(v, float):
+            self.set_double(i, v)
+        elif isinstance(v, str):
+            self.set_string(i, v)
+        elif isinstance(v, (bytes, bytearray)):
+            self.set_bytes(i, bytes(v))
+        elif isinstance(v, dt.datetime):  # before date: datetime is a date
+            self.set_timestamp(i, v)
+        elif isinstance(v, dt.date):
+            self.set_date(i, v)
+        elif isinstance(v, dt.time):
+            self.set_time(i, v)
+        else:
+            raise TypeError(f"Can't set a {type(v)} parameter")
+
+    def set_params(self, params: Sequence[Any]):
+        """
+        Set all parameters (see `set`).
+
+        @param params: the values of the parameters
+        """
+        for i, v in enumerate(params, 1):
+            self.set(i, v)
+
+    def clear_params(self):
+        """
+        Clear the current parameters
+        """
+        self._oStatement.clearParameters()
+
+    def execute_update(self, params: Optional[Sequence[Any]] = None) -> int:
+        """
+        @param params: the values of the parameters or None to use the
+        current parameters
+        @return: the number of rows affected
+        """
+        if params is not None:
+            self.set_params(params)
+        return self._oStatement.executeUpdate()
+
+    def execute_query(self, params: Optional[Sequence[Any]] = None
+                      ) -> Iterator[Tuple[Any, ...]]:
+        """
+        @param params: the values of the parameters or None to use the
+        current parameters
+        @return: an iterator over the typed rows (see `read_result_set`)
+        """
+        if params is not None:
+            self.set_params(params)
+        return read_result_set(self._oStatement.executeQuery())
+
+    def add_batch(self, params: Optional[Sequence[Any]] = None):
+        """
+        Add a parameter set to the batch.
+
+        @param params: the values of the parameters or None to use the
+        current parameters
+        """
+        if params is not None:
+            self.set_params(params)
+        self._oStatement.addBatch()
+
+    def execute_batch(self, param_sets: Optional[Iterable[Sequence[Any]]] = None,
+                      chunk_size: int = 1000, commit: bool = True) -> int:
+        """
+        Execute the batch. If `param_sets` is not None, add every parameter
+        set to the batch and execute the batch every `chunk_size` sets. If
+        `commit` is True, commit after every chunk: auto-commit is disabled
+        during the load.
+
+        @param param_sets: None or the parameter sets
+        @param chunk_size: the number of parameter sets per batch
+        @param commit: if True, commit every chunk
+        @return: the number of rows affected
+        """
+        if param_sets is None:
+            return self._execute_batch(commit)
+
+        auto_commit = self._oConnection.getAutoCommit()
+        if commit and auto_commit:
+            self._oConnection.setAutoCommit(False)
+        try:
+            count = 0
+            pending = 0
+            for params in param_sets:
+                self.add_batch(params)
+                pending += 1
+                if pending >= chunk_size:
+                    count += self._execute_batch(commit)
+                    pending = 0
+            if pending:
+                count += self._execute_batch(commit)
+            return count
+        finally:
+            if commit and auto_commit:
+                self._oConnection.setAutoCommit(True)
+
+    def _execute_batch(self, commit: bool) -> int:
+        counts = self._oStatement.executeBatch()
+        if commit:
+            self._oConnection.commit()
+        return sum(c for c in counts if c > 0)
+
+    def close(self):
+        """
+        Close the statement
+        """
+        self._oStatement.close()
+
+
+class ColumnSpec(NamedTuple):
+    """
+    The specification of a column (see: `BaseSchemaBuilder`).
+    """
+    name: str
+    col_type: Any  # a com.sun.star.sdbc.DataType value
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+    nullable: bool = True
+
+
+_SQL_TYPE_NAME_BY_TYPE = {_type_value(t): name for t, name in (
+    (DataType.BIT, "BOOLEAN"),
+    (DataType.BOOLEAN, "BOOLEAN"),
+    (DataType.TINYINT, "SMALLINT"),
+    (DataType.SMALLINT, "SMALLINT"),
+    (DataType.INTEGER, "INTEGER"),
+    (DataType.BIGINT, "BIGINT"),
+    (DataType.FLOAT, "DOUBLE PRECISION"),
+    (DataType.REAL, "DOUBLE PRECISION"),
+    (DataType.DOUBLE, "DOUBLE PRECISION"),
+    (DataType.NUMERIC, "NUMERIC"),
+    (DataType.DECIMAL, "DECIMAL"),
+    (DataType.CHAR, "CHAR"),
+    (DataType.VARCHAR, "VARCHAR"),
+    (DataType.LONGVARCHAR, "VARCHAR"),
+    (DataType.DATE, "DATE"),
+    (DataType.TIME, "TIME"),
+    (DataType.TIMESTAMP, "TIMESTAMP"),
+    (DataType.BINARY, "BINARY"),
+    (DataType.VARBINARY, "VARBINARY"),
+    (DataType.LONGVARBINARY, "BLOB"),
+    (DataType.BLOB, "BLOB"),
+    (DataType.CLOB, "CLOB"),
+)}
+
+_DEFAULT_VARCHAR_PRECISION = 255
+
+
+def quote_identifier(identifier: str) -> str:
+    """
+    @param identifier: a table, column or index name
+    @return: the quoted identifier
+    """
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+def _column_sql(spec: ColumnSpec) -> str:
+    col_type = _type_value(spec.col_type)
+    try:
+        type_name = _SQL_TYPE_NAME_BY_TYPE[col_type]
+    except KeyError:
+        raise ValueError(f"Unsupported type {spec.col_type}")
+    if spec.precision is not None:
+        if spec.scale is None:
+            type_name += f"({spec.precision})"
+        else:
+            type_name += f"({spec.precision}, {spec.scale})"
+    elif col_type == _type_value(DataType.VARCHAR):
+        type_name += f"({_DEFAULT_VARCHAR_PRECISION})"
+
+    sql = f"{quote_identifier(spec.name)} {type_name}"
+    if not spec.nullable:
+        sql += " NOT NULL"
+    return sql
+
+
+class BaseSchemaBuilder:
+    """
+    `BaseSchemaBuilder` is a builder for the DDL of a table. Unlike
+    `BaseTableBuilder`, it does not call UNO for every column: the table is
+    created by a single `CREATE TABLE` statement. The primary key and the
+    indexes are separate statements, to be executed after a bulk load (see
+    `BaseDB.bulk_load`).
+
+    Example :
+
+    ```
+    builder = base_db.get_schema_builder("persons")
+    builder.add_column("person_id", DataType.INTEGER, nullable=False)
+    builder.add_column("name", DataType.VARCHAR, 100)
+    builder.primary_key("person_id").index("name")
+    base_db.bulk_load(builder, rows)
+    ```
+    """
+
+    def __init__(self, name: str, specs: Iterable[ColumnSpec] = ()):
+        """
+        @param name: the name of the table to build
+        @param specs: the column specs
+        """
+        self.name = name
+        self.specs = list(specs)
+        self._pk_fields: List[str] = []
+        self._idx_fields_list: List[List[str]] = []
+
+    def add_column(self, col_name: str, col_type: DataType,
+                   precision: Optional[int] = None,
+                   scale: Optional[int] = None, nullable: bool = True
+                   ) -> "BaseSchemaBuilder":
+        """
+        Add a column to the future table.
+
+        @param col_name: the name of the column
+        @param col_type: the type of the column (see: com.sun.star.sdbc.DataType)
+        @param precision: the precision (length for VARCHAR)
+        @param scale: the scale (for NUMERIC/DECIMAL)
+        @param nullable: if False, add a NOT NULL constraint
+        @return: self for fluent style
+        """
+        self.specs.append(
+            ColumnSpec(col_name, col_type, precision, scale, nullable))
+        return self
+
+    def primary_key(self, *fields: str) -> "BaseSchemaBuilder":
+        """
+        Set the primary key. The fields are set NOT NULL.
+
+        @param fields: the fields
+        @return: self for fluent style
+        """
+        self._pk_fields = list(fields)
+        self.specs = [
+            spec._replace(nullable=False) if spec.name in fields else spec
+            for spec in self.specs
+        ]
+        return self
+
+    def index(self, *fields: str) -> "BaseSchemaBuilder":
+        """
+        Add an index.
+
+        @param fields: the fields
+        @return: self for fluent style
+        """
+        self._idx_fields_list.append(list(fields))
+        return self
+
+    def create_table_sql(self) -> str:
+        """
+        @return: the `CREATE TABLE` statement
+        """
+        if not self.specs:
+            raise ValueError("No column")
+        cols = ",\n".join(f"    {_column_sql(spec)}" for spec in self.specs)
+        return f"CREATE TABLE {quote_identifier(self.name)} (\n{cols}\n)"
+
+    def post_load_sqls(self) -> List[str]:
+        """
+        @return: the statements to create the primary key and the indexes
+        """
+        table = quote_identifier(self.name)
+        sqls = []
+        if self._pk_fields:
+            sqls.append("ALTER TABLE {} ADD CONSTRAINT {} PRIMARY KEY ({})".format(
+                table, quote_identifier(f"PK_{self.name}"[:31]),
+                ", ".join(quote_identifier(f) for f in self._pk_fields)))
+        for fields in self._idx_fields_list:
+            idx_name = "IDX_{}_{}".format(self.name, "_".join(fields))
+            idx_name = idx_name[:31]  # Firebird limit
+            sqls.append("CREATE INDEX {} ON {} ({})".format(
+                quote_identifier(idx_name), table,
+                ", ".join(quote_identifier(f) for f in fields)))
+        return sqls
+
+    def insert_sql(self) -> str:
+        """
+        @return: the parametrized `INSERT` statement
+        """
+        return "INSERT INTO {} ({}) VALUES ({})".format(
+            quote_identifier(self.name),
+            ", ".join(quote_identifier(spec.name) for spec in self.specs),
+            ", ".join("?" for _ in self.specs))
+
+
+def _infer_column_spec(name: str, values: List[Any]) -> ColumnSpec:
+    kinds = set()
+    max_len = 0
+    big_int = False
+    for value in values:
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, dt.datetime):
+            if value.time() == dt.time():
+                kinds.add("date")
+            else:
+                kinds.add("datetime")
+        elif isinstance(value, float) and value.is_integer():
+            kinds.add("int")
+            big_int = big_int or not (-2 ** 31 <= value < 2 ** 31)
+        elif isinstance(value, (int, float)):
+            kinds.add("float")
+        else:
+            kinds.add("str")
+        max_len = max(max_len, len(str(value)))
+
+    if kinds == {"bool"}:
+        return ColumnSpec(name, DataType.BOOLEAN)
+    elif kinds == {"int"}:
+        return ColumnSpec(name, DataType.BIGINT if big_int else DataType.INTEGER)
+    elif kinds and kinds <= {"int", "float"}:
+        return ColumnSpec(name, DataType.DOUBLE)
+    elif kinds == {"date"}:
+        return ColumnSpec(name, DataType.DATE)
+    elif kinds and kinds <= {"date", "datetime"}:
+        return ColumnSpec(name, DataType.TIMESTAMP)
+    else:
+        return ColumnSpec(name, DataType.VARCHAR,
+                          max(max_len, _DEFAULT_VARCHAR_PRECISION))
+
+
+def infer_column_specs(oRange: UnoRange, sample_size: int = 100
+                       ) -> List[ColumnSpec]:
+    """
+    Infer the column specs of a range. The first row is the header. The
+    types are inferred from the typed values (see: `py4lo_io.reader`) of the
+    first `sample_size` rows: BOOLEAN, INTEGER, BIGINT, DOUBLE, DATE,
+    TIMESTAMP or VARCHAR.
+
+    @param oRange: the range, with a header
+    @param sample_size: the number of rows to sample
+    @return: the column specs
+    """
+    from py4lo_io import CellTyping, reader
+
+    oAddress = oRange.RangeAddress
+    end_row = min(oAddress.EndRow, oAddress.StartRow + sample_size)
+    oSampleRange = oRange.Spreadsheet.getCellRangeByPosition(
+        oAddress.StartColumn, oAddress.StartRow, oAddress.EndColumn, end_row)
+    rows = list(reader.from_typing(oSampleRange, CellTyping.Accurate))
+    width = oAddress.EndColumn - oAddress.StartColumn + 1
+    header, data_rows = rows[0], rows[1:]
+    specs = []
+    for j in range(width):
+        name = header[j] if j < len(header) else None
+        if not isinstance(name, str) or not name.strip():
+            name = f"col{j + 1}"
+        values = [row[j] for row in data_rows if j < len(row)]
+        specs.append(_infer_column_spec(name.strip(), values))
+    return specs
+
+
+def _create_converter(spec: ColumnSpec, dates_helper: DatesHelper
+                      ) -> Callable[[Any], Any]:
+    """
+    @return: a function to convert a DataArray value to a parameter value
+    """
+    col_type = _type_value(spec.col_type)
+    if col_type in _INT_TYPES or col_type in _LONG_TYPES:
+        def convert(v):
+            return int(v)
+    elif col_type in _DOUBLE_TYPES:
+        def convert(v):
+            return float(v)
+    elif col_type in _BOOLEAN_TYPES:
+        def convert(v):
+            return bool(v)
+    elif col_type == _DATE_TYPE:
+        def convert(v):
+            return dates_helper.float_to_date(v).date()
+    elif col_type == _TIMESTAMP_TYPE:
+        def convert(v):
+            return dates_helper.float_to_date(v).replace(tzinfo=None)
+    else:
+        def convert(v):
+            if isinstance(v, float) and v.is_integer():
+                return str(int(v))
+            return str(v)
+
+    def convert_or_none(v: Any) -> Any:
+        if v is None or v == "":
+            return None
+        return convert(v)
+
+    return convert_or_none
+
+
 def drop_all(oDrop: UnoDBDrop):
     """
     Drop all elements (count or name) of a container. The container might be
@@ -217,6 +914,88 @@ class BaseDB:
 
         return BaseTableBuilder(oConnection, name)
 
+    def get_schema_builder(self, name: str,
+                           specs: Iterable[ColumnSpec] = ()
+                           ) -> BaseSchemaBuilder:
+        """
+        @param name: the future table name
+        @param specs: the column specs (see `infer_column_specs`)
+        @return: the schema builder for the table.
+        @raises: ValueError if a table having this name exists
+        """
+        if self.has_table(name):
+            raise ValueError("Exists")
+
+        return BaseSchemaBuilder(name, specs)
+
+    def bulk_load(self, schema: BaseSchemaBuilder,
+                  rows: Iterable[Sequence[Any]], chunk_size: int = 1000
+                  ) -> int:
+        """
+        Create a table and load the rows: the table is created by a single
+        DDL statement, the rows are inserted by a prepared batch, committed
+        by chunks, and the primary key and the indexes are created after
+        the load.
+
+        @param schema: the schema of the table
+        @param rows: the rows
+        @param chunk_size: the number of rows per batch
+        @return: the number of rows inserted
+        """
+        self.execute_update(schema.create_table_sql())
+        self.commit()
+        with self.prepare(schema.insert_sql()) as stmt:
+            count = stmt.execute_batch(rows, chunk_size)
+        for sql in schema.post_load_sqls():
+            self.execute_update(sql)
+        self.commit()
+        return count
+
+    def load_range(self, name: str, oRange: UnoRange,
+                   primary_key: Sequence[str] = (),
+                   indexes: Iterable[Sequence[str]] = (),
+                   sample_size: int = 100, chunk_size: int = 1000) -> int:
+        """
+        Create a table from a range having a header. The column specs are
+        inferred from a sample (see `infer_column_specs`), then the range is
+        read by chunks of `chunk_size` rows (one DataArray per chunk) and
+        loaded (see `bulk_load`).
+
+        @param name: the table name
+        @param oRange: the range
+        @param primary_key: the fields of the primary key
+        @param indexes: the fields of every index
+        @param sample_size: the number of rows to sample
+        @param chunk_size: the number of rows per chunk
+        @return: the number of rows inserted
+        """
+        schema = self.get_schema_builder(
+            name, infer_column_specs(oRange, sample_size))
+        if primary_key:
+            schema.primary_key(*primary_key)
+        for fields in indexes:
+            schema.index(*fields)
+
+        dates_helper = DatesHelper.create(parent_doc(oRange))
+        converters = [_create_converter(spec, dates_helper)
+                      for spec in schema.specs]
+
+        def rows() -> Iterator[List[Any]]:
+            oAddress = oRange.RangeAddress
+            oSheet = oRange.Spreadsheet
+            start_r = oAddress.StartRow + 1
+            while start_r <= oAddress.EndRow:
+                end_r = min(start_r + chunk_size - 1, oAddress.EndRow)
+                data_array = oSheet.getCellRangeByPosition(
+                    oAddress.StartColumn, start_r, oAddress.EndColumn, end_r
+                ).DataArray
+                for data_row in data_array:
+                    yield [convert(v) for convert, v in
+                           zip(converters, data_row)]
+                start_r = end_r + 1
+
+        return self.bulk_load(schema, rows(), chunk_size)
+
     def get_tables(self) -> UnoDBDrop[UnoDBTable]:
         """
         @return: the table container (a XNameAccess)
@@ -240,6 +1019,79 @@ class BaseDB:
         """
         self.statement.execute(sql)
 
+    def prepare(self, sql: str) -> BasePreparedStatement:
+        """
+        Prepare a statement. The SQL is parsed once: use parameters (`?`)
+        rather than formatting values into the query.
+
+        ```
+        with base_db.prepare("INSERT INTO persons VALUES(?, ?)") as stmt:
+            stmt.execute_batch(rows)
+        ```
+
+        @param sql: the query, with parameters
+        @return: a prepared statement (see: com.sun.star.sdbc.XPreparedStatement)
+        """
+        oConnection = self.connection
+        return BasePreparedStatement(
+            oConnection, oConnection.prepareStatement(sql))
+
+    def query(self, sql: str) -> Iterator[Tuple[Any, ...]]:
+        """
+        Execute a SELECT query and stream the result set. The result set is
+        closed at the end of the iteration, or when the iterator is closed.
+
+        @param sql: the query
+        @return: an iterator over the typed rows (see `read_result_set`)
+        """
+        oResultSet = self.statement.executeQuery(sql)
+        try:
+            yield from read_result_set(oResultSet)
+        finally:
+            oResultSet.close()
+
+    def query_to_sheet(self, sql: str, oCell: UnoCell,
+                       chunk_size: int = 10000,
+                       callback: Optional[Callable[[int], None]] = None
+                       ) -> int:
+        """
+        Execute a SELECT query and write the result set to a sheet, by
+        chunks of `chunk_size` rows, without loading the whole result.
+        Dates are converted to floats, NULL to empty strings.
+
+        @param sql: the query
+        @param oCell: the top left cell of the destination
+        @param chunk_size: the number of rows of each chunk
+        @param callback: function called after every chunk, with the number
+        of rows written
+        @return: the number of rows written
+        """
+        dates_helper = DatesHelper.create(parent_doc(oCell))
+        copier = DataArrayCopier(undo=False, chunk_size=-1)
+        oSheet = oCell.Spreadsheet
+        cell_address = oCell.CellAddress
+        column = cell_address.Column
+        row = cell_address.Row
+
+        count = 0
+        chunk: List[DATA_ROW] = []
+        for values in self.query(sql):
+            chunk.append(tuple(_to_data_value(v, dates_helper)
+                               for v in values))
+            if len(chunk) >= chunk_size:
+                copier.copy(oSheet.getCellByPosition(column, row + count),
+                            chunk)
+                count += len(chunk)
+                chunk = []
+                if callback is not None:
+                    callback(count)
+        if chunk:
+            copier.copy(oSheet.getCellByPosition(column, row + count), chunk)
+            count += len(chunk)
+            if callback is not None:
+                callback(count)
+        return count
+
     def commit(self):
         """
         Make all changes since previous commit/rollback. (see: com.sun.star.sdb.XConnection.commit)
@@ -35,6 +35,7 @@ from decimal import Decimal
 from pathlib import Path
 from typing import (
     Any,
+    BinaryIO,
     Callable,
     Iterable,
     Mapping,
@@ -177,22 +178,27 @@ class Commons:
         doc = xsc.getDocument()
         return Commons(doc.URL)
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, asset_cache_size: int = 4 * 1024 * 1024):
         """
         Create a new Commons object
         @param url: the url of the document.
+        @param asset_cache_size: the max total size of the cached assets
         """
         self._url = url
         self._logger = lazy(logging.Logger)
+        self._asset_cache_size = asset_cache_size
+        self._archive = None  # type: Optional[_DocumentArchive]
 
     def __del__(self):
         """
-        Flushes and closes all loggers.
+        Flushes and closes all loggers and the document archive.
         """
         if self._logger is not None:
             for h in self._logger.handlers:
                 h.flush()
                 h.close()
+        if getattr(self, "_archive", None) is not None:
+            self._archive.close()
 
     def cur_dir(self) -> Optional[Path]:
         """
@@ -283,26 +289,21 @@ class Commons:
         :param encoding: the encoding of the file
 
         Example: `config = commons.read_config("test.ini")`"""
-        import codecs
-        import zipfile
-
         if isinstance(filenames, (str, Path)):
             filenames = [filenames]
         filenames = [str(f) for f in filenames]
 
         config = _get_config(args)
         apply(config)
-        reader = codecs.getreader(encoding)
 
-        path = uno_url_to_path(self._url)
-        str_path = str(path)  # py < 3.6.2
-        with zipfile.ZipFile(str_path, 'r') as z:
-            for filename in filenames:
-                try:
-                    file = z.open(filename)
-                    config.read_file(reader(file))
-                except KeyError:  # ignore non existing files
-                    pass
+        archive = self._get_archive()
+        for filename in filenames:
+            try:
+                bs = archive.read(filename)
+            except KeyError:  # ignore non existing files
+                pass
+            else:
+                config.read_string(bs.decode(encoding))
 
         return config
 
@@ -313,14 +314,151 @@ class Commons:
             bs = commons.get_asset("foo.csv")
             reader = TextIOWrapper(BytesIO(bs), <encoding>))
 
+        The small assets are cached.
+
         @param filename: name of the asset
         @return: file content as bytes
         """
+        return self._get_archive().read(filename)
+
+    def open_asset(self, filename: str) -> BinaryIO:
+        """
+        Open an asset, without loading the whole content:
+
+            with commons.open_asset("foo.csv") as f:
+                reader = TextIOWrapper(f, <encoding>))
+
+        @param filename: name of the asset
+        @return: a binary file object
+        """
+        return self._get_archive().open(filename)
+
+    def _get_archive(self) -> "_DocumentArchive":
+        if self._archive is None:
+            path = uno_url_to_path(self._url)
+            self._archive = _DocumentArchive(str(path), self._asset_cache_size)
+        return self._archive
+
+
+# the index of the duplicate assets, written by py4lo
+ASSETS_INDEX_NAME = "py4lo_assets.json"
+
+
+class _DocumentArchive:
+    """
+    The document, as a zip archive. The archive is opened once and the
+    central directory is read once, until the document file is modified.
+    The small entries are kept in an LRU cache.
+
+    On Windows, an open file can't be replaced: the archive is closed after
+    each call to let LibreOffice save the document.
+    """
+
+    def __init__(self, path: str, max_cache_size: int,
+                 keep_open: bool = sys.platform != "win32"):
+        """
+        @param path: the path of the document
+        @param max_cache_size: the max total size of the cached entries
+        @param keep_open: if False, close the archive after each call
+        """
+        import threading
+        from collections import OrderedDict
+
+        self._path = path
+        self._max_cache_size = max_cache_size
+        self._keep_open = keep_open
+        self._lock = threading.RLock()
+        self._zip_file = None  # type: Any
+        self._stamp = None  # type: Optional[tuple[int, int]]
+        self._aliases = None  # type: Optional[dict[str, str]]
+        self._cache = OrderedDict()  # type: OrderedDict[str, bytes]
+        self._cache_size = 0
+
+    def read(self, filename: str) -> bytes:
+        """
+        @param filename: the name of the entry
+        @return: the content
+        @raise KeyError: if there is no such entry
+        """
+        with self._lock:
+            z = self._get_zip_file()
+            try:
+                name = self._resolve_name(z, filename)
+                bs = self._cache.get(name)
+                if bs is None:
+                    bs = z.read(name)
+                    self._put(name, bs)
+                else:
+                    self._cache.move_to_end(name)
+                return bs
+            finally:
+                self._release()
+
+    def open(self, filename: str) -> BinaryIO:
+        """
+        @param filename: the name of the entry
+        @return: a binary file object
+        @raise KeyError: if there is no such entry
+        """
+        with self._lock:
+            z = self._get_zip_file()
+            try:
+                # the file object keeps the underlying file open
+                return z.open(self._resolve_name(z, filename))
+            finally:
+                self._release()
+
+    def close(self):
+        with self._lock:
+            if self._zip_file is not None:
+                self._zip_file.close()
+                self._zip_file = None
+
+    def _get_zip_file(self) -> Any:
+        import os
         import zipfile
-        path = uno_url_to_path(self._url)
-        str_path = str(path)  # py < 3.6.2
-        with zipfile.ZipFile(str_path, 'r') as z, z.open(filename) as f:
-            return f.read()
+
+        st = os.stat(self._path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:  # the document was saved
+            self.close()
+            self._stamp = stamp
+            self._aliases = None
+            self._cache.clear()
+            self._cache_size = 0
+        if self._zip_file is None:
+            self._zip_file = zipfile.ZipFile(self._path, 'r')
+        return self._zip_file
+
+    def _release(self):
+        if not self._keep_open:
+            self.close()
+
+    def _resolve_name(self, z: Any, filename: str) -> str:
+        """
+        The identical assets are stored once: the other names are mapped to
+        the stored asset in an index.
+        """
+        import json
+
+        if filename in z.NameToInfo:
+            return filename
+        if self._aliases is None:
+            try:
+                self._aliases = json.loads(
+                    z.read(ASSETS_INDEX_NAME).decode("utf-8"))
+            except KeyError:  # no index
+                self._aliases = {}
+        return self._aliases.get(filename, filename)
+
+    def _put(self, name: str, bs: bytes):
+        if len(bs) > self._max_cache_size:
+            return
+        self._cache[name] = bs
+        self._cache_size += len(bs)
+        while self._cache_size > self._max_cache_size:
+            _, old_bs = self._cache.popitem(last=False)
+            self._cache_size -= len(old_bs)
 
 
 def init_logger(
@@ -723,9 +723,13 @@ class VoidProgressHandler(ProgressHandler):
 
     The function may set the `response` attribute of the progress_handler to
     return a value.
+
+    A long function should call `check_stopped` regularly to be cancellable
+    by `stop`.
     """
     def __init__(self):
         self.response = None
+        self._stopped = False
 
     def progress(self, n: int):
         """
@@ -750,6 +754,27 @@ class VoidProgressHandler(ProgressHandler):
         @param text: the text
         """
 
+    def stop(self):
+        """
+        Ask the function to stop: the next call to `check_stopped` will
+        raise a `ProgressActionStopped`. May be called from any thread.
+        """
+        self._stopped = True
+
+    @property
+    def stopped(self) -> bool:
+        """
+        @return: True if `stop` was called
+        """
+        return self._stopped
+
+    def check_stopped(self):
+        """
+        @raise ProgressActionStopped: if `stop` was called
+        """
+        if self._stopped:
+            raise ProgressActionStopped()
+
 
 class StandardProgressHandler(VoidProgressHandler):
     """
@@ -853,7 +878,7 @@ class ProgressExecutor:
         self._autoclose = autoclose
         self._progress_handler = progress_handler
 
-    def execute(self, func: Callable[[ProgressHandler], None]):
+    def execute(self, func: Callable[[ProgressHandler], None]) -> Thread:
         """
         Execute the function in a thread and reverberate StandardProgressHandler
         commands to the dialog.
@@ -861,6 +886,7 @@ class ProgressExecutor:
         @param func: a function that takes a `StandardProgressHandler` object. The
         function may set the `response` attribute of the progress_handler to
         return a value.
+        @return: the thread, to join it if necessary
         """
         oToolkit = get_toolkit()
 
@@ -883,6 +909,16 @@ class ProgressExecutor:
 
         t = Thread(target=aux)
         t.start()
+        return t
+
+    def stop(self):
+        """
+        Ask the function to stop (see `VoidProgressHandler.stop`). Typically
+        called by the listener of a "Cancel" button.
+        """
+        stop = getattr(self._progress_handler, "stop", None)
+        if stop is not None:
+            stop()
 
     @property
     def response(self) -> Any:
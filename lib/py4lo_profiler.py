@@ -0,0 +1,310 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Profile the macros at runtime: the entry points and the nested sections are
+recorded in a bounded ring buffer (timestamp, duration, depth, UNO calls
+and memory delta).
+
+The profiler is disabled by default: a profiled function costs one
+attribute lookup. It is enabled at runtime, without a rebuild, by a macro
+or by a custom property of the document (File > Properties > Custom
+Properties, e.g. `py4lo_profile` = `on`, `uno` or `uno,memory`).
+
+```
+# py4lo: embed lib py4lo_profiler
+from py4lo_profiler import enable_from_document, profiled, profiler
+
+@profiled()
+def my_button(*_args):
+    enable_from_document(XSCRIPTCONTEXT.getDocument())
+    with profiler.section("load"):
+        ...
+
+def dump_profile(*_args):
+    profiler.write_to_sheet(oSheet)  # or profiler.write_trace(path)
+```
+"""
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+from py4lo_helper import DataArrayCopier
+from py4lo_typing import UnoSheet, UnoSpreadsheetDocument
+from py4lo_uno_stats import UnoStats, instrument_uno
+
+DEFAULT_CAPACITY = 1000
+DOCUMENT_PROPERTY = "py4lo_profile"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ProfileRecord(NamedTuple):
+    name: str
+    timestamp: float  # epoch, in s
+    start: float  # in s, since the creation of the profiler
+    duration: float  # in s
+    depth: int
+    thread_id: int
+    uno_calls: Optional[int]
+    memory_delta: Optional[int]  # in bytes
+
+
+class MacroProfiler:
+    """
+    A profiler with a bounded ring buffer: when the buffer is full, the
+    oldest records are dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._records: Deque[ProfileRecord] = deque(maxlen=capacity)
+        self._count = 0
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._count_uno_calls = False
+        self._trace_memory = False
+        self.enabled = False
+
+    def enable(self, count_uno_calls: bool = False,
+               trace_memory: bool = False,
+               capacity: Optional[int] = None):
+        """
+        @param count_uno_calls: if True, the UNO calls of the `py4lo_helper`
+        provider objects are counted (see `py4lo_uno_stats`)
+        @param trace_memory: if True, record the memory deltas (slow)
+        @param capacity: if not None, the new capacity of the buffer
+        """
+        if capacity is not None and capacity != self._records.maxlen:
+            self._records = deque(self._records, maxlen=capacity)
+        self._count_uno_calls = count_uno_calls
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif self._trace_memory and not trace_memory:
+            tracemalloc.stop()
+        self._trace_memory = trace_memory
+        self.enabled = True
+
+    def disable(self):
+        if self._trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._trace_memory = False
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+            self._count = 0
+
+    @property
+    def records(self) -> List[ProfileRecord]:
+        """
+        @return: the records, in the order of completion
+        """
+        with self._lock:
+            return list(self._records)
+
+    @property
+    def dropped(self) -> int:
+        """
+        @return: the number of records dropped by the ring buffer
+        """
+        return self._count - len(self._records)
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        A profiled section.
+
+        @param name: the name of the section
+        """
+        if not self.enabled:
+            yield
+            return
+
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        with ExitStack() as stack:
+            uno_stats: Optional[UnoStats] = None
+            if self._count_uno_calls:
+                if depth == 0:
+                    local.uno_stats = stack.enter_context(instrument_uno())
+                uno_stats = getattr(local, "uno_stats", None)
+            if uno_stats is None:
+                uno_calls_before = 0
+            else:
+                uno_calls_before = uno_stats.total_calls
+            memory_before = self._get_memory()
+            local.depth = depth + 1
+            timestamp = time.time()
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                duration = time.perf_counter() - start
+                local.depth = depth
+                if depth == 0:
+                    local.uno_stats = None
+                if uno_stats is None:
+                    uno_calls = None
+                else:
+                    uno_calls = uno_stats.total_calls - uno_calls_before
+                memory_after = self._get_memory()
+                if memory_before is None or memory_after is None:
+                    memory_delta = None
+                else:
+                    memory_delta = memory_after - memory_before
+                self._add(ProfileRecord(
+                    name, timestamp, start - self._origin, duration, depth,
+                    threading.get_ident(), uno_calls, memory_delta))
+
+    def _get_memory(self) -> Optional[int]:
+        if self._trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    def _add(self, record: ProfileRecord):
+        with self._lock:
+            self._records.append(record)
+            self._count += 1
+
+    def get_trace_events(self) -> List[Dict[str, Any]]:
+        """
+        @return: the records as Chrome trace events
+        """
+        pid = os.getpid()
+        events = []
+        for record in sorted(self.records, key=lambda r: r.start):
+            args: Dict[str, Any] = {}
+            if record.uno_calls is not None:
+                args["uno_calls"] = record.uno_calls
+            if record.memory_delta is not None:
+                args["memory_delta"] = record.memory_delta
+            events.append({
+                "name": record.name, "cat": "macro", "ph": "X",
+                "ts": record.start * 1e6, "dur": record.duration * 1e6,
+                "pid": pid, "tid": record.thread_id, "args": args,
+            })
+        return events
+
+    def write_trace(self, path: Path):
+        """
+        Write the records as a trace-event JSON file (open it with
+        chrome://tracing or https://ui.perfetto.dev).
+
+        @param path: the path
+        """
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.get_trace_events(),
+                       "displayTimeUnit": "ms"}, f)
+
+    def get_data_array(self) -> List[List[Any]]:
+        """
+        @return: the records as a data array, with a header
+        """
+        data_array: List[List[Any]] = [["name", "timestamp", "duration ms",
+                                        "depth", "UNO calls", "memory delta"]]
+        for record in self.records:
+            data_array.append([
+                "  " * record.depth + record.name,
+                datetime.datetime.fromtimestamp(record.timestamp).isoformat(
+                    timespec="milliseconds"),
+                record.duration * 1000,
+                record.depth,
+                "" if record.uno_calls is None else record.uno_calls,
+                "" if record.memory_delta is None else record.memory_delta,
+            ])
+        return data_array
+
+    def write_to_sheet(self, oSheet: UnoSheet):
+        """
+        Write the records in a sheet, without undo.
+
+        @param oSheet: the sheet
+        """
+        DataArrayCopier(undo=False).copy(oSheet.getCellByPosition(0, 0),
+                                         self.get_data_array())
+
+
+profiler = MacroProfiler()
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    A decorator for the macros entry points (and any function) that records
+    the calls in the `profiler` when it is enabled.
+
+    @param name: the name of the section, default is the qualified name of
+    the function
+    """
+
+    def decorator(func: F) -> F:
+        section_name = func.__qualname__ if name is None else name
+
+        @functools.wraps(func)
+        def decorated_func(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.section(section_name):
+                return func(*args, **kwargs)
+
+        return decorated_func  # type: ignore[return-value]
+
+    return decorator
+
+
+def enable_from_document(oDoc: UnoSpreadsheetDocument,
+                         property_name: str = DOCUMENT_PROPERTY) -> bool:
+    """
+    Enable or disable the profiler according to a custom property of the
+    document: `on`, `uno` (count UNO calls), `memory` (memory deltas), or a
+    comma separated list of those. Any other value disables the profiler.
+
+    @param oDoc: the document
+    @param property_name: the name of the custom property
+    @return: True if the profiler is enabled
+    """
+    oProps = oDoc.DocumentProperties.UserDefinedProperties
+    if oProps.getPropertySetInfo().hasPropertyByName(property_name):
+        value = str(oProps.getPropertyValue(property_name))
+    else:
+        value = ""
+    options = {option.strip().lower() for option in value.split(",")}
+    if options & {"on", "true", "1", "uno", "memory"}:
+        profiler.enable(count_uno_calls="uno" in options,
+                        trace_memory="memory" in options)
+    else:
+        profiler.disable()
+    return profiler.enabled
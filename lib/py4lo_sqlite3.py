@@ -75,18 +75,25 @@ variable SQLITE3_LIB to set the actual library path (including the name).
 
 import datetime as dt
 import enum
+import io
+import itertools
 import json
 import os
 from contextlib import contextmanager
 from ctypes import (
     CDLL,
+    CFUNCTYPE,
     POINTER,
     byref,
+    c_char,
     c_char_p,
     c_double,
     c_int,
+    c_int64,
     c_void_p,
+    cast,
     cdll,
+    sizeof,
     string_at,
 )
 from ctypes.util import find_library
@@ -94,11 +101,13 @@ from pathlib import Path
 from typing import (
     Any,
     Callable,
+    Dict,
     Iterator,
     List,
     Mapping,
     Optional,
     Sequence,
+    Tuple,
     Union,
 )
 
@@ -293,6 +302,133 @@ sqlite3_lib.sqlite3_changes.argtypes = [sqlite3_p]
 sqlite3_lib.sqlite3_changes.restype = c_int
 sqlite3_changes = sqlite3_lib.sqlite3_changes
 
+# https://www.sqlite.org/c3ref/bind_blob.html
+sqlite3_lib.sqlite3_bind_zeroblob.argtypes = [sqlite3_stmt_p, c_int, c_int]
+sqlite3_lib.sqlite3_bind_zeroblob.restype = c_int
+sqlite3_bind_zeroblob = sqlite3_lib.sqlite3_bind_zeroblob
+
+# https://www.sqlite.org/c3ref/last_insert_rowid.html
+sqlite3_lib.sqlite3_last_insert_rowid.argtypes = [sqlite3_p]
+sqlite3_lib.sqlite3_last_insert_rowid.restype = c_int64
+sqlite3_last_insert_rowid = sqlite3_lib.sqlite3_last_insert_rowid
+
+# opaque structure for incremental blob I/O
+sqlite3_blob_p = c_void_p
+
+# https://www.sqlite.org/c3ref/blob_open.html
+sqlite3_lib.sqlite3_blob_open.argtypes = [sqlite3_p, c_char_p, c_char_p,
+                                          c_char_p, c_int64, c_int,
+                                          POINTER(sqlite3_blob_p)]
+sqlite3_lib.sqlite3_blob_open.restype = c_int
+sqlite3_blob_open = sqlite3_lib.sqlite3_blob_open
+
+# https://www.sqlite.org/c3ref/blob_bytes.html
+sqlite3_lib.sqlite3_blob_bytes.argtypes = [sqlite3_blob_p]
+sqlite3_lib.sqlite3_blob_bytes.restype = c_int
+sqlite3_blob_bytes = sqlite3_lib.sqlite3_blob_bytes
+
+# https://www.sqlite.org/c3ref/blob_read.html
+sqlite3_lib.sqlite3_blob_read.argtypes = [sqlite3_blob_p, c_void_p, c_int,
+                                          c_int]
+sqlite3_lib.sqlite3_blob_read.restype = c_int
+sqlite3_blob_read = sqlite3_lib.sqlite3_blob_read
+
+# https://www.sqlite.org/c3ref/blob_write.html
+sqlite3_lib.sqlite3_blob_write.argtypes = [sqlite3_blob_p, c_void_p, c_int,
+                                           c_int]
+sqlite3_lib.sqlite3_blob_write.restype = c_int
+sqlite3_blob_write = sqlite3_lib.sqlite3_blob_write
+
+# https://www.sqlite.org/c3ref/blob_reopen.html
+sqlite3_lib.sqlite3_blob_reopen.argtypes = [sqlite3_blob_p, c_int64]
+sqlite3_lib.sqlite3_blob_reopen.restype = c_int
+sqlite3_blob_reopen = sqlite3_lib.sqlite3_blob_reopen
+
+# https://www.sqlite.org/c3ref/blob_close.html
+sqlite3_lib.sqlite3_blob_close.argtypes = [sqlite3_blob_p]
+sqlite3_lib.sqlite3_blob_close.restype = c_int
+sqlite3_blob_close = sqlite3_lib.sqlite3_blob_close
+
+# https://www.sqlite.org/c3ref/progress_handler.html
+SQLITE_XPROGRESS = CFUNCTYPE(c_int, c_void_p)
+
+sqlite3_lib.sqlite3_progress_handler.argtypes = [sqlite3_p, c_int,
+                                                 SQLITE_XPROGRESS, c_void_p]
+sqlite3_lib.sqlite3_progress_handler.restype = None
+sqlite3_progress_handler = sqlite3_lib.sqlite3_progress_handler
+
+# opaque structures for application-defined functions
+sqlite3_context_p = c_void_p
+sqlite3_value_p = c_void_p
+
+# https://www.sqlite.org/c3ref/create_function.html
+SQLITE_XFUNC = CFUNCTYPE(None, sqlite3_context_p, c_int,
+                         POINTER(sqlite3_value_p))
+SQLITE_XFINAL = CFUNCTYPE(None, sqlite3_context_p)
+
+sqlite3_lib.sqlite3_create_function_v2.argtypes = [
+    sqlite3_p, c_char_p, c_int, c_int, c_void_p,
+    SQLITE_XFUNC, SQLITE_XFUNC, SQLITE_XFINAL, c_void_p]
+sqlite3_lib.sqlite3_create_function_v2.restype = c_int
+sqlite3_create_function_v2 = sqlite3_lib.sqlite3_create_function_v2
+
+# https://www.sqlite.org/c3ref/aggregate_context.html
+sqlite3_lib.sqlite3_aggregate_context.argtypes = [sqlite3_context_p, c_int]
+sqlite3_lib.sqlite3_aggregate_context.restype = c_void_p
+sqlite3_aggregate_context = sqlite3_lib.sqlite3_aggregate_context
+
+# https://www.sqlite.org/c3ref/value_blob.html
+sqlite3_lib.sqlite3_value_type.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_type.restype = c_int
+sqlite3_value_type = sqlite3_lib.sqlite3_value_type
+
+sqlite3_lib.sqlite3_value_int64.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_int64.restype = c_int64
+sqlite3_value_int64 = sqlite3_lib.sqlite3_value_int64
+
+sqlite3_lib.sqlite3_value_double.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_double.restype = c_double
+sqlite3_value_double = sqlite3_lib.sqlite3_value_double
+
+sqlite3_lib.sqlite3_value_text.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_text.restype = c_void_p
+sqlite3_value_text = sqlite3_lib.sqlite3_value_text
+
+sqlite3_lib.sqlite3_value_blob.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_blob.restype = c_void_p
+sqlite3_value_blob = sqlite3_lib.sqlite3_value_blob
+
+sqlite3_lib.sqlite3_value_bytes.argtypes = [sqlite3_value_p]
+sqlite3_lib.sqlite3_value_bytes.restype = c_int
+sqlite3_value_bytes = sqlite3_lib.sqlite3_value_bytes
+
+# https://www.sqlite.org/c3ref/result_blob.html
+sqlite3_lib.sqlite3_result_blob.argtypes = [sqlite3_context_p, c_void_p, c_int,
+                                            c_void_p]
+sqlite3_lib.sqlite3_result_blob.restype = None
+sqlite3_result_blob = sqlite3_lib.sqlite3_result_blob
+
+sqlite3_lib.sqlite3_result_double.argtypes = [sqlite3_context_p, c_double]
+sqlite3_lib.sqlite3_result_double.restype = None
+sqlite3_result_double = sqlite3_lib.sqlite3_result_double
+
+sqlite3_lib.sqlite3_result_error.argtypes = [sqlite3_context_p, c_char_p, c_int]
+sqlite3_lib.sqlite3_result_error.restype = None
+sqlite3_result_error = sqlite3_lib.sqlite3_result_error
+
+sqlite3_lib.sqlite3_result_int64.argtypes = [sqlite3_context_p, c_int64]
+sqlite3_lib.sqlite3_result_int64.restype = None
+sqlite3_result_int64 = sqlite3_lib.sqlite3_result_int64
+
+sqlite3_lib.sqlite3_result_null.argtypes = [sqlite3_context_p]
+sqlite3_lib.sqlite3_result_null.restype = None
+sqlite3_result_null = sqlite3_lib.sqlite3_result_null
+
+sqlite3_lib.sqlite3_result_text.argtypes = [sqlite3_context_p, c_char_p, c_int,
+                                            c_void_p]
+sqlite3_lib.sqlite3_result_text.restype = None
+sqlite3_result_text = sqlite3_lib.sqlite3_result_text
+
 ##############################################
 # https://www.sqlite.org/c3ref/constlist.html
 ##############################################
@@ -345,6 +481,11 @@ SQLITE_NULL = 5
 SQLITE_STATIC = 0
 SQLITE_TRANSIENT = -1
 
+# https://www.sqlite.org/c3ref/c_any.html
+SQLITE_UTF8 = 1
+# https://www.sqlite.org/c3ref/c_deterministic.html
+SQLITE_DETERMINISTIC = 0x000000800
+
 
 ####################
 # Decode functions #
@@ -531,6 +672,91 @@ def decode_text_to_json(stmt: sqlite3_stmt_p, i: int) -> JSON:
     bs = sqlite3_column_text(stmt, i)
     return json.loads(bs.decode("utf-8"))
 
+
+##########################
+# Value decode functions #
+##########################
+# Arguments of application-defined functions are `sqlite3_value`s,
+# not columns: these functions mirror the column decode functions above.
+def decode_value_text_utf8_to_str(value: sqlite3_value_p) -> str:
+    """
+    To decode a TEXT argument of an application-defined function.
+
+    @param value: the sqlite3_value
+    @return: the string
+    """
+    return _value_bytes(sqlite3_value_text(value), value).decode("utf-8")
+
+
+def decode_value_blob_to_bytes(value: sqlite3_value_p) -> bytes:
+    """
+    To decode a BLOB argument of an application-defined function.
+
+    @param value: the sqlite3_value
+    @return: the bytes
+    """
+    return _value_bytes(sqlite3_value_blob(value), value)
+
+
+def _value_bytes(ptr: Optional[int], value: sqlite3_value_p) -> bytes:
+    if ptr is None:
+        return b''
+
+    size = sqlite3_value_bytes(value)
+    return string_at(ptr, size)
+
+
+def decode_value_unix_ts_to_datetime_utc(
+        value: sqlite3_value_p) -> dt.datetime:
+    """
+    To decode a DOUBLE argument of an application-defined function, stored
+    with `stmt.bind_unix_ts(<i>, <datetime>)`.
+
+    @param value: the sqlite3_value
+    @return: the datetime
+    """
+    seconds = sqlite3_value_double(value)
+    return dt.datetime.fromtimestamp(seconds, tz=dt.timezone.utc)
+
+
+def decode_value_julian_to_datetime_utc(value: sqlite3_value_p) -> dt.datetime:
+    """
+    To decode a DOUBLE argument of an application-defined function, stored
+    with `stmt.bind_julian(<i>, <datetime>)`.
+
+    @param value: the sqlite3_value
+    @return: the datetime
+    """
+    days = sqlite3_value_double(value)
+    return _julian_to_datetime(days).astimezone(dt.timezone.utc)
+
+
+def decode_value_iso8601_to_datetime(value: sqlite3_value_p) -> dt.datetime:
+    """
+    To decode a TEXT argument of an application-defined function, stored
+    with `stmt.bind_iso8601(<i>, <datetime>)`.
+
+    @param value: the sqlite3_value
+    @return: the datetime (relevant timezone)
+    """
+    iso_str = decode_value_text_utf8_to_str(value)
+    d = dt.datetime.fromisoformat(iso_str)
+    if d.tzinfo is None:
+        d = d.astimezone()
+    return d
+
+
+def decode_value_text_to_json(value: sqlite3_value_p) -> JSON:
+    """
+    To decode a TEXT argument of an application-defined function, stored
+    with `stmt.bind_json(<i>, <json value>)`.
+
+    @param value: the sqlite3_value
+    @return: the json value
+    """
+    return json.loads(decode_value_text_utf8_to_str(value))
+
+
 class SQLType(enum.Enum):
     """
     List of SQLite types that can be bound.
@@ -552,6 +778,25 @@ class SQLType(enum.Enum):
 
 
 ColumnDecode = Callable[[sqlite3_stmt_p, int], Any]
+ValueDecode = Callable[[sqlite3_value_p], Any]
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def _buffer_pointer(v: BytesLike) -> Tuple[Any, int]:
+    """
+    @param v: a bytes-like object
+    @return: an object that ctypes passes as a pointer to the data of `v`
+    (without a copy, unless `v` is a read-only non `bytes` buffer) and the
+    size of the data.
+    """
+    if isinstance(v, bytes):
+        return v, len(v)
+
+    view = memoryview(v).cast("B")
+    if view.readonly:
+        bs = view.tobytes()
+        return bs, len(bs)
+    return (c_char * len(view)).from_buffer(view), len(view)
 
 
 class Sqlite3Statement:
@@ -571,6 +816,8 @@ class Sqlite3Statement:
         """
         self._db = db
         self._stmt = stmt
+        # buffers bound with SQLITE_STATIC must outlive the bindings
+        self._static_buffers: Dict[int, Any] = {}
 
     def bind_text(self, i: int, v: Optional[str]):
         """
@@ -604,6 +851,41 @@ class Sqlite3Statement:
         if ret != SQLITE_OK:
             raise self._err(ret)
 
+    def bind_blob_static(self, i: int, v: Optional[BytesLike]):
+        """
+        Bind a blob parameter without copying it (`SQLITE_STATIC`).
+        If the value is None, then bind NULL value.
+
+        The statement keeps a reference to the buffer until the parameter
+        is bound again, the bindings are cleared or the statement is
+        finalized: the buffer **must not** be modified meanwhile.
+
+        @param i: number of the col
+        @param v: the blob value (bytes, bytearray, memoryview...)
+        """
+        if v is None:
+            ret = sqlite3_bind_null(self._stmt, i)
+            self._static_buffers.pop(i, None)
+        else:
+            ptr, size = _buffer_pointer(v)
+            ret = sqlite3_bind_blob(self._stmt, i, ptr, size, SQLITE_STATIC)
+            self._static_buffers[i] = (v, ptr)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+
+    def bind_zeroblob(self, i: int, n: int):
+        """
+        Bind a blob of `n` zero bytes. SQLite does not allocate the blob
+        in memory: use it to preallocate a blob that will be filled with
+        `Sqlite3Database.open_blob`.
+
+        @param i: number of the col
+        @param n: the size of the blob
+        """
+        ret = sqlite3_bind_zeroblob(self._stmt, i, n)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+
     def bind_double(self, i: int, v: Optional[float]):
         """
         Bind a double parameter (float in Python).
@@ -730,6 +1012,7 @@ class Sqlite3Statement:
         ret = sqlite3_clear_bindings(self._stmt)
         if ret != SQLITE_OK:
             raise self._err(ret)
+        self._static_buffers.clear()
 
     def execute_update(self) -> int:
         """
@@ -860,6 +1143,210 @@ class Sqlite3Statement:
             raise ValueError(f"Unknown type {sql_type}")
         return ret
 
+
+class BlobIO(io.RawIOBase):
+    """
+    A file-like object over a blob, for incremental I/O
+    (see https://www.sqlite.org/c3ref/blob_open.html). Use
+    `Sqlite3Database.open_blob` to create it.
+
+    The size of the blob can't be changed: use `Sqlite3Statement.bind_zeroblob`
+    or the SQL function `zeroblob(n)` to preallocate the blob before writing.
+    """
+
+    def __init__(self, db: sqlite3_p, blob: sqlite3_blob_p, writable: bool):
+        """
+        @param db: sqlite3 handle
+        @param blob: the sqlite3_blob handle
+        @param writable: True if the blob was opened for read and write
+        """
+        super().__init__()
+        self._db = db
+        self._blob = blob
+        self._writable = writable
+        self._size = sqlite3_blob_bytes(blob)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return self._writable
+
+    def seekable(self) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def readinto(self, b: Any) -> int:
+        """
+        Read bytes into a preallocated, writable buffer.
+
+        @param b: the buffer (bytearray, memoryview...)
+        @return: the number of bytes read, 0 at the end of the blob
+        """
+        self._check_open()
+        view = memoryview(b).cast("B")
+        n = min(len(view), self._size - self._pos)
+        if n <= 0:
+            return 0
+        buf = (c_char * n).from_buffer(view)
+        ret = sqlite3_blob_read(self._blob, buf, n, self._pos)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+        self._pos += n
+        return n
+
+    def write(self, b: Any) -> int:
+        """
+        Write bytes at the current position. The blob can't grow.
+
+        @param b: the bytes
+        @return: the number of bytes written
+        @raise ValueError: if the data goes beyond the end of the blob
+        """
+        self._check_open()
+        if not self._writable:
+            raise io.UnsupportedOperation("write")
+        ptr, n = _buffer_pointer(b)
+        if self._pos + n > self._size:
+            raise ValueError("data longer than blob length")
+        ret = sqlite3_blob_write(self._blob, ptr, n, self._pos)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_open()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"Unknown whence {whence}")
+        if pos < 0:
+            raise ValueError(f"Negative position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self) -> int:
+        self._check_open()
+        return self._pos
+
+    def reopen(self, rowid: int):
+        """
+        Move the handle to the same column of another row. This is faster
+        than opening a new handle
+        (see https://www.sqlite.org/c3ref/blob_reopen.html).
+
+        @param rowid: the rowid of the row
+        """
+        self._check_open()
+        ret = sqlite3_blob_reopen(self._blob, rowid)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+        self._size = sqlite3_blob_bytes(self._blob)
+        self._pos = 0
+
+    def close(self):
+        if not self.closed:
+            ret = sqlite3_blob_close(self._blob)
+            super().close()
+            if ret != SQLITE_OK:
+                raise self._err(ret)
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed blob")
+
+    def _err(self, ret: int) -> SQLiteError:
+        return SQLiteError(ret, sqlite3_errmsg(self._db).decode("utf-8"))
+
+
+#################################
+# Application-defined functions #
+#################################
+def _to_value_decode(sql_type_or_decode_func: Union[int, ValueDecode]
+                     ) -> ValueDecode:
+    if not isinstance(sql_type_or_decode_func, int):
+        return sql_type_or_decode_func
+    elif sql_type_or_decode_func == SQLITE_INTEGER:
+        return sqlite3_value_int64
+    elif sql_type_or_decode_func == SQLITE_FLOAT:
+        return sqlite3_value_double
+    elif sql_type_or_decode_func == SQLITE_TEXT:
+        return decode_value_text_utf8_to_str
+    elif sql_type_or_decode_func == SQLITE_BLOB:
+        return decode_value_blob_to_bytes
+    elif sql_type_or_decode_func == PY4LO_UNIX_TS:
+        return decode_value_unix_ts_to_datetime_utc
+    elif sql_type_or_decode_func == PY4LO_JULIAN:
+        return decode_value_julian_to_datetime_utc
+    elif sql_type_or_decode_func == PY4LO_ISO8601:
+        return decode_value_iso8601_to_datetime
+    elif sql_type_or_decode_func == PY4LO_JSON:
+        return decode_value_text_to_json
+    else:
+        raise ValueError(f"Unknown type {sql_type_or_decode_func}")
+
+
+def _decode_args(
+        argc: int, argv: Any, value_decodes: Optional[List[ValueDecode]]
+) -> List[Any]:
+    args = []
+    for i in range(argc):
+        value = argv[i]
+        sql_type = sqlite3_value_type(value)
+        if sql_type == SQLITE_NULL:
+            args.append(None)
+        elif value_decodes is None or i >= len(value_decodes):
+            args.append(_to_value_decode(sql_type)(value))
+        else:
+            args.append(value_decodes[i](value))
+    return args
+
+
+def _set_result(ctx: sqlite3_context_p, v: Any):
+    """
+    Set the result of an application-defined function. The Python type of the
+    value selects the SQLite type, as the `Sqlite3Statement.bind_...` methods
+    do: `None` is NULL, `datetime` is an ISO-8601 TEXT and `dict` or `list`
+    is a JSON TEXT.
+
+    @param ctx: the context
+    @param v: the value
+    """
+    if v is None:
+        sqlite3_result_null(ctx)
+    elif isinstance(v, int):  # bool is an int
+        sqlite3_result_int64(ctx, v)
+    elif isinstance(v, float):
+        sqlite3_result_double(ctx, v)
+    elif isinstance(v, str):
+        bs = v.encode("utf-8")
+        sqlite3_result_text(ctx, bs, len(bs), SQLITE_TRANSIENT)
+    elif isinstance(v, (bytes, bytearray, memoryview)):
+        bs = bytes(v)
+        sqlite3_result_blob(ctx, bs, len(bs), SQLITE_TRANSIENT)
+    elif isinstance(v, dt.datetime):
+        bs = v.isoformat().encode("ascii")
+        sqlite3_result_text(ctx, bs, len(bs), SQLITE_TRANSIENT)
+    elif isinstance(v, (dict, list)):
+        bs = json.dumps(v).encode("utf-8")
+        sqlite3_result_text(ctx, bs, len(bs), SQLITE_TRANSIENT)
+    else:
+        raise TypeError(f"Can't return a {type(v)} to SQLite")
+
+
+def _set_result_error(ctx: sqlite3_context_p, e: Exception):
+    bs = f"{type(e).__name__}: {e}".encode()
+    sqlite3_result_error(ctx, bs, len(bs))
+
+
 class Sqlite3Database:
     """
     A wrapper for a sqlite3 handle (see https://www.sqlite.org/c3ref/open.html).
@@ -870,6 +1357,12 @@ class Sqlite3Database:
         @param db: SQLite db handle
         """
         self._db = db
+        # keep the ctypes callbacks alive as long as the connection
+        self._callbacks: Dict[Tuple[str, int], Tuple[Any, ...]] = {}
+        self._aggregates: Dict[int, Any] = {}
+        self._aggregate_keys = itertools.count(1)
+        self._progress_callback = SQLITE_XPROGRESS()
+        self._progress_exception: Optional[BaseException] = None
 
     def execute_update(self, sql: str) -> int:
         """
@@ -950,10 +1443,284 @@ class Sqlite3Database:
         else:
             self.execute_update("END TRANSACTION")  # synonym of COMMIT
 
+    @contextmanager
+    def open_blob(self, table: str, column: str, rowid: int,
+                  writable: bool = False, db_name: str = "main"
+                  ) -> Iterator[BlobIO]:
+        """
+        Context manager to stream a blob with constant memory:
+        ```
+        with db.open_blob("assets", "data", rowid) as blob:
+            shutil.copyfileobj(blob, dest)
+        ```
+
+        @param table: the table name
+        @param column: the column name
+        @param rowid: the rowid of the row
+        @param writable: True to open the blob for read and write
+        @param db_name: the symbolic name of the database
+        @yield: the BlobIO
+        """
+        blob_p = sqlite3_blob_p()
+        ret = sqlite3_blob_open(
+            self._db, db_name.encode("utf-8"), table.encode("utf-8"),
+            column.encode("utf-8"), rowid, 1 if writable else 0,
+            byref(blob_p))
+        if ret != SQLITE_OK:
+            err = self._err(ret)
+            sqlite3_blob_close(blob_p)  # harmless if blob_p is NULL
+            raise err
+
+        blob = BlobIO(self._db, blob_p, writable)
+        try:
+            yield blob
+        finally:
+            blob.close()
+
+    def last_insert_rowid(self) -> int:
+        """
+        See https://www.sqlite.org/c3ref/last_insert_rowid.html
+
+        @return: the rowid of the most recent successful INSERT
+        """
+        return sqlite3_last_insert_rowid(self._db)
+
     def interrupt(self) -> bool:
         sqlite3_interrupt(self._db)
         return bool(sqlite3_is_interrupted(self._db))
 
+    def set_progress_handler(
+            self, n: int, callback: Optional[Callable[[], Any]]):
+        """
+        Set a callback invoked every `n` virtual machine instructions
+        during long queries (see
+        https://www.sqlite.org/c3ref/progress_handler.html).
+
+        If the callback returns a truthy value or raises an exception, the
+        query is interrupted and fails with `SQLITE_INTERRUPT`. Use
+        `progress` to get the exception back.
+
+        @param n: the approximate number of VM instructions between calls
+        @param callback: the callback, or None to remove the handler
+        """
+        self._progress_exception = None
+        if callback is None or n <= 0:
+            self._progress_callback = SQLITE_XPROGRESS()
+            sqlite3_progress_handler(self._db, 0, self._progress_callback,
+                                     None)
+            return
+
+        def x_progress(_arg: Any) -> int:
+            try:
+                return 1 if callback() else 0
+            except BaseException as e:
+                self._progress_exception = e
+                return 1
+
+        self._progress_callback = SQLITE_XPROGRESS(x_progress)
+        sqlite3_progress_handler(self._db, n, self._progress_callback, None)
+
+    @contextmanager
+    def progress(self, n: int, callback: Callable[[], Any]) -> Iterator[None]:
+        """
+        Context manager to set a progress handler:
+        ```
+        with db.progress(10_000, progress_handler.check_stopped):
+            db.execute_update(...)
+        ```
+
+        If the callback raised an exception, the query is interrupted and
+        the exception is raised instead of the `SQLiteError`.
+
+        @param n: the approximate number of VM instructions between calls
+        @param callback: the callback (see `set_progress_handler`)
+        @yield: a context
+        """
+        self.set_progress_handler(n, callback)
+        try:
+            yield
+        except SQLiteError as e:
+            progress_exception = self._progress_exception
+            if (e.result_code == SQLITE_INTERRUPT
+                    and progress_exception is not None):
+                raise progress_exception from e
+            raise
+        finally:
+            self.set_progress_handler(0, None)
+
+    def execute_with_progress(
+            self, executor: Any, func: Callable[["Sqlite3Database"], Any],
+            n: int = 100_000, steps: int = 1) -> Any:
+        """
+        Execute a long query on a worker thread while a progress dialog stays
+        responsive:
+        ```
+        executor = ProgressExecutorBuilder().autoclose(True).build()
+        db.execute_with_progress(
+            executor, lambda db: db.execute_update("DELETE FROM t WHERE ..."))
+        ...
+        executor.stop()  # e.g. from a "Cancel" button listener
+        ```
+
+        Every `n` VM instructions, the progress handler of the executor
+        moves forward by `steps` and the query is interrupted if the handler
+        was stopped (the `ProgressActionStopped` is caught by the executor).
+        The result of `func` is the `response` of the executor.
+
+        @param executor: a `py4lo_dialogs.ProgressExecutor`, or any object with
+        an `execute(func)` method that calls `func(progress_handler)`
+        @param func: the function that runs the query
+        @param n: the approximate number of VM instructions between calls
+        @param steps: the progress steps for each call
+        @return: the value returned by `executor.execute` (the worker thread)
+        """
+        def aux(progress_handler: Any):
+            def callback():
+                progress_handler.progress(steps)
+                check_stopped = getattr(progress_handler, "check_stopped",
+                                        None)
+                if check_stopped is not None:
+                    check_stopped()
+
+            with self.progress(n, callback):
+                progress_handler.response = func(self)
+
+        return executor.execute(aux)
+
+    def create_function(
+            self, name: str, nargs: int, func: Callable[..., Any],
+            deterministic: bool = True,
+            arg_decodes: Optional[List[Union[int, ValueDecode]]] = None):
+        """
+        Register a Python function as a scalar SQL function
+        (see https://www.sqlite.org/c3ref/create_function.html):
+        ```
+        db.create_function("py_parse", 1, parse)
+        db.execute_update("UPDATE t SET x = py_parse(x)")
+        ```
+
+        Arguments are decoded as the columns of `Sqlite3Statement.execute_query`
+        and the result is encoded according to its Python type (`None`, `int`,
+        `float`, `str`, `bytes`, `datetime` as ISO-8601, `dict` or `list` as
+        JSON). An exception raised by the function is returned as an SQL error.
+
+        @param name: the name of the SQL function
+        @param nargs: the number of arguments, -1 for any number
+        @param func: the Python function
+        @param deterministic: True if the function always returns the same
+        result for the same arguments (allows SQLite optimizations).
+        @param arg_decodes: None or the decode of each argument, as a list of
+        integers (SQLITE_..., PY4LO_...) or functions.
+        @raise SQLiteError: if the function can't be registered
+        """
+        value_decodes = self._to_value_decodes(arg_decodes)
+
+        def x_func(ctx: sqlite3_context_p, argc: int, argv: Any):
+            try:
+                args = _decode_args(argc, argv, value_decodes)
+                _set_result(ctx, func(*args))
+            except Exception as e:
+                _set_result_error(ctx, e)
+
+        self._create_function(name, nargs, deterministic,
+                              SQLITE_XFUNC(x_func), SQLITE_XFUNC(),
+                              SQLITE_XFINAL())
+
+    def create_aggregate(
+            self, name: str, nargs: int, aggregate_class: Callable[[], Any],
+            deterministic: bool = True,
+            arg_decodes: Optional[List[Union[int, ValueDecode]]] = None):
+        """
+        Register a Python class as an aggregate SQL function
+        (see https://www.sqlite.org/c3ref/create_function.html).
+        An instance of the class is created for each group. The method
+        `step(*args)` is called for each row and the method `finalize()`
+        returns the result:
+        ```
+        class Concat:
+            def __init__(self):
+                self._values = []
+
+            def step(self, value):
+                self._values.append(value)
+
+            def finalize(self):
+                return ", ".join(self._values)
+
+        db.create_aggregate("py_concat", 1, Concat)
+        ```
+
+        See `create_function` for the arguments and the result.
+
+        @param name: the name of the SQL function
+        @param nargs: the number of arguments, -1 for any number
+        @param aggregate_class: the Python class
+        @param deterministic: True if the function always returns the same
+        result for the same arguments (allows SQLite optimizations).
+        @param arg_decodes: None or the decode of each argument, as a list of
+        integers (SQLITE_..., PY4LO_...) or functions.
+        @raise SQLiteError: if the function can't be registered
+        """
+        value_decodes = self._to_value_decodes(arg_decodes)
+
+        def x_step(ctx: sqlite3_context_p, argc: int, argv: Any):
+            try:
+                args = _decode_args(argc, argv, value_decodes)
+                key = self._aggregate_key(ctx)
+                aggregate = self._aggregates.get(key)
+                if aggregate is None:
+                    aggregate = aggregate_class()
+                    self._aggregates[key] = aggregate
+                aggregate.step(*args)
+            except Exception as e:
+                _set_result_error(ctx, e)
+
+        def x_final(ctx: sqlite3_context_p):
+            try:
+                key = self._aggregate_key(ctx)
+                aggregate = self._aggregates.pop(key, None)
+                if aggregate is None:  # no row
+                    aggregate = aggregate_class()
+                _set_result(ctx, aggregate.finalize())
+            except Exception as e:
+                _set_result_error(ctx, e)
+
+        self._create_function(name, nargs, deterministic,
+                              SQLITE_XFUNC(), SQLITE_XFUNC(x_step),
+                              SQLITE_XFINAL(x_final))
+
+    def _to_value_decodes(
+            self, arg_decodes: Optional[List[Union[int, ValueDecode]]]
+    ) -> Optional[List[ValueDecode]]:
+        if arg_decodes is None:
+            return None
+        return [_to_value_decode(arg_decode) for arg_decode in arg_decodes]
+
+    def _aggregate_key(self, ctx: sqlite3_context_p) -> int:
+        """
+        SQLite allocates a zeroed buffer per group: store a key to the
+        Python aggregate instance in this buffer.
+        """
+        p = sqlite3_aggregate_context(ctx, sizeof(c_int64))
+        if p is None:
+            raise MemoryError()
+        key_p = cast(p, POINTER(c_int64))
+        if key_p.contents.value == 0:
+            key_p.contents.value = next(self._aggregate_keys)
+        return key_p.contents.value
+
+    def _create_function(self, name: str, nargs: int, deterministic: bool,
+                         x_func: Any, x_step: Any, x_final: Any):
+        flags = SQLITE_UTF8
+        if deterministic:
+            flags |= SQLITE_DETERMINISTIC
+        ret = sqlite3_create_function_v2(
+            self._db, name.encode("utf-8"), nargs, flags, None,
+            x_func, x_step, x_final, None)
+        if ret != SQLITE_OK:
+            raise self._err(ret)
+        self._callbacks[(name, nargs)] = (x_func, x_step, x_final)
+
 
 @contextmanager
 def sqlite_open(
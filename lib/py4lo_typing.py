@@ -370,13 +370,55 @@ class UnoDatabaseDocument(UnoOfficeDocument):
 
 
 
+class UnoDBResultSetMetaData(UnoService):
+    def getColumnCount(self) -> int: ...
+    def getColumnName(self, i: int) -> str: ...
+    def getColumnType(self, i: int) -> int: ...
+
+
+class UnoDBResultSet(UnoService):
+    def next(self) -> bool: ...
+    def wasNull(self) -> bool: ...
+    def getMetaData(self) -> UnoDBResultSetMetaData: ...
+    def getString(self, i: int) -> str: ...
+    def getBoolean(self, i: int) -> bool: ...
+    def getInt(self, i: int) -> int: ...
+    def getLong(self, i: int) -> int: ...
+    def getDouble(self, i: int) -> float: ...
+    def getBytes(self, i: int) -> Any: ...
+    def getDate(self, i: int) -> UnoDateStruct: ...
+    def getTime(self, i: int) -> UnoStruct: ...
+    def getTimestamp(self, i: int) -> UnoStruct: ...
+
+
 class UnoDBStatement(UnoService):
     def executeUpdate(self, sql: str) -> None: ...
     def execute(self, sql: str) -> None: ...
+    def executeQuery(self, sql: str) -> UnoDBResultSet: ...
     def addBatch(self, sql: str) -> None: ...
     def executeBatch(self) -> None: ...
 
 
+class UnoDBPreparedStatement(UnoService):
+    def setNull(self, i: int, sql_type: int) -> None: ...
+    def setBoolean(self, i: int, v: bool) -> None: ...
+    def setInt(self, i: int, v: int) -> None: ...
+    def setLong(self, i: int, v: int) -> None: ...
+    def setDouble(self, i: int, v: float) -> None: ...
+    def setString(self, i: int, v: str) -> None: ...
+    def setBytes(self, i: int, v: Any) -> None: ...
+    def setDate(self, i: int, v: UnoStruct) -> None: ...
+    def setTime(self, i: int, v: UnoStruct) -> None: ...
+    def setTimestamp(self, i: int, v: UnoStruct) -> None: ...
+    def clearParameters(self) -> None: ...
+    def executeUpdate(self) -> int: ...
+    def executeQuery(self) -> UnoDBResultSet: ...
+    def addBatch(self) -> None: ...
+    def clearBatch(self) -> None: ...
+    def executeBatch(self) -> Sequence[int]: ...
+    def close(self) -> None: ...
+
+
 class UnoDBDrop(UnoNameAccess[T], UnoIndexAccess[T], Generic[T]):
     def dropByName(self, name: str) -> None: ...
     def dropByIndex(self, i: int) -> None: ...
@@ -397,6 +439,9 @@ class UnoDBConnection(UnoService):
 
     def isClosed(self) -> bool: ...
     def createStatement(self) -> UnoDBStatement: ...
+    def prepareStatement(self, sql: str) -> UnoDBPreparedStatement: ...
+    def getAutoCommit(self) -> bool: ...
+    def setAutoCommit(self, auto_commit: bool) -> None: ...
     def commit(self) -> None: ...
     def close(self) -> None: ...
 
@@ -0,0 +1,245 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Count the UNO calls and measure their latency, to find the loops to batch.
+
+The instrumentation is opt-in: the UNO objects of the `py4lo_helper`
+provider are wrapped in proxies, and every object returned by a proxy is a
+proxy. Hence, the functions of `py4lo_helper` (`parent_doc`, `to_iter`,
+`to_dict`, ...) are instrumented without any cost when the mode is disabled.
+
+```
+# py4lo: embed lib py4lo_uno_stats
+from py4lo_uno_stats import instrument_uno
+
+def my_macro(*_args):
+    with instrument_uno(logger=logging.getLogger()) as stats:
+        oDoc = stats.wrap(XSCRIPTCONTEXT.getDocument())  # or get_provider().doc
+        ...
+```
+
+Each record is: the calling function (`module.function:line`), the UNO
+member (`Value`, `getCellByPosition()`, `set Value`), the count and the
+cumulative latency.
+"""
+import copy
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import py4lo_helper
+from py4lo_typing import UnoSheet
+
+_PROVIDER_ATTRIBUTES = ("doc", "controller", "frame", "parent_win",
+                        "script_provider", "ctxt", "service_manager",
+                        "desktop")
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None), tuple, list, dict,
+                Enum)
+
+
+class UnoStats:
+    """
+    The UNO calls statistics.
+    """
+
+    def __init__(self):
+        # (caller, member) -> [count, cumulative latency]
+        self._records: Dict[Tuple[str, str], List[Any]] = {}
+
+    def wrap(self, obj: Any) -> Any:
+        """
+        @param obj: a UNO object
+        @return: the instrumented object (values, structs and enums are not
+        wrapped)
+        """
+        if (isinstance(obj, (_PLAIN_TYPES, _UnoProxy))
+                or hasattr(obj, "typeName")):  # a UNO struct or enum
+            return obj
+        return _UnoProxy(obj, self)
+
+    def record(self, caller: str, member: str, elapsed: float):
+        """
+        @param caller: the calling function
+        @param member: the UNO member
+        @param elapsed: the latency in seconds
+        """
+        record = self._records.get((caller, member))
+        if record is None:
+            self._records[(caller, member)] = [1, elapsed]
+        else:
+            record[0] += 1
+            record[1] += elapsed
+
+    @property
+    def total_calls(self) -> int:
+        return sum(count for count, _ in self._records.values())
+
+    def get_rows(self, limit: Optional[int] = None
+                 ) -> List[Tuple[str, str, int, float]]:
+        """
+        @param limit: the max number of rows
+        @return: the rows (caller, member, count, cumulative latency in s),
+        most expensive first
+        """
+        rows = [(caller, member, count, elapsed)
+                for (caller, member), (count, elapsed)
+                in self._records.items()]
+        rows.sort(key=lambda row: (-row[3], -row[2]))
+        return rows[:limit]
+
+    def report(self, limit: Optional[int] = 30) -> str:
+        """
+        @param limit: the max number of rows
+        @return: the report, as a text table
+        """
+        lines = ["{:<50} {:<30} {:>8} {:>10} {:>10}".format(
+            "caller", "member", "count", "total ms", "mean us")]
+        for caller, member, count, elapsed in self.get_rows(limit):
+            lines.append(f"{caller:<50} {member:<30} {count:>8}"
+                         f" {elapsed * 1000:>10.3f}"
+                         f" {elapsed / count * 1e6:>10.1f}")
+        lines.append(f"Total: {self.total_calls} UNO calls")
+        return "\n".join(lines)
+
+    def write_to_sheet(self, oSheet: UnoSheet):
+        """
+        Write the report in a sheet (not instrumented).
+
+        @param oSheet: the sheet
+        """
+        oSheet = _unwrap(oSheet)
+        data_array = [("caller", "member", "count", "total ms")] + [
+            (caller, member, count, elapsed * 1000)
+            for caller, member, count, elapsed in self.get_rows()]
+        oRange = oSheet.getCellRangeByPosition(0, 0, 3, len(data_array) - 1)
+        oRange.DataArray = data_array
+
+
+@contextmanager
+def instrument_uno(logger: Optional[logging.Logger] = None,
+                   oSheet: Optional[UnoSheet] = None
+                   ) -> Iterator[UnoStats]:
+    """
+    Instrument the `py4lo_helper` provider, and write the report on exit.
+
+    @param logger: if not None, log the report
+    @param oSheet: if not None, write the report in this sheet
+    @return: the stats
+    """
+    stats = UnoStats()
+    old_provider = py4lo_helper.provider
+    if old_provider is not None:
+        py4lo_helper.provider = _instrument_provider(old_provider, stats)
+    try:
+        yield stats
+    finally:
+        py4lo_helper.provider = old_provider
+        if logger is not None:
+            logger.info("UNO calls:\n%s", stats.report())
+        if oSheet is not None:
+            stats.write_to_sheet(oSheet)
+
+
+def _instrument_provider(provider: Any, stats: UnoStats) -> Any:
+    instrumented = copy.copy(provider)
+    for name in _PROVIDER_ATTRIBUTES:
+        setattr(instrumented, name, stats.wrap(getattr(provider, name)))
+    # the lazy services will be created by the instrumented service manager
+    instrumented._reflect = None
+    instrumented._dispatcher = None
+    instrumented._script_provider_factory = None
+    instrumented._script_provider = None
+    return instrumented
+
+
+def _get_caller(frame: Any) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return "{}.{}:{}".format(frame.f_globals.get("__name__", "?"), name,
+                             frame.f_lineno)
+
+
+def _unwrap(obj: Any) -> Any:
+    if isinstance(obj, _UnoProxy):
+        return obj._py4lo_obj
+    elif isinstance(obj, (tuple, list)):
+        return type(obj)(_unwrap(o) for o in obj)
+    return obj
+
+
+class _UnoProxy:
+    """
+    A proxy that records the UNO calls.
+    """
+    __slots__ = ("_py4lo_obj", "_py4lo_stats")
+
+    def __init__(self, obj: Any, stats: UnoStats):
+        object.__setattr__(self, "_py4lo_obj", obj)
+        object.__setattr__(self, "_py4lo_stats", stats)
+
+    def __getattr__(self, name: str) -> Any:
+        start = time.perf_counter()
+        value = getattr(self._py4lo_obj, name)
+        elapsed = time.perf_counter() - start
+        stats = self._py4lo_stats
+        if callable(value) and not isinstance(value, type):
+            return _method_proxy(value, name + "()", stats)
+
+        stats.record(_get_caller(sys._getframe(1)), name, elapsed)
+        return stats.wrap(value)
+
+    def __setattr__(self, name: str, value: Any):
+        start = time.perf_counter()
+        setattr(self._py4lo_obj, name, _unwrap(value))
+        self._py4lo_stats.record(_get_caller(sys._getframe(1)),
+                                 "set " + name,
+                                 time.perf_counter() - start)
+
+    def __iter__(self) -> Iterator[Any]:
+        stats = self._py4lo_stats
+        for value in self._py4lo_obj:
+            yield stats.wrap(value)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._py4lo_stats.wrap(self._py4lo_obj[key])
+
+    def __eq__(self, other: object) -> bool:
+        return self._py4lo_obj == _unwrap(other)
+
+    def __ne__(self, other: object) -> bool:
+        return self._py4lo_obj != _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._py4lo_obj)
+
+    def __repr__(self) -> str:
+        return f"UnoProxy({self._py4lo_obj!r})"
+
+
+def _method_proxy(method: Any, member: str, stats: UnoStats) -> Any:
+    def proxy(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        ret = method(*_unwrap(args), **kwargs)
+        stats.record(_get_caller(sys._getframe(1)), member,
+                     time.perf_counter() - start)
+        return stats.wrap(ret)
+
+    return proxy
@@ -0,0 +1,223 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+from zipfile import ZIP64_LIMIT, ZIP_DEFLATED, ZipFile, ZipInfo
+
+from compression_policy import Compression
+
+CHUNK_SIZE = 64 * 1024
+# crc, file size, compress size
+_HEADER = struct.Struct("<IQQ")
+# the private attributes of `ZipFile` used by `write_raw_entry`
+_RAW_WRITE_ATTRIBUTES = ("_lock", "_writing", "_writecheck", "_didModify",
+                         "start_dir", "fp", "_seekable")
+
+
+class BlobCache:
+    """
+    A local cache of DEFLATE compressed blobs, keyed by the hash of the content
+    and the compression settings. A cached blob is raw-copied in the archive:
+    the unchanged assets are not compressed again.
+
+    The mtime of a blob is the time of its last use: `evict` removes the
+    blobs that were not used recently.
+    """
+
+    def __init__(self, logger: logging.Logger, cache_dir: Path,
+                 max_size: int | None = None, max_age: float | None = None):
+        """
+        @param logger: the logger
+        @param cache_dir: the cache directory, shared by the builds
+        @param max_size: the max total size of the blobs, in bytes, or None
+        @param max_age: the max age of the unused blobs, in seconds, or None
+        """
+        self._logger = logger
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._max_age = max_age
+
+    def write(self, zout: ZipFile, zinfo: ZipInfo, source: BinaryIO,
+              content_hash: str, compression: Compression) -> bool:
+        """
+        Write a DEFLATE compressed entry, from the cache.
+
+        @param zout: the destination archive, must be seekable
+        @param zinfo: the zip info of the entry
+        @param source: the content, if the blob is not in the cache
+        @param content_hash: the hash of the content
+        @param compression: the compression (ZIP_DEFLATED)
+        @return: False if the entry could not be written
+        """
+        if (compression.compress_type != ZIP_DEFLATED
+                or not can_write_raw(zout)):
+            return False
+
+        blob_path = self._get_blob_path(content_hash, compression)
+        if blob_path.is_file():
+            self._logger.debug("Blob cache hit: %s", zinfo.filename)
+            try:
+                os.utime(blob_path)
+            except OSError:  # e.g. a read-only cache
+                pass
+        else:
+            self._logger.debug("Blob cache miss: %s", zinfo.filename)
+            try:
+                self._create_blob(blob_path, source, compression)
+            except OSError as e:
+                self._logger.warning("Can't create blob for %s: %s",
+                                     zinfo.filename, e)
+                return False
+
+        with blob_path.open('rb') as blob:
+            crc, file_size, compress_size = _HEADER.unpack(
+                blob.read(_HEADER.size))
+            zinfo.compress_type = ZIP_DEFLATED
+            zinfo.CRC = crc
+            zinfo.file_size = file_size
+            zinfo.compress_size = compress_size
+            write_raw_entry(zout, zinfo, blob)
+        return True
+
+    def evict(self):
+        """
+        Remove the blobs unused for more than `max_age` seconds, then the
+        least recently used blobs until the total size is below `max_size`.
+        Do not call this method while the cache is written.
+        """
+        if self._max_size is None and self._max_age is None:
+            return
+
+        blobs = []
+        for blob_path in self._cache_dir.glob("*/*.blob"):
+            try:
+                stat = blob_path.stat()
+            except OSError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, blob_path))
+        blobs.sort()
+
+        now = time.time()
+        total_size = sum(size for _, size, _ in blobs)
+        count = 0
+        for mtime, size, blob_path in blobs:
+            if ((self._max_age is None or now - mtime <= self._max_age)
+                    and (self._max_size is None
+                         or total_size <= self._max_size)):
+                break
+            try:
+                blob_path.unlink()
+            except OSError as e:
+                self._logger.warning("Can't remove blob %s: %s", blob_path, e)
+                continue
+            total_size -= size
+            count += 1
+        if count:
+            self._logger.debug("Blob cache: %s blobs removed", count)
+
+    def _get_blob_path(self, content_hash: str,
+                       compression: Compression) -> Path:
+        level = _get_level(compression)
+        return self._cache_dir.joinpath(
+            content_hash[:2], f"{content_hash}-{level}.blob")
+
+    def _create_blob(self, blob_path: Path, source: BinaryIO,
+                     compression: Compression):
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        compressor = zlib.compressobj(_get_level(compression), zlib.DEFLATED,
+                                      -15)
+        crc = 0
+        file_size = 0
+        compress_size = 0
+        # write to a temp file and rename: the cache is shared by the builds
+        # and by the targets
+        tmp_path = blob_path.with_name(
+            f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            with tmp_path.open('wb') as dest:
+                dest.write(_HEADER.pack(0, 0, 0))
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    crc = zlib.crc32(chunk, crc)
+                    file_size += len(chunk)
+                    data = compressor.compress(chunk)
+                    compress_size += len(data)
+                    dest.write(data)
+                data = compressor.flush()
+                compress_size += len(data)
+                dest.write(data)
+                dest.seek(0)
+                dest.write(_HEADER.pack(crc, file_size, compress_size))
+            os.replace(tmp_path, blob_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+def _get_level(compression: Compression) -> int:
+    if compression.compresslevel is None:
+        return zlib.Z_DEFAULT_COMPRESSION
+    return compression.compresslevel
+
+
+def can_write_raw(zout: ZipFile) -> bool:
+    """
+    @param zout: the destination archive
+    @return: True if `write_raw_entry` can write in this archive: the
+    archive is seekable and the private attributes of `ZipFile` exist in
+    this version of Python.
+    """
+    return (all(hasattr(zout, name) for name in _RAW_WRITE_ATTRIBUTES)
+            and bool(zout._seekable))
+
+
+def write_raw_entry(zout: ZipFile, zinfo: ZipInfo, raw: BinaryIO):
+    """
+    Write an already compressed entry. The `zipfile` module has no public API
+    for this: mimic `ZipFile.open(..., 'w')`.
+
+    @param zout: the destination archive (see `can_write_raw`)
+    @param zinfo: the zip info, with the CRC, the sizes and the compress type
+    @param raw: the compressed data
+    """
+    zip64 = (zinfo.file_size > ZIP64_LIMIT
+             or zinfo.compress_size > ZIP64_LIMIT)
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16  # permissions: ?rw-------
+    with zout._lock:
+        if zout._writing:
+            raise ValueError("Can't write to the ZIP file while there is "
+                             "another write handle open on it.")
+        zout.fp.seek(zout.start_dir)
+        zinfo.header_offset = zout.fp.tell()
+        zout._writecheck(zinfo)
+        zout._didModify = True
+        zout.fp.write(zinfo.FileHeader(zip64))
+        shutil.copyfileobj(raw, zout.fp, CHUNK_SIZE)
+        zout.start_dir = zout.fp.tell()
+        zout.filelist.append(zinfo)
+        zout.NameToInfo[zinfo.filename] = zinfo
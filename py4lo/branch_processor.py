@@ -19,66 +19,77 @@ import logging
 from collections.abc import Callable
 from typing import Any
 
+# the state of an open block
+_TAKEN = 0  # the current branch is read
+_NOT_YET_TAKEN = 1  # skip the current branch, a next branch may be read
+_DONE = 2  # skip the current branch and the next ones
+
 
 class BranchProcessor:
     """
     The branch processor handles directives like 'if', 'elif', 'else', 'end'
     and acts as a preprocessor. Skipped block wont be included in the LO
-    document
+    document.
+
+    The state of each open block is stacked, and the number of skipped
+    blocks is counted: `skip()` is O(1).
     """
     _logger = logging.getLogger(__name__)
 
     def __init__(self, tester: Callable[[list[str]], bool]):
         """The tester will evaluate the arguments of 'if' or 'elif'"""
         self._assertion_is_true = tester
-        self._dont_skips: list[bool] = []
+        self._states: list[int] = []
+        self._skipped_count = 0
 
     def end(self):
         """
         To call before the end, to verify if there are no unclosed if block
         """
-        if self._dont_skips:
+        if self._states:
             self._logger.error("Branch condition not closed!")
             raise ValueError("Branch condition not closed!")
 
     def handle_directive(self, directive: str, args: list[Any]) -> bool:
-        """Return True if the next block should be read, False otherwise"""
-
+        """Return True if the directive is a branch directive"""
         if directive == 'if':
-            self._begin_block_and_skip_if_not(self._assertion_is_true(args))
-        elif directive == 'elif':
-            if self._was_not_skipping():
-                self._start_skipping()
+            if self._skipped_count:  # don't evaluate a nested condition
+                self._push(_DONE)
             elif self._assertion_is_true(args):
-                self._stop_skipping()
+                self._push(_TAKEN)
+            else:
+                self._push(_NOT_YET_TAKEN)
+        elif directive == 'elif':
+            state = self._states[-1]
+            if state == _TAKEN:
+                self._set_state(_DONE)
+            elif state == _NOT_YET_TAKEN and self._assertion_is_true(args):
+                self._set_state(_TAKEN)
             # else : continue to skip
         elif directive == 'else':
-            self._flip_skipping()
+            state = self._states[-1]
+            if state == _TAKEN:
+                self._set_state(_DONE)
+            elif state == _NOT_YET_TAKEN:
+                self._set_state(_TAKEN)
         elif directive == 'endif':
-            self._end_block()
+            if self._states.pop() != _TAKEN:
+                self._skipped_count -= 1
         else:
             return False
 
         return True
 
-    def _was_not_skipping(self) -> bool:
-        return self._dont_skips[-1]
-
-    def _start_skipping(self):
-        self._dont_skips[-1] = False
-
-    def _stop_skipping(self):
-        self._dont_skips[-1] = True
-
-    def _flip_skipping(self):
-        self._dont_skips[-1] = not self._dont_skips[-1]
-
-    def _begin_block_and_skip_if_not(self, b: bool):
-        self._dont_skips.append(b)
+    def _push(self, state: int):
+        self._states.append(state)
+        if state != _TAKEN:
+            self._skipped_count += 1
 
-    def _end_block(self):
-        self._dont_skips.pop()
+    def _set_state(self, state: int):
+        if (self._states[-1] == _TAKEN) != (state == _TAKEN):
+            self._skipped_count += 1 if state != _TAKEN else -1
+        self._states[-1] = state
 
     def skip(self) -> bool:
         """Return True if the current block is skipped"""
-        return False in self._dont_skips
+        return self._skipped_count > 0
@@ -0,0 +1,155 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+The fingerprint of a build: a hash of the inputs (source document, scripts,
+libs, assets), of the configuration and of the py4lo version. It is stored
+in the comment of the dest archive: if the fingerprint of the next build is
+the same, the dest file is not written again.
+"""
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Mapping
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+from zipfile import BadZipFile, ZipFile
+
+from core.source_dest import Sources
+
+CHUNK_SIZE = 64 * 1024
+FINGERPRINT_PREFIX = b"py4lo-fingerprint:"
+_FINGERPRINT_REGEX = re.compile(
+    re.escape(FINGERPRINT_PREFIX) + rb"([0-9a-f]+)\n?")
+
+_py4lo_version = None  # type: str | None
+
+
+class BuildFingerprint:
+    """
+    Compute the fingerprint of a build.
+    """
+
+    def __init__(self, logger: logging.Logger, sources: Sources,
+                 config: Mapping[str, Any],
+                 variables: Mapping[str, Any] | None = None):
+        """
+        @param logger: the logger
+        @param sources: the sources of the build
+        @param config: the configuration (the `py4lo.toml` data)
+        @param variables: the variables of the target
+        """
+        self._logger = logger
+        self._sources = sources
+        self._config = config
+        self._variables = variables or {}
+
+    def compute(self) -> str:
+        """
+        @return: the fingerprint, as a hex string
+        """
+        h = hashlib.sha256()
+        _update(h, "py4lo", get_py4lo_version())
+        _update(h, "config", json.dumps(self._config, sort_keys=True,
+                                        default=str))
+        _update(h, "variables", json.dumps(self._variables, sort_keys=True,
+                                           default=str))
+        source_ods_file = self._sources.source_ods_file
+        if source_ods_file is not None:
+            _update(h, "source", hash_file(source_ods_file))
+        sources = self._sources
+        for label, root, ignore in [
+            ("src", sources.src_dir, sources.src_ignore),
+            ("inc", sources.inc_dir, []),
+            ("lib", sources.lib_dir, sources.src_ignore),
+            ("opt", sources.opt_dir, sources.src_ignore),
+            ("assets", sources.assets_dir, sources.assets_ignore),
+        ]:
+            for record in sources.index.get_records(root, ignore):
+                if "__pycache__" in record.relative_path.split("/"):
+                    continue  # written by the build
+                _update(h, f"{label}/{record.relative_path}",
+                        hash_file(record.path))
+        fingerprint = h.hexdigest()
+        self._logger.debug("Build fingerprint: %s", fingerprint)
+        return fingerprint
+
+
+def _update(h: Any, key: str, value: str):
+    h.update(json.dumps([key, value]).encode("utf-8"))
+    h.update(b"\n")
+
+
+def hash_file(path: Path) -> str:
+    """
+    @param path: the path of the file
+    @return: the sha256 of the content
+    """
+    h = hashlib.sha256()
+    with path.open("rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_py4lo_version() -> str:
+    """
+    @return: the installed version, or a hash of the py4lo modules if py4lo
+    is run from a checkout
+    """
+    global _py4lo_version
+    if _py4lo_version is None:
+        try:
+            _py4lo_version = metadata.version("py4lo")
+        except metadata.PackageNotFoundError:
+            h = hashlib.sha256()
+            py4lo_dir = Path(__file__).parent
+            for path in sorted(py4lo_dir.rglob("*.py")):
+                _update(h, path.relative_to(py4lo_dir).as_posix(),
+                        hash_file(path))
+            _py4lo_version = "dev-" + h.hexdigest()[:16]
+    return _py4lo_version
+
+
+def read_fingerprint(dest_ods_file: Path) -> str | None:
+    """
+    @param dest_ods_file: a file created by py4lo
+    @return: the fingerprint stored in the file, or None
+    """
+    try:
+        with ZipFile(dest_ods_file) as zin:
+            comment = zin.comment
+    except (OSError, BadZipFile):
+        return None
+    match = _FINGERPRINT_REGEX.search(comment)
+    if match is None:
+        return None
+    return match.group(1).decode("ascii")
+
+
+def set_fingerprint(comment: bytes, fingerprint: str) -> bytes:
+    """
+    @param comment: the comment of an archive
+    @param fingerprint: the fingerprint
+    @return: the comment, with the new fingerprint
+    """
+    comment = _FINGERPRINT_REGEX.sub(b"", comment)
+    if comment and not comment.endswith(b"\n"):
+        comment += b"\n"
+    return comment + FINGERPRINT_PREFIX + fingerprint.encode("ascii")
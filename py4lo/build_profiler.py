@@ -0,0 +1,253 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Profile the build phases (`--profile`): wall time and peak RSS of each
+phase, a summary table and a Chrome trace-event file (open it with
+chrome://tracing or https://ui.perfetto.dev).
+
+The phases are declared with `with phase(name, category):`. By default, the
+profiler is a `NullProfiler` and a phase costs nothing.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class Phase:
+    name: str
+    category: str
+    start: float  # in s, since the creation of the profiler
+    duration: float  # in s
+    peak_rss: int | None  # in bytes, the high-water mark at the end
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+def get_peak_rss() -> int | None:
+    """
+    @return: the peak resident set size of the process in bytes, or None if
+    it is not available
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return max_rss  # bytes
+    return max_rss * 1024  # kilobytes
+
+
+class NullProfiler:
+    """The default profiler: does nothing"""
+
+    def phase(self, _name: str, _category: str = "build", **_args: Any
+              ) -> AbstractContextManager[None]:
+        return nullcontext()
+
+
+class BuildProfiler:
+    """
+    Record the phases. If `cprofile_phase` is set, the phases having this
+    name or this category are run under cProfile.
+    """
+
+    def __init__(self, cprofile_phase: str | None = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self._cprofile_phase = cprofile_phase
+        self._clock = clock
+        self._origin = clock()
+        self._lock = threading.Lock()
+        self._cprofile = cast(cProfile.Profile | None, None)
+        self._cprofile_depth = 0
+        self.phases = []  # type: list[Phase]
+
+    @contextmanager
+    def phase(self, name: str, category: str = "build", **args: Any
+              ) -> Iterator[None]:
+        """
+        @param name: the name of the phase
+        @param category: the category of the phase
+        @param args: the args, added to the trace event
+        """
+        profiled = self._cprofile_phase in (name, category)
+        if profiled:
+            self._enable_cprofile()
+        start = self._clock()
+        try:
+            yield
+        finally:
+            end = self._clock()
+            if profiled:
+                self._disable_cprofile()
+            phase = Phase(name, category, start - self._origin, end - start,
+                          get_peak_rss(), threading.get_ident(), args)
+            with self._lock:
+                self.phases.append(phase)
+
+    def _enable_cprofile(self):
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+        if self._cprofile_depth == 0:
+            self._cprofile.enable()
+        self._cprofile_depth += 1
+
+    def _disable_cprofile(self):
+        self._cprofile_depth -= 1
+        if self._cprofile_depth == 0 and self._cprofile is not None:
+            self._cprofile.disable()
+
+    def get_summary(self, limit: int | None = 40) -> str:
+        """
+        @param limit: the max number of rows
+        @return: a table of the phases, aggregated by category and name,
+        the longest first
+        """
+        totals = {}  # type: dict[tuple[str, str], list[Any]]
+        for phase in self.phases:
+            key = (phase.category, phase.name)
+            total = totals.get(key)
+            if total is None:
+                totals[key] = [1, phase.duration, phase.duration,
+                               phase.peak_rss]
+            else:
+                total[0] += 1
+                total[1] += phase.duration
+                total[2] = max(total[2], phase.duration)
+                if phase.peak_rss is not None:
+                    total[3] = max(total[3] or 0, phase.peak_rss)
+
+        rows = sorted(totals.items(), key=lambda kv: -kv[1][1])
+        row_format = "{:<10} {:<40} {:>6} {:>10} {:>10} {:>10}"
+        lines = [row_format.format("category", "phase", "count", "total ms",
+                                   "max ms", "peak MiB")]
+        for (category, name), (count, total, max_duration, peak_rss
+                               ) in rows[:limit]:
+            peak = ("-" if peak_rss is None
+                    else f"{peak_rss / (1024 * 1024):.1f}")
+            lines.append(row_format.format(
+                category, _shorten(name, 40), count, f"{total * 1000:.1f}",
+                f"{max_duration * 1000:.1f}", peak))
+        if limit is not None and len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more phases in the trace")
+        lines.append(
+            f"Total: {(self._clock() - self._origin) * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def get_cprofile_summary(self, limit: int = 20) -> str | None:
+        """
+        @param limit: the max number of functions
+        @return: the cProfile stats, sorted by cumulative time, or None
+        """
+        if self._cprofile is None:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(self._cprofile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return out.getvalue()
+
+    def get_trace_events(self) -> list[dict[str, Any]]:
+        """
+        @return: the Chrome trace events (complete events, and a counter for
+        the peak RSS)
+        """
+        pid = os.getpid()
+        events = []
+        for phase in sorted(self.phases, key=lambda p: p.start):
+            events.append({
+                "name": phase.name, "cat": phase.category, "ph": "X",
+                "ts": phase.start * 1e6, "dur": phase.duration * 1e6,
+                "pid": pid, "tid": phase.thread_id,
+                "args": {k: str(v) for k, v in phase.args.items()},
+            })
+            if phase.peak_rss is not None:
+                events.append({
+                    "name": "peak RSS", "ph": "C",
+                    "ts": (phase.start + phase.duration) * 1e6,
+                    "pid": pid, "tid": phase.thread_id,
+                    "args": {"MiB": phase.peak_rss / (1024 * 1024)},
+                })
+        return events
+
+    def write_trace(self, path: Path):
+        """
+        @param path: the trace-event JSON file
+        """
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.get_trace_events(),
+                       "displayTimeUnit": "ms"}, f)
+
+    def write_cprofile(self, path: Path) -> bool:
+        """
+        @param path: the pstats file
+        @return: True if there was a cProfile phase
+        """
+        if self._cprofile is None:
+            return False
+        self._cprofile.dump_stats(str(path))
+        return True
+
+
+def _shorten(text: str, width: int) -> str:
+    if len(text) <= width:
+        return text
+    return "..." + text[-(width - 3):]
+
+
+_profiler = NullProfiler()  # type: NullProfiler | BuildProfiler
+
+
+def set_profiler(profiler: NullProfiler | BuildProfiler):
+    """
+    @param profiler: the new profiler
+    """
+    global _profiler
+    _profiler = profiler
+
+
+def get_profiler() -> NullProfiler | BuildProfiler:
+    return _profiler
+
+
+def phase(name: str, category: str = "build", **args: Any
+          ) -> AbstractContextManager[None]:
+    """
+    A phase of the current profiler:
+
+        with phase("rewrite manifest", "zip"):
+            ...
+
+    @param name: the name of the phase
+    @param category: the category of the phase
+    @param args: the args, added to the trace event
+    """
+    return _profiler.phase(name, category, **args)
@@ -0,0 +1,118 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import subprocess  # nosec: B404
+from logging import Logger
+from pathlib import Path
+
+from core.script import TempScript
+
+# The name of the dir, in the temp dir, where the scripts are compiled
+BYTECODE_DIR_NAME = "__bytecode__"
+
+# Run by the target interpreter: the bytecode must be produced by the very
+# Python that LibreOffice embeds, since the magic number is version specific.
+# The pyc files use the legacy location (`mod.pyc` next to `mod.py`) because
+# the document is imported through `zipimport`, which ignores `__pycache__`.
+# The pyc files are hash based: the zip entries timestamps are not those of
+# the temp files.
+# The arguments are pairs: the path of the copy to compile, and the path of
+# the temp script, used in the tracebacks.
+_COMPILE_SCRIPT = """\
+import py_compile, sys
+print("%d.%d" % sys.version_info[:2])
+mode = py_compile.PycInvalidationMode.CHECKED_HASH
+args = sys.argv[1:]
+for path, dfile in zip(args[::2], args[1::2]):
+    py_compile.compile(path, cfile=path + "c", dfile=dfile, doraise=True,
+                       invalidation_mode=mode)
+"""
+
+
+class BytecodeCompiler:
+    """
+    Compile the temp scripts with the target python executable. If the
+    target python does not match the python version, or the compilation
+    fails, no bytecode is produced and the document will use the sources.
+
+    The scripts are copied and compiled in a bytecode dir: some temp scripts
+    (e.g. the embedded scripts) are source files, and nothing must be written
+    next to them.
+    """
+
+    def __init__(self, logger: Logger, python_exe: str, python_version: str):
+        self._logger = logger
+        self._python_exe = python_exe
+        self._python_version = python_version
+
+    def compile(self, temp_scripts: list[TempScript], bytecode_dir: Path
+                ) -> list[TempScript]:
+        """
+        @param temp_scripts: the scripts
+        @param bytecode_dir: the dir where the scripts are compiled
+        @return: the bytecode scripts, to add to the temp scripts
+        """
+        py_scripts = [ts for ts in temp_scripts
+                      if ts.script_path.suffix == ".py"]
+        if not py_scripts:
+            return []
+
+        args = [self._python_exe, "-c", _COMPILE_SCRIPT]
+        for ts in py_scripts:
+            path = self._write_copy(ts, bytecode_dir)
+            args += [str(path), str(ts.script_path)]
+        try:
+            ret = subprocess.run(args, capture_output=True,  # nosec: B603
+                                 check=False, text=True)
+        except OSError as e:
+            self._logger.warning("Can't compile bytecode: %s", e)
+            return []
+
+        if ret.returncode != 0:
+            self._logger.warning("Can't compile bytecode: %s", ret.stderr)
+            return []
+
+        version = ret.stdout.strip()
+        if version != self._python_version:
+            self._logger.warning(
+                "Bytecode version %s does not match Python %s: "
+                "use sources only", version, self._python_version)
+            return []
+
+        return [self._to_bytecode_script(ts, bytecode_dir)
+                for ts in py_scripts]
+
+    def _write_copy(self, temp_script: TempScript, bytecode_dir: Path
+                    ) -> Path:
+        """The temp writes may be disabled (or stale), and the temp script may
+        be a source file: the compiler needs its own copy"""
+        path = bytecode_dir.joinpath(temp_script.relative_path)
+        if path.is_file() and path.read_bytes() == temp_script.script_content:
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open('wb') as f:
+            f.write(temp_script.script_content)
+        return path
+
+    def _to_bytecode_script(self, temp_script: TempScript, bytecode_dir: Path
+                            ) -> TempScript:
+        pyc_path = bytecode_dir.joinpath(
+            temp_script.relative_path.with_suffix(".pyc"))
+        self._logger.debug("Bytecode script: %s", pyc_path)
+        with pyc_path.open('rb') as f:
+            content = f.read()
+        return TempScript(pyc_path, content, bytecode_dir, [], None)
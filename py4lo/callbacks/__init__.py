@@ -27,3 +27,4 @@ from callbacks.add_debug_content import AddDebugContent  # noqa
 from callbacks.add_scripts import AddScripts, ARC_SCRIPTS_PATH  # noqa
 from callbacks.ignore_item import IgnoreItem  # noqa
 from callbacks.rewrite_manifest import RewriteManifest  # noqa
+from callbacks.set_fingerprint import SetFingerprint  # noqa
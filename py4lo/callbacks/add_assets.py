@@ -15,24 +15,81 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from zipfile import ZipFile
+import shutil
+from zipfile import ZipFile, ZipInfo
 
+from blob_cache import BlobCache
+from compression_policy import PROBE_SIZE, CompressionPolicy
 from core.asset import DestinationAsset
 
 from callbacks import AfterCallback
 
+CHUNK_SIZE = 64 * 1024
+
 
 class AddAssets(AfterCallback):
     """
     Add assets in destination file
     """
-    def __init__(self, assets: list[DestinationAsset]):
+    def __init__(self, assets: list[DestinationAsset],
+                 compression_policy: CompressionPolicy | None = None,
+                 blob_cache: BlobCache | None = None):
         """
         :param assets: the assets to add
+        :param compression_policy: the policy, None to use the compression
+        of the archive
+        :param blob_cache: the cache of the compressed assets, or None
         """
         self._assets = assets
+        self._compression_policy = compression_policy
+        self._blob_cache = blob_cache
 
     def call(self, zout: ZipFile) -> bool:
         for asset in self._assets:
-            zout.writestr(str(asset.path), asset.content)
+            if self._compression_policy is None:
+                with asset.open() as source:
+                    zout.writestr(str(asset.path), source.read())
+            else:
+                self._stream_asset(zout, asset, self._compression_policy)
         return True
+
+    def _stream_asset(self, zout: ZipFile, asset: DestinationAsset,
+                      compression_policy: CompressionPolicy):
+        arc_name = str(asset.path)
+        # the default date: a raw entry is not written through `ZipFile.open`
+        # (see `zip_updater.FixedDateZipFile`)
+        zinfo = ZipInfo(arc_name)
+        if asset.source_path is None:
+            zinfo.file_size = len(asset.content or b"")
+        else:
+            st = asset.source_path.stat()
+            zinfo.file_size = st.st_size
+            zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+        with asset.open() as source:
+            head = source.read(PROBE_SIZE)
+            compression = compression_policy.get_compression(arc_name, head)
+            if self._blob_cache is not None:
+                source.seek(0)
+                if self._blob_cache.write(zout, zinfo, source,
+                                          asset.get_content_hash(),
+                                          compression):
+                    return
+                source.seek(len(head))
+            zinfo.compress_type = compression.compress_type
+            _set_compress_level(zinfo, compression.compresslevel)
+            with zout.open(zinfo, 'w') as dest:
+                dest.write(head)
+                shutil.copyfileobj(source, dest, CHUNK_SIZE)
+
+
+def _set_compress_level(zinfo: ZipInfo, compresslevel: int | None):
+    """
+    ZipInfo.compress_level is public since Python 3.13.
+
+    :param zinfo: the zip info
+    :param compresslevel: the compress level or None
+    """
+    if hasattr(zinfo, "compress_level"):
+        zinfo.compress_level = compresslevel
+    else:
+        zinfo._compresslevel = compresslevel
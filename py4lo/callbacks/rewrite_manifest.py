@@ -15,102 +15,157 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import xml.dom.minidom
-from pathlib import Path
-from typing import cast
+import io
+import xml.sax
+from collections.abc import Callable, Iterator
+from typing import IO, cast
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
 from zipfile import ZipFile, ZipInfo
 
+from build_profiler import phase
 from core.asset import DestinationAsset
 from core.script import DestinationScript
 
 from callbacks.callback import ItemCallback
 
+MANIFEST_PATH = "META-INF/manifest.xml"
+BINARY_MEDIA_TYPE = "application/binary"
+SCRIPT_MEDIA_TYPE = ""
+ASSET_MEDIA_TYPE = "application/octet-stream"
+# full path, media type
 BASIC_ENTRIES = [
-    ('<manifest:file-entry manifest:full-path="Basic/" '
-     'manifest:media-type="application/binary"/>'),
-    ('<manifest:file-entry manifest:full-path="Basic/Standard/" '
-     'manifest:media-type="application/binary"/>'),
-    ('<manifest:file-entry manifest:full-path="Basic/Standard/py4lo.xml" '
-     ' manifest:media-type="text/xml"/>'),
-    ('<manifest:file-entry  '
-     'manifest:full-path="Basic/Standard/script-lb.xml" '
-     ' manifest:media-type="text/xml"/>'),
-    ('<manifest:file-entry manifest:full-path="Basic/script-lc.xml" '
-     ' manifest:media-type="text/xml"/>'),
+    ("Basic/", BINARY_MEDIA_TYPE),
+    ("Basic/Standard/", BINARY_MEDIA_TYPE),
+    ("Basic/Standard/py4lo.xml", "text/xml"),
+    ("Basic/Standard/script-lb.xml", "text/xml"),
+    ("Basic/script-lc.xml", "text/xml"),
 ]
-
-PYTHON_ENTRY_TPL = ('<manifest:file-entry manifest:full-path="{0}" '
-                    'manifest:media-type=""/>')
-DIR_TPL = ('<manifest:file-entry manifest:full-path="{0}" '
-           'manifest:media-type="application/binary"/>')
-ASSET_ENTRY_TPL = ('<manifest:file-entry manifest:full-path="{0}" '
-                   'manifest:media-type="application/octet-stream"/>')
-MANIFEST_CLOSE_TAG = '</manifest:manifest>'
+INDENT = "\n    "
 
 
 class RewriteManifest(ItemCallback):
+    """
+    Item callback. Add the entries of the scripts, the assets and their
+    directories to the manifest. The manifest is streamed (SAX) from the
+    source to the dest archive: the existing entries are kept as they are,
+    and the new entries that already exist are skipped.
+    """
+
     def __init__(self, scripts: list[DestinationScript],
                  assets: list[DestinationAsset]):
         self._scripts = scripts
         self._assets = assets
 
     def call(self, zin: ZipFile, zout: ZipFile, item: ZipInfo) -> bool:
-        if item.filename == "META-INF/manifest.xml":
-            data = self._rewrite_manifest(zin, item)
-            zout.writestr(item.filename, data)
+        if item.filename == MANIFEST_PATH:
+            with phase("rewrite manifest", "zip"):
+                self._rewrite_manifest(zin, zout, item)
             return True
         else:
             return False
 
-    def _rewrite_manifest(self, zin: ZipFile, manifest_item: ZipInfo):
-        pretty_manifest = RewriteManifest._prettyfy_xml(
-            zin, manifest_item.filename)
-        lines = RewriteManifest._strip_close(pretty_manifest)
-        lines += self._script_lines()
-        return "\n".join(lines).encode("utf-8")
-
-    @staticmethod
-    def _prettyfy_xml(zin: ZipFile, fname: str):
-        data = zin.read(fname)
-        xml_str = xml.dom.minidom.parseString(data.decode("utf-8"))
-        return xml_str.toprettyxml(indent="   ", newl='')
-
-    @staticmethod
-    def _strip_close(pretty_manifest: str):
-        lines = cast(list[str], [])
-        for line in pretty_manifest.splitlines():
-            if line.strip() == MANIFEST_CLOSE_TAG:  # end of manifest
-                return lines
-            lines.append(line)
-
-        raise RuntimeError(f"no manifest closing tag in {pretty_manifest}")
-
-    def _script_lines(self):
-        lines = ["    " + be for be in BASIC_ENTRIES]
-
-        for d in self._get_dirs():
-            posix = d.as_posix()
-            if not posix.endswith("/"):
-                posix += "/"
-            lines.append("    " + DIR_TPL.format(posix))
-        for script in self._scripts:
-            new_line = "    " + PYTHON_ENTRY_TPL.format(
-                script.script_path.as_posix())
-            lines.append(new_line)
-        for asset in self._assets:
-            new_line = "    " + ASSET_ENTRY_TPL.format(asset.path.as_posix())
-            lines.append(new_line)
-
-        lines.append(MANIFEST_CLOSE_TAG)
-        return lines
-
-    def _get_dirs(self) -> list[Path]:
+    def _rewrite_manifest(self, zin: ZipFile, zout: ZipFile,
+                          manifest_item: ZipInfo):
+        with zin.open(manifest_item) as source, io.TextIOWrapper(
+                zout.open(manifest_item.filename, "w"), encoding="utf-8",
+                newline="") as dest:
+            parser = xml.sax.make_parser()
+            parser.setContentHandler(
+                _ManifestRewriter(dest, self._get_entries))
+            parser.parse(source)
+
+    def _get_entries(self) -> Iterator[tuple[str, str]]:
         """
-        @return: the destination directories for scripts and assets
+        @return: the new entries (full path, media type): basic, directories,
+        scripts, then assets
         """
-        dirs = set()
-        for script in self._scripts:
-            dirs.update(list(script.script_path.parents)[:-1])
-        for asset in self._assets:
-            dirs.update(list(asset.path.parents)[:-1])
-        return sorted(dirs)
+        script_paths = [script.script_path.as_posix()
+                        for script in self._scripts]
+        asset_paths = [asset.path.as_posix() for asset in self._assets]
+        yield from BASIC_ENTRIES
+        for d in _get_dirs(script_paths + asset_paths):
+            yield d, BINARY_MEDIA_TYPE
+        for path in script_paths:
+            yield path, SCRIPT_MEDIA_TYPE
+        for path in asset_paths:
+            yield path, ASSET_MEDIA_TYPE
+
+
+def _get_dirs(paths: list[str]) -> list[str]:
+    """
+    @param paths: the posix paths of the files
+    @return: the directories of the files, with a trailing slash, sorted
+    """
+    dirs = cast(set[str], set())
+    for path in paths:
+        d = path.rpartition("/")[0]
+        while d and d not in dirs:  # the parents of d are known
+            dirs.add(d)
+            d = d.rpartition("/")[0]
+    return [d + "/" for d in sorted(dirs, key=lambda d: d.split("/"))]
+
+
+class _ManifestRewriter(XMLGenerator):
+    """
+    Copy the manifest event by event, and write the new entries before the
+    end of the root element.
+    """
+
+    def __init__(self, out: IO[str],
+                 get_entries: Callable[[], Iterator[tuple[str, str]]]):
+        super().__init__(out, "utf-8", short_empty_elements=True)
+        self._get_entries = get_entries
+        self._depth = 0
+        self._prefix = ""
+        self._full_paths = cast(set[str], set())
+        self._pending_whitespace = ""
+
+    def startElement(self, name: str, attrs: AttributesImpl):
+        if self._depth == 0:
+            self._prefix = name[:name.index(":") + 1] if ":" in name else ""
+        elif self._depth == 1:
+            self._flush_whitespace()
+            if name == self._prefix + "file-entry":
+                full_path = attrs.get(self._prefix + "full-path")
+                if full_path is not None:
+                    self._full_paths.add(full_path)
+        self._depth += 1
+        super().startElement(name, attrs)
+
+    def endElement(self, name: str):
+        self._depth -= 1
+        if self._depth == 0:
+            self._pending_whitespace = ""
+            self._write_new_entries()
+            super().ignorableWhitespace("\n")
+        super().endElement(name)
+
+    def characters(self, content: str):
+        if self._depth == 1 and content.isspace():
+            # the whitespace before the end of the root is replaced
+            self._pending_whitespace += content
+        else:
+            self._flush_whitespace()
+            super().characters(content)
+
+    def ignorableWhitespace(self, content: str):
+        self.characters(content)
+
+    def _flush_whitespace(self):
+        if self._pending_whitespace:
+            super().characters(self._pending_whitespace)
+            self._pending_whitespace = ""
+
+    def _write_new_entries(self):
+        file_entry = self._prefix + "file-entry"
+        for full_path, media_type in self._get_entries():
+            if full_path in self._full_paths:
+                continue
+            self._full_paths.add(full_path)
+            super().ignorableWhitespace(INDENT)
+            super().startElement(file_entry, AttributesImpl({
+                self._prefix + "full-path": full_path,
+                self._prefix + "media-type": media_type,
+            }))
+            super().endElement(file_entry)
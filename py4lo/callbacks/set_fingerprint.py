@@ -0,0 +1,36 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from zipfile import ZipFile
+
+from build_fingerprint import set_fingerprint
+
+from callbacks import AfterCallback
+
+
+class SetFingerprint(AfterCallback):
+    """
+    After callback. Store the build fingerprint in the comment of the
+    archive (the comment of the source is kept).
+    """
+
+    def __init__(self, fingerprint: str):
+        self._fingerprint = fingerprint
+
+    def call(self, zout: ZipFile) -> bool:
+        zout.comment = set_fingerprint(zout.comment, self._fingerprint)
+        return True
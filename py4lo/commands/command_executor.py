@@ -18,6 +18,8 @@
 from logging import Logger
 from typing import Any, Optional
 
+from build_profiler import phase
+
 from commands.command import Command
 
 
@@ -35,7 +37,8 @@ class CommandExecutor:
             cur_args = self._previous_executor.execute(*args)
 
         self._logger.warning("%s, args=%s", self._command, cur_args)
-        ret = self._command.execute(*cur_args)
+        with phase(type(self._command).__name__, "command"):
+            ret = self._command.execute(*cur_args)
         self._logger.warning(
             "%s, args=%s, ret=%s", self._command, cur_args, ret)
         return ret
@@ -1,34 +1,78 @@
 import logging
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
 
-from core.asset import DestinationAsset
+from build_profiler import phase
+from bytecode_compiler import BYTECODE_DIR_NAME, BytecodeCompiler
+from core.asset import DestinationAsset, deduplicate_assets
 from core.script import DestinationScript, TempScript
+from core.script_hashes import create_script_hashes
 from core.source_dest import Destinations, Sources
 from directives import DirectiveProvider
+from script_cache import ScriptCache
 from script_set_processor import ScriptSetProcessor
+from temp_writer import SyncTempWriter, TempWriter
 
 
 class OdsUpdaterHelper:
     def __init__(self, logger: logging.Logger, sources: Sources,
                  destinations: Destinations,
-                 python_version: str):
+                 python_version: str,
+                 bytecode_compiler: BytecodeCompiler | None = None,
+                 tree_shaking: bool = False,
+                 minify_dirs: list[Path] | None = None,
+                 temp_writer: TempWriter | None = None,
+                 dedup_assets: bool = False,
+                 variables: Mapping[str, Any] | None = None,
+                 script_cache: ScriptCache | None = None):
         self._logger = logger
         self._sources = sources
         self._destinations = destinations
         self._python_version = python_version
+        self._bytecode_compiler = bytecode_compiler
+        self._tree_shaking = tree_shaking
+        self._minify_dirs = minify_dirs or []
+        if temp_writer is None:
+            temp_writer = SyncTempWriter(logger)
+        self._temp_writer = temp_writer
+        self._dedup_assets = dedup_assets
+        self._variables = variables
+        self._script_cache = script_cache
 
     def get_assets(self) -> list[DestinationAsset]:
-        source_assets = self._sources.get_assets()
-        return self._destinations.to_destination_assets(
-            source_assets)
+        with phase("scan assets", "scan"):
+            source_assets = self._sources.get_assets()
+        assets = self._destinations.to_destination_assets(source_assets)
+        if self._dedup_assets:
+            assets = deduplicate_assets(assets)
+        return assets
 
     def get_destination_scripts(self) -> list[DestinationScript]:
         temp_scripts = self.get_temp_scripts()
-        return self._destinations.to_destination_scripts(temp_scripts)
+        if self._bytecode_compiler is not None:
+            bytecode_dir = self._destinations.temp_dir.joinpath(
+                BYTECODE_DIR_NAME)
+            with phase("compile bytecode", "script"):
+                temp_scripts = temp_scripts + self._bytecode_compiler.compile(
+                    temp_scripts, bytecode_dir)
+        scripts = self._destinations.to_destination_scripts(temp_scripts)
+        scripts.append(create_script_hashes(scripts,
+                                            self._destinations.dest_dir))
+        return scripts
 
     def get_temp_scripts(self) -> list[TempScript]:
-        source_scripts = self._sources.get_src_scripts()
-        directive_provider = DirectiveProvider.create(self._logger,
-                                                      self._sources)
+        with phase("scan sources", "scan"):
+            source_scripts = self._sources.get_src_scripts()
+            directive_provider = DirectiveProvider.create(
+                self._logger, self._sources, self._destinations.temp_dir)
         return ScriptSetProcessor(self._logger, self._destinations.temp_dir,
                                   self._python_version, directive_provider,
-                                  source_scripts).process()
+                                  source_scripts, self._tree_shaking,
+                                  self._minify_dirs,
+                                  self._temp_writer, self._variables,
+                                  self._script_cache).process()
+
+    def wait_temp_writes(self):
+        """Wait for the end of the writes in the temp dir"""
+        self._temp_writer.wait()
@@ -23,6 +23,7 @@ from logging import Logger
 from pathlib import Path
 from typing import Any, cast
 
+from build_profiler import phase
 from core.properties import PropertiesProvider
 from core.source_dest import Sources
 from tools import secure_exe
@@ -68,7 +69,8 @@ class TestCommand(Command):
                                [Path], subprocess.CompletedProcess]) -> int:
         final_status = 0
         for path in paths:
-            completed_process = execute_tests(path)
+            with phase(str(path), "test"):
+                completed_process = execute_tests(path)
             status = completed_process.returncode
             if completed_process.stdout:
                 err = completed_process.stdout.decode('iso-8859-1')
@@ -15,10 +15,14 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
 from typing import Any
 
+from blob_cache import BlobCache
+from build_fingerprint import BuildFingerprint, read_fingerprint
+from build_profiler import phase
 from callbacks import (
     ARC_SCRIPTS_PATH,
     AddAssets,
@@ -26,10 +30,13 @@ from callbacks import (
     AddScripts,
     IgnoreItem,
     RewriteManifest,
+    SetFingerprint,
 )
+from compression_policy import CompressionPolicy
 from core.asset import DestinationAsset
 from core.properties import PropertiesProvider
 from core.script import DestinationScript
+from script_cache import ScriptCache
 from zip_updater import ZipUpdater, ZipUpdaterBuilder
 
 from commands.command import Command
@@ -58,23 +65,90 @@ class UpdateCommand(Command):
         python_version = provider.get("python_version")
         source_ods_file = sources.source_ods_file
         dest_ods_file = destinations.dest_ods_file
+        bytecode_compiler = provider.get_bytecode_compiler()
+        tree_shaking = provider.get("dest", {}).get("tree_shaking", False)
+        minify_dirs = provider.get_minify_dirs()
+        temp_writer = provider.get_temp_writer()
+        dedup_assets = provider.get("dest", {}).get("dedup_assets", False)
+        compression_policy = provider.get_compression_policy()
+        blob_cache = provider.get_blob_cache()
+        targets = provider.get_targets()
+        if targets:
+            # the scripts shared by the targets are processed once
+            script_cache = ScriptCache()
+            update_commands = []
+            for target in targets:
+                helper = OdsUpdaterHelper(
+                    logger, target.sources, target.destinations,
+                    python_version, bytecode_compiler, tree_shaking,
+                    minify_dirs, temp_writer, dedup_assets, target.variables,
+                    script_cache)
+                build_fingerprint = provider.get_build_fingerprint(
+                    target.sources, target.variables)
+                update_commands.append(UpdateCommand(
+                    logger, helper, target.sources.source_ods_file,
+                    target.destinations.dest_ods_file, python_version,
+                    add_readme_callback, compression_policy, blob_cache,
+                    build_fingerprint))
+            return MultiUpdateCommand(logger, update_commands,
+                                      blob_cache=blob_cache)
+
         helper = OdsUpdaterHelper(
-            logger, sources, destinations, python_version)
+            logger, sources, destinations, python_version, bytecode_compiler,
+            tree_shaking, minify_dirs, temp_writer, dedup_assets)
+        build_fingerprint = provider.get_build_fingerprint(sources)
         return UpdateCommand(logger, helper, source_ods_file, dest_ods_file,
-                             python_version, add_readme_callback)
+                             python_version, add_readme_callback,
+                             compression_policy, blob_cache,
+                             build_fingerprint)
 
     def __init__(self, logger: Logger, helper: OdsUpdaterHelper,
                  source_ods_file: Path,
                  dest_ods_file: Path, python_version: str,
-                 add_readme_callback: AddReadmeWith | None):
+                 add_readme_callback: AddReadmeWith | None,
+                 compression_policy: CompressionPolicy | None = None,
+                 blob_cache: BlobCache | None = None,
+                 build_fingerprint: BuildFingerprint | None = None):
         self._logger = logger
         self._helper = helper
         self._source_ods_file = source_ods_file
         self._dest_ods_file = dest_ods_file
         self._python_version = python_version
         self._add_readme_callback = add_readme_callback
+        self._compression_policy = compression_policy
+        self._blob_cache = blob_cache
+        self._build_fingerprint = build_fingerprint
+
+    @property
+    def dest_ods_file(self) -> Path:
+        return self._dest_ods_file
 
     def execute(self, status: int = 0) -> tuple[Any, ...]:
+        zip_updater = self.prepare()
+        if zip_updater is not None:
+            self.write(zip_updater)
+            self.wait_temp_writes()
+            if self._blob_cache is not None:
+                self._blob_cache.evict()
+        return status, self._dest_ods_file
+
+    def prepare(self) -> ZipUpdater | None:
+        """
+        Process the scripts and list the assets.
+
+        @return: the updater that writes the dest file, or None if the dest
+        file is up to date
+        """
+        if self._build_fingerprint is None:
+            fingerprint = None
+        else:
+            with phase("build fingerprint", "scan"):
+                fingerprint = self._build_fingerprint.compute()
+            if read_fingerprint(self._dest_ods_file) == fingerprint:
+                self._logger.info("Update. '%s' is up to date",
+                                  self._dest_ods_file)
+                return None
+
         self._logger.info(
             "Update. Generating '%s' (source: %s) for Python '%s'",
             self._dest_ods_file,
@@ -82,24 +156,84 @@ class UpdateCommand(Command):
             self._python_version)
         scripts = self._helper.get_destination_scripts()
         assets = self._helper.get_assets()
-        zip_updater = self._create_updater(scripts, assets)
+        return self._create_updater(scripts, assets, fingerprint)
+
+    def write(self, zip_updater: ZipUpdater):
+        """
+        @param zip_updater: the updater returned by `prepare`
+        """
         zip_updater.update(self._source_ods_file,
                            self._dest_ods_file)
-        return status, self._dest_ods_file
+
+    def wait_temp_writes(self):
+        """
+        Wait for the end of the writes in the temp dir. The temp writer may
+        be shared by the targets: do not call this method during the writes.
+        """
+        self._helper.wait_temp_writes()
 
     def _create_updater(self, scripts: list[DestinationScript],
-                        assets: list[DestinationAsset]) -> ZipUpdater:
+                        assets: list[DestinationAsset],
+                        fingerprint: str | None = None) -> ZipUpdater:
         zip_updater_builder = ZipUpdaterBuilder(self._logger)
         (
             zip_updater_builder.item(IgnoreItem(ARC_SCRIPTS_PATH))
             .item(RewriteManifest(scripts, assets))
             .after(AddScripts(self._logger, scripts))
-            .after(AddAssets(assets))
+            .after(AddAssets(assets, self._compression_policy,
+                             self._blob_cache))
         )
         if self._add_readme_callback is not None:
             zip_updater_builder.after(self._add_readme_callback)
+        if fingerprint is not None:
+            zip_updater_builder.after(SetFingerprint(fingerprint))
 
         return zip_updater_builder.build()
 
     def get_help(self) -> str:
         return "Update the file with all scripts"
+
+
+class MultiUpdateCommand(Command):
+    """
+    Update the files of the `[[targets]]`: the scripts are processed target
+    by target (the shared scripts are cached), then the files are written
+    concurrently.
+    """
+
+    def __init__(self, logger: Logger, update_commands: list[UpdateCommand],
+                 max_workers: int | None = None,
+                 blob_cache: BlobCache | None = None):
+        """
+        @param logger: the logger
+        @param update_commands: the commands of the targets
+        @param max_workers: the max number of concurrent writes
+        @param blob_cache: the cache shared by the targets, or None
+        """
+        self._logger = logger
+        self._update_commands = update_commands
+        self._max_workers = max_workers
+        self._blob_cache = blob_cache
+
+    def execute(self, status: int = 0) -> tuple[Any, ...]:
+        zip_updaters = [update_command.prepare()
+                        for update_command in self._update_commands]
+        with ThreadPoolExecutor(self._max_workers) as executor:
+            futures = [executor.submit(update_command.write, zip_updater)
+                       for update_command, zip_updater
+                       in zip(self._update_commands, zip_updaters)
+                       if zip_updater is not None]
+            for future in futures:
+                future.result()
+        for update_command in self._update_commands:
+            update_command.wait_temp_writes()
+        if self._blob_cache is not None and any(zip_updaters):
+            # not during the writes: the targets share the cache
+            self._blob_cache.evict()
+        self._logger.info("Update. %s targets generated",
+                          len(self._update_commands))
+        # the run command opens the first target
+        return status, self._update_commands[0].dest_ods_file
+
+    def get_help(self) -> str:
+        return "Update the files of all targets"
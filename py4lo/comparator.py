@@ -67,7 +67,7 @@ class Comparator:
         # substitution
         if expr[0] == '$':
             name = expr[1:]
-            if name.isalnum():
+            if name.isidentifier():
                 expr = eval(name, {"__builtin__": None},
                             self._accepted_locals)  # nosec: B307
             else:
@@ -0,0 +1,123 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import math
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+from zipfile import ZIP_DEFLATED, ZIP_STORED
+
+PROBE_SIZE = 1024
+
+
+@dataclass(frozen=True, eq=True)
+class Compression:
+    """A zip entry compression: ZIP_STORED or ZIP_DEFLATED and the level"""
+    compress_type: int
+    compresslevel: int | None = None
+
+
+STORED = Compression(ZIP_STORED)
+
+
+@dataclass(frozen=True, eq=True)
+class CompressionRule:
+    """A glob pattern (matched case-insensitively, from the right, like
+    `PurePath.match`) and the compression of the matching entries"""
+    pattern: str
+    compression: Compression
+
+    def matches(self, arc_name: str) -> bool:
+        return PurePosixPath(arc_name.lower()).match(self.pattern.lower())
+
+
+class CompressionPolicy:
+    """
+    Choose the compression of the assets. Compressing again an already
+    compressed file (PNG, JPEG, zip, ...) costs CPU time for nothing.
+    """
+
+    def __init__(self, rules: list[CompressionRule], level: int | None = None,
+                 entropy_threshold: float = 7.5):
+        """
+        @param rules: the rules, the last matching rule wins
+        @param level: the default DEFLATE level
+        @param entropy_threshold: if no rule matches and the first KB of the
+        file has a Shannon entropy above this threshold (in bits per byte),
+        the file is stored.
+        """
+        self._rules = rules
+        self._default = Compression(ZIP_DEFLATED, level)
+        self._entropy_threshold = entropy_threshold
+
+    def get_compression(self, arc_name: str, head: bytes) -> Compression:
+        """
+        @param arc_name: the name of the entry in the archive
+        @param head: the first bytes of the file (see PROBE_SIZE)
+        @return: the compression of the entry
+        """
+        for rule in reversed(self._rules):
+            if rule.matches(arc_name):
+                return rule.compression
+
+        if head and entropy(head) > self._entropy_threshold:
+            return STORED
+        return self._default
+
+
+def entropy(bs: bytes) -> float:
+    """
+    @param bs: some bytes
+    @return: the Shannon entropy, in bits per byte
+    """
+    n = len(bs)
+    return -sum(c / n * math.log2(c / n) for c in Counter(bs).values())
+
+
+def create_compression_policy(logger: logging.Logger,
+                              config: Mapping[str, Any]) -> CompressionPolicy:
+    """
+    @param logger: the logger
+    @param config: the `[dest.compression]` table
+    @return: the policy
+    """
+    level = config.get("level")
+    rules = []
+    for pattern, value in config.get("rules", {}).items():
+        compression = _to_compression(value, level)
+        if compression is None:
+            logger.warning("Unknown compression `%s` for `%s`: ignored",
+                           value, pattern)
+        else:
+            rules.append(CompressionRule(pattern, compression))
+    return CompressionPolicy(rules, level,
+                             config.get("entropy_threshold", 7.5))
+
+
+def _to_compression(value: Any, level: int | None) -> Compression | None:
+    if value == "stored":
+        return STORED
+    elif value == "deflated":
+        return Compression(ZIP_DEFLATED, level)
+    elif isinstance(value, int) and not isinstance(value, bool) and (
+            0 <= value <= 9):
+        return Compression(ZIP_DEFLATED, value)
+    else:
+        return None
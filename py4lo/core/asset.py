@@ -15,15 +15,42 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
-
-from dataclasses import dataclass
+import hashlib
+import io
+import json
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import BinaryIO, cast
+
+# the index of the duplicate assets. See `Commons.get_asset`
+ASSETS_INDEX_NAME = "py4lo_assets.json"
 
 
 @dataclass
 class DestinationAsset:
+    """An asset has either a content or a source path: the files are not
+    read until they are copied to the archive."""
     path: Path
-    content: bytes
+    content: bytes | None = None
+    source_path: Path | None = None
+    content_hash: str | None = field(default=None, compare=False)
+
+    def open(self) -> BinaryIO:
+        if self.content is None and self.source_path is not None:
+            return self.source_path.open('rb')
+        return io.BytesIO(self.content or b"")
+
+    def get_content_hash(self) -> str:
+        """
+        @return: the sha256 of the content (computed once)
+        """
+        if self.content_hash is None:
+            h = hashlib.sha256()
+            with self.open() as source:
+                for chunk in iter(lambda: source.read(64 * 1024), b""):
+                    h.update(chunk)
+            self.content_hash = h.hexdigest()
+        return self.content_hash
 
 
 @dataclass
@@ -34,5 +61,32 @@ class SourceAsset:
     def to_dest(self, assets_dest_dir) -> DestinationAsset:
         dest_path = assets_dest_dir.joinpath(
             self.path.relative_to(self.assets_dir))
-        with self.path.open('rb') as source:
-            return DestinationAsset(dest_path, source.read())
+        return DestinationAsset(dest_path, source_path=self.path)
+
+
+def deduplicate_assets(assets: list[DestinationAsset]
+                       ) -> list[DestinationAsset]:
+    """
+    Store the identical assets once. The other paths are mapped to the
+    stored asset in the index file `ASSETS_INDEX_NAME`.
+
+    @param assets: the assets
+    @return: the unique assets, and the index if there are duplicates
+    """
+    stored_by_hash = cast(dict[str, DestinationAsset], {})
+    unique_assets = []
+    aliases = {}
+    for asset in assets:
+        content_hash = asset.get_content_hash()
+        stored = stored_by_hash.get(content_hash)
+        if stored is None:
+            stored_by_hash[content_hash] = asset
+            unique_assets.append(asset)
+        else:
+            aliases[asset.path.as_posix()] = stored.path.as_posix()
+
+    if aliases:
+        index_content = json.dumps(aliases, indent=0).encode("utf-8")
+        unique_assets.append(
+            DestinationAsset(Path(ASSETS_INDEX_NAME), index_content))
+    return unique_assets
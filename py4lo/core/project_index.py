@@ -0,0 +1,189 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+
+@dataclass(eq=True, frozen=True)
+class FileRecord:
+    """A file of the project"""
+    path: Path
+    relative_path: str  # posix, relative to the root
+    size: int
+    mtime_ns: int
+
+
+class GlobMatcher:
+    """
+    Match relative posix paths against a list of glob patterns, with the
+    `Path.rglob` semantics: "*.py" matches "a.py" and "dir/a.py",
+    "dir/*.py" matches "dir/a.py" and "x/dir/a.py". `*` does not cross a
+    `/`, `**` does.
+
+    All the patterns are compiled in one regex.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self._patterns = list(patterns)
+        if self._patterns:
+            alternatives = "|".join(_translate(p) for p in self._patterns)
+            self._regex = re.compile(f"^(?:.*/)?(?:{alternatives})$",
+                                     re.DOTALL)
+        else:
+            self._regex = None
+
+    def matches(self, relative_path: str) -> bool:
+        """
+        @param relative_path: a posix path
+        @return: True if the path matches one of the patterns
+        """
+        return self._regex is not None and bool(
+            self._regex.match(relative_path))
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob pattern to a regex (without anchors)"""
+    pattern = pattern.strip("/")
+    i = 0
+    n = len(pattern)
+    regex = []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        elif pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        elif c == "*":
+            regex.append("[^/]*")
+        elif c == "?":
+            regex.append("[^/]")
+        elif c == "[":
+            start = i + 2 if pattern.startswith("[!", i) else i + 1
+            j = pattern.find("]", start)
+            if j == -1:
+                regex.append(re.escape(c))
+            else:
+                content = pattern[i + 1:j]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex.append("[" + content.replace("\\", "\\\\") + "]")
+                i = j
+        else:
+            regex.append(re.escape(c))
+        i += 1
+    return "".join(regex)
+
+
+class ProjectIndex:
+    """
+    An index of the files of the project. Each root is scanned once, with
+    `os.scandir`; the ignored directories are not explored (an ignore
+    pattern that matches a directory ignores all its content).
+
+    The consumers (`Sources`, `EmbedLib`, ...) query the index instead of
+    scanning the trees again.
+    """
+
+    def __init__(self):
+        self._records_by_key = cast(
+            dict[tuple[Path, tuple[str, ...]], list[FileRecord]], {})
+
+    def get_records(self, root: Path, ignore: Sequence[str] = ()
+                    ) -> list[FileRecord]:
+        """
+        @param root: the root dir
+        @param ignore: the ignore patterns
+        @return: the records of the files, sorted by relative path
+        """
+        key = (root, tuple(ignore))
+        records = self._records_by_key.get(key)
+        if records is None:
+            records = self._scan(root, GlobMatcher(ignore))
+            self._records_by_key[key] = records
+        return records
+
+    def get_paths(self, root: Path, ignore: Sequence[str] = (),
+                  glob: str = "*") -> set[Path]:
+        """
+        @param root: the root dir
+        @param ignore: the ignore patterns
+        @param glob: the pattern of the files to return
+        @return: the paths of the files
+        """
+        matcher = GlobMatcher([glob])
+        return {r.path for r in self.get_records(root, ignore)
+                if matcher.matches(r.relative_path)}
+
+    def get_module_names(self, root: Path, ignore: Sequence[str] = (),
+                         glob: str = "*") -> set[str]:
+        """
+        @param root: the root dir
+        @param ignore: the ignore patterns
+        @param glob: the pattern of the files
+        @return: the names of the modules
+        """
+        matcher = GlobMatcher([glob])
+        module_names = set()
+        for record in self.get_records(root, ignore):
+            if not matcher.matches(record.relative_path):
+                continue
+            parts = record.relative_path.split("/")
+            if parts[0] == "__pycache__":
+                continue
+            parts[-1] = parts[-1].rsplit(".", 1)[0]
+            if parts[-1] in ("__main__", "__init__"):
+                parts = parts[:-1]
+            module_names.add(".".join(parts))
+        return module_names
+
+    def invalidate(self):
+        """Forget all the scans"""
+        self._records_by_key.clear()
+
+    def _scan(self, root: Path, ignore_matcher: GlobMatcher
+              ) -> list[FileRecord]:
+        records = []
+        stack = [(str(root), "")]
+        while stack:
+            dir_path, relative_dir = stack.pop()
+            try:
+                it = os.scandir(dir_path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with it:
+                for entry in it:
+                    relative_path = relative_dir + entry.name
+                    if ignore_matcher.matches(relative_path):
+                        continue
+                    if entry.is_dir():
+                        stack.append((entry.path, relative_path + "/"))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        records.append(FileRecord(
+                            Path(entry.path), relative_path, stat.st_size,
+                            stat.st_mtime_ns))
+        records.sort(key=lambda r: r.relative_path)
+        return records
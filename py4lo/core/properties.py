@@ -22,10 +22,17 @@ from collections.abc import Set as AbstractSet
 from pathlib import Path
 from typing import Any
 
+from blob_cache import BlobCache
+from build_fingerprint import BuildFingerprint
+from bytecode_compiler import BytecodeCompiler
 from callbacks import AddReadmeWith
+from compression_policy import CompressionPolicy, create_compression_policy
+from temp_writer import TempWriter, create_temp_writer
 from toml_helper import load_toml
+from tools import secure_exe
 
 from core.source_dest import Destinations, Sources
+from core.target import Target, create_target
 
 
 class PropertiesProvider:
@@ -55,6 +62,14 @@ class PropertiesProvider:
     def get_destinations(self) -> Destinations:
         return self._destinations
 
+    def get_targets(self) -> list[Target]:
+        """
+        @return: the `[[targets]]` of the project, an empty list if the
+        project has a single target
+        """
+        return [create_target(self._sources, self._destinations, i, config)
+                for i, config in enumerate(self.get("targets", []))]
+
     def get_src_paths(self) -> set[Path]:
         return self._sources.get_src_paths()
 
@@ -72,6 +87,58 @@ class PropertiesProvider:
             add_readme_callback = None
         return add_readme_callback
 
+    def get_temp_writer(self) -> TempWriter:
+        dest = self.get("dest", {})
+        return create_temp_writer(self._logger,
+                                  dest.get("temp_writes", "sync"))
+
+    def get_compression_policy(self) -> CompressionPolicy:
+        dest = self.get("dest", {})
+        return create_compression_policy(self._logger,
+                                         dest.get("compression", {}))
+
+    def get_blob_cache(self) -> BlobCache | None:
+        dest = self.get("dest", {})
+        cache_dir = dest.get("assets_cache_dir", "")
+        if not cache_dir:
+            return None
+        max_mb = dest.get("assets_cache_max_mb")
+        max_days = dest.get("assets_cache_max_days")
+        return BlobCache(
+            self._logger, Path(cache_dir),
+            None if max_mb is None else int(max_mb * 1024 * 1024),
+            None if max_days is None else max_days * 24 * 60 * 60)
+
+    def get_build_fingerprint(
+            self, sources: Sources,
+            variables: Mapping[str, Any] | None = None
+    ) -> BuildFingerprint | None:
+        """
+        @param sources: the sources of the build (or of the target)
+        @param variables: the variables of the target
+        @return: the fingerprint, None if the dest file is always written
+        """
+        if not self.get("dest", {}).get("skip_unchanged", False):
+            return None
+        return BuildFingerprint(self._logger, sources, self._tdata, variables)
+
+    def get_minify_dirs(self) -> list[Path]:
+        src = self.get("src", {})
+        return [Path(d) for d in src.get("minify_dirs", [])]
+
+    def get_bytecode_compiler(self) -> BytecodeCompiler | None:
+        dest = self.get("dest", {})
+        if not dest.get("compile_bytecode", False):
+            return None
+
+        python_exe = secure_exe(str(self.get("python_exe")), "python")
+        if python_exe is None:
+            self._logger.warning("Can't find python exe: no bytecode")
+            return None
+
+        return BytecodeCompiler(self._logger, python_exe,
+                                self.get("python_version"))
+
 
 class PropertiesProviderFactory:
     def create(self, toml_filename="py4lo.toml") -> PropertiesProvider:
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -17,6 +17,10 @@ class SourceScript:
 class ParsedScriptContent:
     text: str
     exported_func_names: list[str]
+    # for each line of the text, the line in the source file (0 if the
+    # line was added by py4lo)
+    source_line_numbers: list[int] = field(default_factory=list,
+                                           compare=False)
 
 
 @dataclass(eq=True, frozen=True)
@@ -50,6 +54,9 @@ class TempScript:
     temp_dir: Path
     exported_func_names: list[str]
     exception: Exception | None
+    # if the script was minified, for each line of the content, the line in
+    # the source file
+    line_map: list[int] | None = field(default=None, compare=False)
 
     @property
     def relative_path(self):
@@ -0,0 +1,55 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import json
+from pathlib import Path
+
+from core.script import DestinationScript
+
+# the name of the hashes file in the scripts dir of the archive
+SCRIPT_HASHES_NAME = "py4lo_hashes.json"
+
+
+def get_module_name(script: DestinationScript) -> str:
+    """
+    @param script: the script
+    @return: the name of the module, as in `sys.modules`
+    """
+    return script.dest_name.removesuffix(".__init__")
+
+
+def create_script_hashes(scripts: list[DestinationScript],
+                         dest_dir: Path) -> DestinationScript:
+    """
+    Create the hashes file: a mapping module name -> hash of the content.
+    The entry point uses it to reload the modules only if one of them was
+    modified.
+
+    @param scripts: the scripts of the document
+    @param dest_dir: the scripts dir in the archive
+    @return: a new script, to add to the archive
+    """
+    hashes = {
+        get_module_name(script):
+            hashlib.sha256(script.script_content).hexdigest()[:16]
+        for script in scripts
+        if script.script_path.suffix == ".py"
+    }
+    content = json.dumps(hashes, sort_keys=True).encode("utf-8")
+    return DestinationScript(dest_dir.joinpath(SCRIPT_HASHES_NAME), content,
+                             dest_dir, [], None)
@@ -15,11 +15,11 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from core.asset import DestinationAsset, SourceAsset
+from core.project_index import ProjectIndex
 from core.script import DestinationScript, SourceScript, TempScript
 
 
@@ -34,25 +34,32 @@ class Sources:
     assets_dir: Path
     assets_ignore: list[str]
     test_dir: Path
+    index: ProjectIndex = field(default_factory=ProjectIndex, compare=False,
+                                repr=False)
 
     def get_src_paths(self) -> set[Path]:
-        return _get_paths(self.src_dir, self.src_ignore, "*.py")
+        return self.index.get_paths(self.src_dir, self.src_ignore, "*.py")
 
     def get_module_names(self) -> set[str]:
-        return _get_module_names(self.src_dir, self.src_ignore, "*.py")
+        return self.index.get_module_names(self.src_dir, self.src_ignore,
+                                           "*.py")
 
     def get_all_module_names(self) -> set[str]:
-        return {*_get_module_names(self.src_dir, self.src_ignore, "*.py"),
-                *_get_module_names(self.lib_dir, self.src_ignore),
-                *_get_module_names(self.opt_dir, self.src_ignore)}
+        return {*self.get_module_names(),
+                *self.index.get_module_names(self.lib_dir, self.src_ignore),
+                *self.index.get_module_names(self.opt_dir, self.src_ignore)}
+
+    def get_assets_paths(self) -> set[Path]:
+        return self.index.get_paths(self.assets_dir, self.assets_ignore)
 
     def get_assets(self) -> list[SourceAsset]:
         return [SourceAsset(p, self.assets_dir) for p in
-                _get_paths(self.assets_dir, self.assets_ignore)]
+                sorted(self.get_assets_paths())]
 
     def get_src_scripts(self) -> list[SourceScript]:
         script_paths = self.get_src_paths()
-        return [SourceScript(sp, self.src_dir, True) for sp in script_paths]
+        return [SourceScript(sp, self.src_dir, True)
+                for sp in sorted(script_paths)]
 
 
 @dataclass
@@ -70,25 +77,3 @@ class Destinations:
     def to_destination_assets(self, source_assets) -> list[DestinationAsset]:
         return [sa.to_dest(self.assets_dest_dir) for sa in source_assets]
 
-
-def _get_paths(source_dir: Path, ignore: list[str], glob="*") -> set[Path]:
-    paths = set(source_dir.rglob(glob))
-    for pattern in ignore:
-        paths -= set(source_dir.rglob(pattern))
-    return {p for p in paths if p.is_file()}
-
-
-def _get_module_names(source_dir: Path, ignore: list[str], glob="*"
-                      ) -> set[str]:
-    paths = _get_paths(source_dir, ignore, glob)
-    module_names = set()
-    for p in paths:
-        p = p.relative_to(source_dir).with_suffix("")
-        if p.parts[0] == "__pycache__":
-            continue
-
-        if p.name in ("__main__", "__init__"):
-            p = p.parent
-
-        module_names.add(str(p).replace(os.path.sep, "."))
-    return module_names
@@ -0,0 +1,69 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import dataclasses
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.source_dest import Destinations, Sources
+
+
+@dataclass(frozen=True)
+class Target:
+    """A target of a multi-target build: a `[[targets]]` table"""
+    name: str
+    sources: Sources
+    destinations: Destinations
+    # the variables of the branches (`# py4lo: if $edition == pro`)
+    variables: dict[str, Any]
+
+
+def create_target(sources: Sources, destinations: Destinations,
+                  index: int, config: Mapping[str, Any]) -> Target:
+    """
+    @param sources: the sources of the project
+    @param destinations: the destinations of the project
+    @param index: the index of the target
+    @param config: the `[[targets]]` table
+    @return: the target
+    """
+    name = str(config.get("name", f"target{index}"))
+    if "source_ods_file" in config:
+        source_ods_file = Path(config["source_ods_file"])
+    else:
+        source_ods_file = sources.source_ods_file
+    if "src_dir" in config:
+        src_dir = Path(config["src_dir"])
+    else:
+        src_dir = sources.src_dir
+
+    if "dest_ods_file" in config:
+        dest_ods_file = Path(config["dest_ods_file"])
+    else:
+        dest_ods_file = destinations.dest_ods_file.with_stem(
+            f"{destinations.dest_ods_file.stem}-{name}")
+
+    # the index is shared: the directories are scanned once
+    target_sources = dataclasses.replace(
+        sources, source_ods_file=source_ods_file, src_dir=src_dir)
+    target_destinations = dataclasses.replace(
+        destinations, dest_ods_file=dest_ods_file,
+        temp_dir=destinations.temp_dir.joinpath(name))
+    return Target(name, target_sources, target_destinations,
+                  dict(config.get("variables", {})))
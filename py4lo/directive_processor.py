@@ -17,6 +17,7 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import re
 import shlex
+from collections.abc import Mapping
 from typing import Any, cast
 
 from branch_processor import BranchProcessor
@@ -25,6 +26,7 @@ from core.script import SourceScript, TempScript
 from directives import DirectiveProvider
 
 PY4LO_REGEX = re.compile(r"^#\s*py4lo\s*:(.*)$")
+_QUOTES_AND_ESCAPES = frozenset("\"'\\")
 
 
 class DirectiveProcessor:
@@ -36,20 +38,19 @@ class DirectiveProcessor:
     def create(
             scripts_processor: Any,  # "ScriptSetProcessor",
             directive_provider: DirectiveProvider, python_version: str,
-            source_script: SourceScript):
-        comparator = Comparator({'python_version': python_version})
-
-        def local_is_true(args: list[str]):
-            return comparator.check(args[0], args[1], args[2])
-
-        branch_processor = BranchProcessor(local_is_true)
+            source_script: SourceScript,
+            variables: Mapping[str, Any] | None = None):
+        tester = BranchTester({**(variables or {}),
+                               'python_version': python_version})
+        branch_processor = BranchProcessor(tester)
 
         return DirectiveProcessor(scripts_processor, branch_processor,
-                                  directive_provider)
+                                  directive_provider, tester)
 
     def __init__(self, script_set_processor: Any,  # "ScriptSetProcessor",
                  branch_processor: BranchProcessor,
-                 directive_provider: DirectiveProvider):
+                 directive_provider: DirectiveProvider,
+                 tester: "BranchTester | None" = None):
         """
         Create a Directive processor. Scripts_path is the path to the scripts
         directory
@@ -57,8 +58,17 @@ class DirectiveProcessor:
         self._script_set_processor = script_set_processor
         self._branch_processor = branch_processor
         self._directive_provider = directive_provider
+        self._tester = tester
         self._includes = cast(set[str], set())
 
+    def get_used_variables(self) -> dict[str, Any]:
+        """
+        @return: the variables used by the branch conditions, and their values
+        """
+        if self._tester is None:
+            return {}
+        return self._tester.get_used_variables()
+
     def append_script(self, source_script: SourceScript):
         """Append a script to the script processor"""
         self._script_set_processor.append_script(source_script)
@@ -67,11 +77,55 @@ class DirectiveProcessor:
         """Add an opt script"""
         self._script_set_processor.add_script(temp_script)
 
-    def process_line(self, line: str) -> list[str]:
-        """Process a line that starts with #"""
-        return DirectiveLineProcessor(self, self._branch_processor,
-                                      self._directive_provider,
-                                      line).process_line()
+    def process_line(self, line: str, output: "ScriptOutput"):
+        """Process a line that starts with #. Comments are copied,
+        directives are executed and may write to the output"""
+        args = self._get_directive_args(line)
+        if args is None:  # that's maybe a simple comment
+            self._comment_or_write(line, output)
+        else:
+            self._process_directive(line, args, output)
+
+    @staticmethod
+    def _get_directive_args(line: str) -> list[str] | None:
+        if "py4lo" not in line:  # cheap prefilter
+            return None
+        m = PY4LO_REGEX.match(line)
+        if m is None:
+            return None
+        directive = m.group(1)
+        if not _QUOTES_AND_ESCAPES.intersection(directive):
+            return directive.split()  # same as shlex, faster
+        try:
+            return shlex.split(directive)
+        except ValueError:
+            return None
+
+    def _process_directive(self, line: str, args: list[str],
+                           output: "ScriptOutput"):
+        if not args:
+            self._comment_or_write(line, output)
+            return
+
+        is_branch_directive = self._branch_processor.handle_directive(
+            args[0], args[1:])
+        if is_branch_directive:
+            return
+
+        if self._branch_processor.skip():
+            output.append("### " + line)
+        else:
+            try:
+                directive, args = self._directive_provider.get(args)
+                directive.execute(self, output, args)
+            except KeyError:
+                print(f"Wrong directive ({line.strip()})")
+
+    def _comment_or_write(self, line: str, output: "ScriptOutput"):
+        if self._branch_processor.skip():
+            output.append("### " + line)
+        else:
+            output.append(line)
 
     def end(self):
         """Verify the end of the scripts"""
@@ -81,63 +135,60 @@ class DirectiveProcessor:
         return self._branch_processor.skip()
 
 
-class DirectiveLineProcessor:
-    """A worker that processes the line"""
+class BranchTester:
+    """
+    Evaluate the conditions of the branches (`$var op value`), and record
+    the variables used: a script that does not use a variable is the same
+    for every value of the variable.
+    """
 
-    def __init__(self, directive_processor: DirectiveProcessor,
-                 branch_processor: BranchProcessor,
-                 directive_provider: DirectiveProvider, line: str):
-        self._directive_processor = directive_processor
-        self._branch_processor = branch_processor
-        self._directive_provider = directive_provider
-        self._line = line
-        self._target_lines = []
+    def __init__(self, variables: Mapping[str, Any]):
+        self._variables = variables
+        self._comparator = Comparator(dict(variables))
+        self._used_names = cast(set[str], set())
 
-    def process_line(self) -> list[str]:
-        """Return a list of lines"""
-        if self._target_lines:
-            return self._target_lines
+    def __call__(self, args: list[str]) -> bool:
+        for arg in (args[0], args[2]):
+            if isinstance(arg, str) and arg.startswith("$"):
+                self._used_names.add(arg[1:])
+        return self._comparator.check(args[0], args[1], args[2])
 
-        try:
-            directive = self._get_directive()
-            if directive is None:  # that's maybe a simple comment
-                self._comment_or_write()
-            else:
-                self._process_directive(self._line, directive)
-        except ValueError:
-            self._comment_or_write()
+    def get_used_variables(self) -> dict[str, Any]:
+        return {name: self._variables.get(name)
+                for name in self._used_names}
 
-        return self._target_lines
 
-    def _get_directive(self) -> list[str] | None:
-        m = PY4LO_REGEX.match(self._line)
-        if m:
-            directive = m.group(1)
-            return shlex.split(directive)
-        else:
-            return None
+class ScriptOutput:
+    """
+    The output of a script: a single buffer of lines, and the source line
+    number of each line (0 if the line was added by py4lo).
+    """
 
-    def _process_directive(self, line: str, args: list[str]):
-        is_branch_directive = self._branch_processor.handle_directive(args[0],
-                                                                      args[1:])
-        if is_branch_directive:
-            return
+    def __init__(self):
+        self.lines = cast(list[str], [])
+        self.line_numbers = cast(list[int], [])
+        self.source_line_number = 0
 
-        if self._branch_processor.skip():
-            self.append("### " + line)
-        else:
-            try:
-                directive, args = self._directive_provider.get(args)
-                directive.execute(self._directive_processor, self, args)
-            except KeyError:
-                print(f"Wrong directive ({line.strip()})")
+    def write_line(self, line: str, line_number: int):
+        """
+        @param line: a line without new line char
+        @param line_number: the source line number
+        """
+        self.lines.append(line)
+        self.line_numbers.append(line_number)
 
-    def _comment_or_write(self):
-        if self._branch_processor.skip():
-            self.append("### " + self._line)
+    def append(self, text: str):
+        """
+        Called by directives.
+
+        @param text: one or more lines
+        """
+        self.lines.append(text)
+        line_count = text.count("\n") + 1
+        if line_count == 1:
+            self.line_numbers.append(self.source_line_number)
         else:
-            self.append(self._line)
+            self.line_numbers.extend([self.source_line_number] * line_count)
 
-    def append(self, line: str):
-        """Called by directives"""
-        self._target_lines.append(line)
+    def get_text(self) -> str:
+        return "\n".join(self.lines)
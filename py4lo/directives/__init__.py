@@ -20,4 +20,5 @@ from directives.directive_provider import DirectiveProvider  # noqa
 from directives.directive import Directive  # noqa
 from directives.embed_script import EmbedScript  # noqa
 from directives.embed_lib import EmbedLib  # noqa
+from directives.embed_data import EmbedData  # noqa
 from directives.include import Include  # noqa
@@ -22,7 +22,7 @@ from typing import Any
 class Directive(ABC):
     @abstractmethod
     def execute(self, processor: Any,  # "DirectiveProcessor",
-                line_processor: Any,  # "DirectiveLineProcessor",
+                line_processor: Any,  # "ScriptOutput",
                 args: list[str]):
         """Execute the directive. May append a script to process"""
 
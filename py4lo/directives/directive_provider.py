@@ -16,11 +16,13 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from logging import Logger
+from pathlib import Path
 from typing import TypeVar, Union, cast
 
 from core.source_dest import Sources
 
 from directives.directive import Directive
+from directives.embed_data import EmbedData
 from directives.embed_lib import EmbedLib
 from directives.embed_script import EmbedScript
 from directives.entry import Entry
@@ -71,13 +73,20 @@ class DirectiveProvider:
     """
 
     @staticmethod
-    def create(logger: Logger, sources: Sources):
+    def create(logger: Logger, sources: Sources, temp_dir: Path):
+        """
+        @param logger: the logger
+        @param sources: the sources
+        @param temp_dir: the temp dir, for the generated scripts
+        @return: the provider of all the directives
+        """
         entry = Entry(sources.inc_dir, sources.get_module_names())
         return _DirectiveProviderFactory(
             logger, entry,
             Include(sources.inc_dir),
-            EmbedLib(sources.lib_dir),
-            EmbedScript(sources.opt_dir)).create_provider()
+            EmbedLib(sources.lib_dir, sources.index),
+            EmbedScript(sources.opt_dir),
+            EmbedData(sources.opt_dir, temp_dir)).create_provider()
 
     def __init__(self, logger: Logger, directives_tree: DirectiveTree):
         self._logger = logger
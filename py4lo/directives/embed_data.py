@@ -0,0 +1,122 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import csv
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+from core.script import TempScript
+
+from directives.directive import Directive
+
+DATA_FORMATS = ("json", "csv", "columns")
+_HEADER = '"""Generated by py4lo from {source} ({data_format}): do not edit"""'
+
+
+class EmbedData(Directive):
+    """
+    Parse a data file at build time and embed the result as a module holding
+    a constant `DATA`: the macros import the data instead of parsing the file
+    on each call.
+
+    embed data <name> <source> [<format>]
+
+    * `name` is the name of the module;
+    * `source` is the path of the file, relative to the opt dir (as the
+      scripts of `embed script`, the data files are tracked by the build
+      fingerprint);
+    * `format` is `json` (the JSON value), `csv` (a list of dicts, as
+      `csv.DictReader`) or `columns` (a CSV file as a dict: column name ->
+      tuple of values). Default is the suffix of the source.
+
+    The constant is a literal: the bytecode of the module is a marshal blob
+    and loads fast (especially the `columns` tuples).
+    """
+
+    @staticmethod
+    def sig_elements() -> list[str]:
+        return ["embed", "data"]
+
+    def __init__(self, opt_dir: Path, temp_dir: Path):
+        self._opt_dir = opt_dir
+        self._temp_dir = temp_dir
+
+    def execute(self, processor: Any,  # "DirectiveProcessor",
+                _line_processor: Any,  # "ScriptOutput",
+                args: list[str]):
+        if len(args) not in (2, 3):
+            raise ValueError(
+                f"Usage: embed data <name> <source> [<format>], got {args}")
+        name = args[0]
+        if not name.isidentifier():
+            raise ValueError(f"Data module name is not an identifier: {name}")
+        source = self._opt_dir.joinpath(args[1])
+        if len(args) == 3:
+            data_format = args[2]
+        else:
+            data_format = source.suffix.lstrip(".").lower()
+        if data_format not in DATA_FORMATS:
+            raise ValueError(f"Unknown data format `{data_format}` for "
+                             f"{source}: use one of {DATA_FORMATS}")
+
+        data = load_data(source, data_format)
+        content = "\n".join([
+            _HEADER.format(source=args[1], data_format=data_format),
+            f"DATA = {data!r}",
+            ""
+        ])
+        processor.add_script(TempScript(
+            self._temp_dir.joinpath(f"{name}.py"), content.encode("utf-8"),
+            self._temp_dir, [], None))
+        return True
+
+
+def load_data(source: Path, data_format: str) -> Any:
+    """
+    @param source: the path of the data file
+    @param data_format: the format, see `DATA_FORMATS`
+    @return: the data, a literal value
+    """
+    if data_format == "json":
+        with source.open('r', encoding='utf-8-sig') as f:
+            return json.load(f, parse_constant=_reject_constant,
+                             parse_float=_parse_float)
+
+    with source.open('r', encoding='utf-8-sig', newline='') as f:
+        if data_format == "csv":
+            return list(csv.DictReader(f))
+        elif data_format == "columns":
+            reader = csv.reader(f)
+            header = next(reader, [])
+            columns = tuple(zip(*reader))
+            if not columns:
+                columns = tuple(() for _ in header)
+            return dict(zip(header, columns))
+    raise ValueError(f"Unknown data format `{data_format}`")
+
+
+def _reject_constant(constant: str):
+    raise ValueError(f"{constant} can't be embedded")
+
+
+def _parse_float(value: str) -> float:
+    f = float(value)
+    if not math.isfinite(f):  # 1e999
+        _reject_constant(value)
+    return f
@@ -19,6 +19,7 @@ from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
+from core.project_index import ProjectIndex
 from core.script import SourceScript
 
 from directives.directive import Directive
@@ -35,11 +36,12 @@ class EmbedLib(Directive):
     def sig_elements():
         return ["embed", "lib"]
 
-    def __init__(self, lib_dir: Path):
+    def __init__(self, lib_dir: Path, index: ProjectIndex | None = None):
         self._lib_dir = lib_dir
+        self._index = ProjectIndex() if index is None else index
 
     def execute(self, processor: Any,  # "DirectiveProcessor",
-                line_processor: Any,  # "DirectiveLineProcessor",
+                line_processor: Any,  # "ScriptOutput",
                 args):
         lib_ref = args[0]
         lib_path = self._lib_dir.joinpath(lib_ref)
@@ -61,17 +63,9 @@ finally:
         return True
 
     def _embed(self, lib_path: Path) -> Sequence[SourceScript]:
-        stack = [lib_path]
-        ret = []
-
-        while stack:
-            path = stack.pop()
-            if path.is_dir():
-                stack.extend(path.glob("*.py"))
-            elif path.suffix == "" or path.suffix == ".py":
-                path = path.with_suffix(".py")
-                temp_script = SourceScript(
-                    path, self._lib_dir, False)
-                ret.append(temp_script)
-
-        return ret
+        paths = sorted(p for p in self._index.get_paths(self._lib_dir)
+                       if p.parent == lib_path and p.suffix == ".py")
+        if (not paths and lib_path.suffix in ("", ".py")
+                and not lib_path.is_dir()):
+            paths = [lib_path.with_suffix(".py")]
+        return [SourceScript(path, self._lib_dir, False) for path in paths]
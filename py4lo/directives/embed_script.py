@@ -40,7 +40,7 @@ class EmbedScript(Directive):
         self._opt_dir = opt_dir
 
     def execute(self, processor: Any,  # "DirectiveProcessor",
-                _line_processor: Any,  # "DirectiveLineProcessor",
+                _line_processor: Any,  # "ScriptOutput",
                 args: list[str]):
         script_ref = args[0]
         if len(args) == 2:
@@ -59,7 +59,8 @@ class EmbedScript(Directive):
         while stack:
             path = stack.pop()
             if path.is_dir():
-                stack.extend(path.glob("*"))
+                # reversed: the files are popped in order
+                stack.extend(sorted(path.glob("*"), reverse=True))
             elif path.suffix == ".py":
                 with path.open('rb') as f:
                     temp_script = TempScript(
@@ -18,15 +18,66 @@
 from pathlib import Path
 from typing import Any
 
+from callbacks import ARC_SCRIPTS_PATH
+from core.script_hashes import SCRIPT_HASHES_NAME
+
 from directives.directive import Directive
 from directives.include import Include
 
-UNLOAD_MODULES_FORMAT = """
-# begin py4lo: unload modules
-for module_name in {}:
-    if module_name in sys.modules:
-        del sys.modules[module_name]
-# end py4lo: unload modules
+RELOAD_MODULES_FORMAT = """
+# begin py4lo: reload modules
+def _py4lo_reload_modules(module_names):
+    import importlib
+    import json
+    import os
+    import sys
+    import types
+    import zipfile
+
+    registry = sys.modules.get("_py4lo_registry")
+    if registry is None:
+        registry = types.ModuleType("_py4lo_registry")
+        registry.hashes = {{}}
+        registry.stamp = None
+        sys.modules["_py4lo_registry"] = registry
+
+    try:
+        import uno
+        doc_path = uno.fileUrlToSystemPath(
+            XSCRIPTCONTEXT.getDocument().URL)
+        stat = os.stat(doc_path)
+    except Exception:
+        hashes = None
+    else:
+        stamp = (doc_path, stat.st_mtime_ns, stat.st_size)
+        if registry.stamp == stamp:
+            return  # same document, unchanged: keep all the modules
+        registry.stamp = stamp
+        importlib.invalidate_caches()
+        try:
+            with zipfile.ZipFile(doc_path) as z:
+                hashes = json.loads(z.read("{hashes_path}"))
+        except Exception:
+            hashes = None
+
+    if hashes is None:  # no hashes: unload all the modules
+        registry.stamp = None
+        for module_name in module_names:
+            sys.modules.pop(module_name, None)
+            registry.hashes.pop(module_name, None)
+        return
+
+    if hashes != registry.hashes:
+        # the unchanged modules may hold references to the changed ones:
+        # unload all the modules
+        for module_name in set(module_names) | set(hashes):
+            sys.modules.pop(module_name, None)
+        registry.hashes = hashes
+
+
+_py4lo_reload_modules({module_names})
+del _py4lo_reload_modules
+# end py4lo: reload modules
 """
 
 LIB_SET = {"pylo_commons", "pylo_helper", "py4lo_ods"}
@@ -34,7 +85,9 @@ LIB_SET = {"pylo_commons", "pylo_helper", "py4lo_ods"}
 
 class Entry(Directive):
     """
-    This is an entry point. This will fix the python path.
+    This is an entry point. This will fix the python path and reload the
+    modules if one of them was modified since the last call (see
+    `core.script_hashes`).
     Use in the main file.
     """
 
@@ -47,10 +100,12 @@ class Entry(Directive):
         self._module_names = module_names
 
     def execute(self, _processor: Any,  # "DirectiveProcessor"
-                line_processor: Any,  # "DirectiveLineProcessor"
+                line_processor: Any,  # "ScriptOutput"
                 args):
         execute = self._include_directive.execute(
             _processor, line_processor, ["py4lo_import.py", True])
-        line_processor.append(
-            UNLOAD_MODULES_FORMAT.format(self._module_names | LIB_SET))
+        line_processor.append(RELOAD_MODULES_FORMAT.format(
+            hashes_path=ARC_SCRIPTS_PATH.joinpath(
+                SCRIPT_HASHES_NAME).as_posix(),
+            module_names=sorted(self._module_names | LIB_SET)))
         return execute
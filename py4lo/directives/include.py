@@ -35,7 +35,7 @@ class Include(Directive):
         self._inc_dir = inc_dir
 
     def execute(self, _processor: Any,  # "DirectiveProcessor",
-                line_processor: Any,  # "DirectiveLineProcessor",
+                line_processor: Any,  # "ScriptOutput",
                 args: list[str]):
         path = self._inc_dir.joinpath(args[0])
         if len(args) >= 2:
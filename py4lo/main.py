@@ -16,8 +16,12 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import argparse
+import logging
 import sys
+from pathlib import Path
 
+import build_profiler
+from build_profiler import BuildProfiler
 from commands import commands
 from core.properties import PropertiesProviderFactory
 
@@ -28,6 +32,16 @@ def get_args(argv: list[str] = sys.argv[1:]) -> argparse.Namespace:
         formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument("-t", "--toml", help="the toml file",
                         default="py4lo.toml", type=str)
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the build phases, write a summary and"
+                             " a Chrome trace-event file")
+    parser.add_argument("--profile-output", metavar="TRACE_FILE",
+                        default="py4lo-trace.json",
+                        help="the trace-event file (with --profile)",
+                        type=str)
+    parser.add_argument("--profile-phase", metavar="PHASE",
+                        help="run cProfile around the phases having this"
+                             " name or category (with --profile)", type=str)
     parser.add_argument("command",
                         help=commands.get_help_message(), type=str)
     parser.add_argument("parameters", nargs="*",
@@ -37,6 +51,11 @@ def get_args(argv: list[str] = sys.argv[1:]) -> argparse.Namespace:
 
 def main(factory: PropertiesProviderFactory, argv: list[str] = sys.argv[1:]):
     args = get_args(argv)
+    if not args.profile:
+        profiler = None
+    else:
+        profiler = BuildProfiler(args.profile_phase)
+        build_profiler.set_profiler(profiler)
     provider = factory.create(args.toml)
     logger = provider.get_logger()
     logger.info("Py4LO (C) Julien Férard 2016-2026")
@@ -47,4 +66,22 @@ def main(factory: PropertiesProviderFactory, argv: list[str] = sys.argv[1:]):
                            provider)
     logger.debug("Command is %s", command)
 
-    command.execute()
+    try:
+        command.execute()
+    finally:
+        if profiler is not None:
+            build_profiler.set_profiler(build_profiler.NullProfiler())
+            _write_profile(logger, profiler, Path(args.profile_output))
+
+
+def _write_profile(logger: logging.Logger, profiler: BuildProfiler,
+                   trace_path: Path):
+    logger.warning("Build profile:\n%s", profiler.get_summary())
+    profiler.write_trace(trace_path)
+    logger.warning("Trace events written to %s", trace_path)
+    cprofile_summary = profiler.get_cprofile_summary()
+    if cprofile_summary is not None:
+        pstats_path = trace_path.with_suffix(".prof")
+        profiler.write_cprofile(pstats_path)
+        logger.warning("cProfile stats written to %s:\n%s", pstats_path,
+                       cprofile_summary)
@@ -0,0 +1,292 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import ast
+import io
+import tokenize
+from dataclasses import dataclass
+from typing import cast
+
+# modules whose names are only useful for the type checkers
+_TYPING_MODULES = {"typing", "py4lo_typing"}
+
+
+@dataclass(eq=True, frozen=True)
+class MinifiedContent:
+    """A minified text and, for each line of this text, the number of the
+    line in the original text (1-based)"""
+    text: str
+    line_map: list[int]
+
+
+@dataclass(eq=True, frozen=True)
+class _Edit:
+    """Replace the bytes from (start_line, start_col) to (end_line, end_col)
+    by text. Lines are 0-based, cols are byte offsets, as in the AST."""
+    start_line: int
+    start_col: int
+    end_line: int
+    end_col: int
+    text: bytes
+
+    def contains(self, other: "_Edit") -> bool:
+        return ((self.start_line, self.start_col)
+                <= (other.start_line, other.start_col)
+                and (other.end_line, other.end_col)
+                <= (self.end_line, self.end_col))
+
+
+class Minifier:
+    """
+    Minify a Python script: remove the comments, the docstrings, the
+    `if TYPE_CHECKING:` blocks, the annotations of the function signatures,
+    the imports from `typing` modules that are no longer used, and the blank
+    lines.
+
+    The minified text is checked: if it can't be compiled, the original text
+    is returned.
+    """
+
+    def minify(self, text: str) -> MinifiedContent:
+        """
+        @param text: the script
+        @return: the minified script and its line map
+        """
+        try:
+            return self._minify(text)
+        except (SyntaxError, ValueError, tokenize.TokenError):
+            return MinifiedContent(
+                text, list(range(1, text.count("\n") + 2)))
+
+    def _minify(self, text: str) -> MinifiedContent:
+        lines = _strip_comments(text)
+        byte_lines = [line.encode("utf-8") for line in lines]
+        tree = ast.parse("\n".join(lines))
+        edits = _EditCollector(byte_lines, tree).collect()
+
+        line_numbers = list(range(1, len(byte_lines) + 1))
+        for edit in sorted(edits, key=lambda e: (e.start_line, e.start_col),
+                           reverse=True):
+            new_line = (byte_lines[edit.start_line][:edit.start_col]
+                        + edit.text
+                        + byte_lines[edit.end_line][edit.end_col:])
+            byte_lines[edit.start_line:edit.end_line + 1] = [new_line]
+            del line_numbers[edit.start_line + 1:edit.end_line + 1]
+
+        lines = [line.decode("utf-8").rstrip() for line in byte_lines]
+        kept_lines, line_map = _remove_blank_lines(lines, line_numbers)
+        minified = "\n".join(kept_lines) + "\n"
+        compile(minified, "<minified>", "exec")  # check
+        return MinifiedContent(minified, line_map)
+
+
+class _EditCollector:
+    """Collect the edits on the AST"""
+
+    def __init__(self, byte_lines: list[bytes], tree: ast.Module):
+        self._byte_lines = byte_lines
+        self._tree = tree
+        self._edits = cast(list[_Edit], [])
+        self._removed_nodes = cast(list[ast.AST], [])
+
+    def collect(self) -> list[_Edit]:
+        for node in ast.walk(self._tree):
+            for body in _get_bodies(node):
+                self._remove_statements(
+                    body, [stmt for i, stmt in enumerate(body)
+                           if (i == 0 and _is_docstring(stmt))
+                           or _is_type_checking_block(stmt)])
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._remove_annotations(node)
+
+        self._remove_typing_imports()
+        return self._keep_outer_edits()
+
+    def _remove_statements(self, body: list[ast.stmt],
+                           stmts: list[ast.stmt]):
+        for stmt in stmts:
+            self._removed_nodes.append(stmt)
+            text = b"pass" if stmt is body[0] and len(stmts) == len(
+                body) else b""
+            self._edits.append(_Edit(
+                stmt.lineno - 1, stmt.col_offset,
+                cast(int, stmt.end_lineno) - 1,
+                cast(int, stmt.end_col_offset), text))
+
+    def _remove_annotations(self,
+                            node: ast.FunctionDef | ast.AsyncFunctionDef):
+        args = node.args
+        for arg in (args.posonlyargs + args.args + args.kwonlyargs
+                    + [a for a in (args.vararg, args.kwarg)
+                       if a is not None]):
+            annotation = arg.annotation
+            if annotation is None:
+                continue
+            self._removed_nodes.append(annotation)
+            name_end = arg.col_offset + len(arg.arg.encode("utf-8"))
+            self._edits.append(_Edit(
+                arg.lineno - 1, name_end,
+                cast(int, annotation.end_lineno) - 1,
+                cast(int, annotation.end_col_offset), b""))
+
+        returns = node.returns
+        if returns is not None:
+            self._removed_nodes.append(returns)
+            line, col = self._find_arrow(returns)
+            self._edits.append(_Edit(
+                line, col, cast(int, returns.end_lineno) - 1,
+                cast(int, returns.end_col_offset), b""))
+
+    def _find_arrow(self, returns: ast.expr) -> tuple[int, int]:
+        """@return the position of the `->` before the return annotation"""
+        line = returns.lineno - 1
+        col = returns.col_offset
+        while line >= 0:
+            byte_line = self._byte_lines[line]
+            i = byte_line.rfind(b"->", 0, col)
+            if i >= 0:
+                while i > 0 and byte_line[i - 1:i] in (b" ", b"\t"):
+                    i -= 1
+                return line, i
+            line -= 1
+            col = len(self._byte_lines[line])
+        raise ValueError("No arrow")
+
+    def _remove_typing_imports(self):
+        used_names = self._get_used_names()
+        for node in ast.walk(self._tree):
+            for body in _get_bodies(node):
+                removed = set()
+                for stmt in body:
+                    if not (isinstance(stmt, ast.ImportFrom)
+                            and stmt.module in _TYPING_MODULES
+                            and stmt.level == 0):
+                        continue
+                    names = [alias for alias in stmt.names
+                             if (alias.asname or alias.name) in used_names
+                             or alias.name == "*"]
+                    if not names:
+                        removed.add(id(stmt))
+                    elif len(names) < len(stmt.names):
+                        self._edits.append(_Edit(
+                            stmt.lineno - 1, stmt.col_offset,
+                            cast(int, stmt.end_lineno) - 1,
+                            cast(int, stmt.end_col_offset),
+                            ast.unparse(ast.ImportFrom(
+                                stmt.module, names, 0)).encode("utf-8")))
+                if removed:
+                    self._remove_statements(
+                        [stmt for stmt in body
+                         if not self._is_removed(stmt)],
+                        [stmt for stmt in body if id(stmt) in removed])
+
+    def _is_removed(self, stmt: ast.stmt) -> bool:
+        return any(stmt is node for node in self._removed_nodes)
+
+    def _get_used_names(self) -> set[str]:
+        removed_ids = {id(node) for node in self._removed_nodes}
+        used_names = set()
+        stack = [cast(ast.AST, self._tree)]
+        while stack:
+            node = stack.pop()
+            if id(node) in removed_ids:
+                continue
+            if isinstance(node, ast.Name):
+                used_names.add(node.id)
+            elif (isinstance(node, ast.Constant)
+                  and isinstance(node.value, str)):
+                # string annotations, __all__, ...
+                used_names.update(node.value.replace(".", " ").replace(
+                    "[", " ").replace("]", " ").replace(",", " ").split())
+            stack.extend(ast.iter_child_nodes(node))
+        return used_names
+
+    def _keep_outer_edits(self) -> list[_Edit]:
+        """Edits inside a removed statement are useless"""
+        edits = []
+        for edit in self._edits:
+            if not any(other is not edit and other.contains(edit)
+                       for other in self._edits):
+                edits.append(edit)
+        return edits
+
+
+def _strip_comments(text: str) -> list[str]:
+    """@return the lines, without the comments"""
+    lines = text.split("\n")
+    tokens = tokenize.generate_tokens(io.StringIO(text).readline)
+    for token in tokens:
+        if token.type == tokenize.COMMENT:
+            line, col = token.start
+            lines[line - 1] = lines[line - 1][:col].rstrip()
+    return lines
+
+
+def _remove_blank_lines(lines: list[str], line_numbers: list[int]
+                        ) -> tuple[list[str], list[int]]:
+    """Remove the blank lines, but not the ones inside a string"""
+    in_string = set()
+    text = "\n".join(lines)
+    # Python 3.12+: an f-string is split into FSTRING_START ... FSTRING_END
+    fstring_start = getattr(tokenize, "FSTRING_START", None)
+    fstring_end = getattr(tokenize, "FSTRING_END", None)
+    fstring_start_lines = []
+    for token in tokenize.generate_tokens(io.StringIO(text).readline):
+        if token.type == tokenize.STRING:
+            start_line = token.start[0]
+        elif fstring_start is not None and token.type == fstring_start:
+            fstring_start_lines.append(token.start[0])
+            continue
+        elif fstring_end is not None and token.type == fstring_end:
+            start_line = fstring_start_lines.pop()
+        else:
+            continue
+        if start_line != token.end[0]:
+            in_string.update(range(start_line, token.end[0] + 1))
+
+    kept_lines = []
+    line_map = []
+    for i, (line, line_number) in enumerate(zip(lines, line_numbers),
+                                            start=1):
+        if line.strip() or i in in_string:
+            kept_lines.append(line)
+            line_map.append(line_number)
+    return kept_lines, line_map
+
+
+def _get_bodies(node: ast.AST) -> list[list[ast.stmt]]:
+    bodies = []
+    for name in ("body", "orelse", "finalbody"):
+        body = getattr(node, name, None)
+        if isinstance(body, list) and body and isinstance(body[0], ast.stmt):
+            bodies.append(body)
+    return bodies
+
+
+def _is_docstring(stmt: ast.stmt) -> bool:
+    return (isinstance(stmt, ast.Expr)
+            and isinstance(stmt.value, ast.Constant)
+            and isinstance(stmt.value.value, str))
+
+
+def _is_type_checking_block(stmt: ast.stmt) -> bool:
+    if not isinstance(stmt, ast.If) or stmt.orelse:
+        return False
+    test = stmt.test
+    return ((isinstance(test, ast.Name) and test.id == "TYPE_CHECKING")
+            or (isinstance(test, ast.Attribute)
+                and test.attr == "TYPE_CHECKING"))
@@ -0,0 +1,106 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import dataclasses
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from core.script import SourceScript, TempScript
+
+
+@dataclass(frozen=True)
+class ProcessedScript:
+    """The result of the processing of a source script"""
+    temp_script: TempScript
+    # the scripts appended (embed lib) and added (embed script, embed data)
+    # by the directives
+    appended_scripts: list[SourceScript] = field(default_factory=list)
+    added_scripts: list[TempScript] = field(default_factory=list)
+    # the variables used by the branches, and their values
+    used_variables: dict[str, Any] = field(default_factory=dict)
+
+    def rebase(self, target_dir: Path) -> "ProcessedScript":
+        """
+        @param target_dir: the temp dir of a target
+        @return: the same processed script, in the target temp dir
+        """
+        source_dir = self.temp_script.temp_dir
+        if source_dir == target_dir:
+            return self
+        # the generated scripts (embed data) are in the temp dir too
+        added_scripts = [
+            _rebase(s, target_dir) if s.temp_dir == source_dir else s
+            for s in self.added_scripts]
+        return dataclasses.replace(
+            self, temp_script=_rebase(self.temp_script, target_dir),
+            added_scripts=added_scripts)
+
+
+def _rebase(temp_script: TempScript, target_dir: Path) -> TempScript:
+    return dataclasses.replace(
+        temp_script,
+        script_path=target_dir.joinpath(temp_script.relative_path),
+        temp_dir=target_dir)
+
+
+class ScriptCache:
+    """
+    A cache of the processed scripts, shared by the targets of a build: a
+    script is processed once, unless the branches use variables having
+    different values.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processed_by_key = cast(
+            dict[tuple[SourceScript, str, bool], list[ProcessedScript]], {})
+
+    def get(self, source_script: SourceScript, python_version: str,
+            minified: bool, variables: Mapping[str, Any]
+            ) -> ProcessedScript | None:
+        """
+        @param source_script: the source script
+        @param python_version: the python version
+        @param minified: True if the script is minified
+        @param variables: the variables of the target
+        @return: the processed script or None
+        """
+        with self._lock:
+            candidates = self._processed_by_key.get(
+                (source_script, python_version, minified), [])
+            for processed in candidates:
+                if all(variables.get(name) == value for name, value in
+                       processed.used_variables.items()
+                       if name != "python_version"):
+                    return processed
+        return None
+
+    def put(self, source_script: SourceScript, python_version: str,
+            minified: bool, processed: ProcessedScript):
+        """
+        @param source_script: the source script
+        @param python_version: the python version
+        @param minified: True if the script is minified
+        @param processed: the processed script
+        """
+        with self._lock:
+            self._processed_by_key.setdefault(
+                (source_script, python_version, minified), []
+            ).append(processed)
@@ -18,13 +18,18 @@
 import logging
 import py_compile
 import re
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
+from build_profiler import phase
 from core.script import ParsedScriptContent, SourceScript, TempScript
-from directive_processor import DirectiveProcessor
+from directive_processor import DirectiveProcessor, ScriptOutput
 from directives import DirectiveProvider
+from minifier import Minifier
+from script_cache import ProcessedScript, ScriptCache
+from temp_writer import SyncTempWriter, TempWriter
+from tree_shaker import TreeShaker
 
 
 class ScriptSetProcessor:
@@ -35,7 +40,12 @@ class ScriptSetProcessor:
 
     def __init__(self, logger: logging.Logger, target_dir: Path,
                  python_version: str, directive_provider: DirectiveProvider,
-                 source_scripts: Sequence[SourceScript]):
+                 source_scripts: Sequence[SourceScript],
+                 tree_shaking: bool = False,
+                 minify_dirs: Sequence[Path] = (),
+                 temp_writer: TempWriter | None = None,
+                 variables: Mapping[str, Any] | None = None,
+                 script_cache: ScriptCache | None = None):
         self._logger = logger
         self._target_dir = target_dir
         self._python_version = python_version
@@ -45,6 +55,14 @@ class ScriptSetProcessor:
         self._scripts = cast(list[TempScript], [])
         self._cur_source_scripts = list(source_scripts)  # our stack.
         self._visited = cast(set[SourceScript], set())  # avoid cycles
+        self._tree_shaking = tree_shaking
+        self._lib_paths = cast(set[Path], set())
+        self._minify_dirs = minify_dirs
+        if temp_writer is None:
+            temp_writer = SyncTempWriter(logger)
+        self._temp_writer = temp_writer
+        self._variables = variables or {}
+        self._script_cache = script_cache
 
     def process(self) -> list[TempScript]:
         """Explore the scripts. Since a script may import another script, we
@@ -53,6 +71,9 @@ class ScriptSetProcessor:
             self._process_next_script_if_not_visited()
 
         self._raise_exceptions()
+        if self._tree_shaking:
+            with phase("tree shaking", "script"):
+                self._shake_libs()
         return self._scripts
 
     def _has_more_scripts(self) -> bool:
@@ -63,18 +84,56 @@ class ScriptSetProcessor:
         if next_script in self._visited:
             return  # avoid cycles !
 
-        self._process_script(next_script)
+        with phase(str(next_script.script_path), "script"):
+            self._process_script(next_script)
         self._visited.add(next_script)
 
     def _process_script(self, source_script: SourceScript):
+        minifier = self._get_minifier(source_script)
+        if self._script_cache is None:
+            processed = None
+        else:
+            processed = self._script_cache.get(
+                source_script, self._python_version, minifier is not None,
+                self._variables)
+        if processed is None:
+            processed = self._parse_script(source_script, minifier)
+            if self._script_cache is not None:
+                self._script_cache.put(
+                    source_script, self._python_version,
+                    minifier is not None, processed)
+        else:
+            self._logger.debug("Script from cache: %s", source_script)
+            processed = processed.rebase(self._target_dir)
+
+        for appended_script in processed.appended_scripts:
+            self.append_script(appended_script)
+        for added_script in processed.added_scripts:
+            self.add_script(added_script)
+        temp_script = processed.temp_script
+        if not source_script.export_funcs:  # an embedded lib
+            self._lib_paths.add(temp_script.script_path)
+        self.add_script(temp_script)
+
+    def _parse_script(self, source_script: SourceScript,
+                      minifier: Minifier | None) -> ProcessedScript:
+        recorder = _ScriptRecorder()
         directive_processor = DirectiveProcessor.create(
-            self, self._directive_provider, self._python_version,
-            source_script)
+            recorder, self._directive_provider, self._python_version,
+            source_script, self._variables)
         script_processor = ScriptProcessor(self._logger, directive_processor,
                                            source_script,
-                                           self._target_dir)
+                                           self._target_dir, minifier)
         temp_script = script_processor.parse_script()
-        self.add_script(temp_script)
+        return ProcessedScript(temp_script, recorder.appended_scripts,
+                               recorder.added_scripts,
+                               directive_processor.get_used_variables())
+
+    def _get_minifier(self, source_script: SourceScript) -> Minifier | None:
+        for minify_dir in self._minify_dirs:
+            if source_script.script_path.is_relative_to(minify_dir):
+                return Minifier()
+        return None
 
     def _raise_exceptions(self):
         es = [script.exception for script in self._scripts if
@@ -86,27 +145,46 @@ class ScriptSetProcessor:
             self._logger.error(str(e))
         raise RuntimeError("Compilation errors: see above")
 
+    def _shake_libs(self):
+        """Replace the embedded libs by their pruned version"""
+        lib_scripts = [s for s in self._scripts
+                       if s.script_path in self._lib_paths]
+        other_scripts = [s for s in self._scripts
+                         if s.script_path not in self._lib_paths]
+        pruned_scripts = TreeShaker(self._logger, lib_scripts,
+                                    other_scripts).shake()
+        pruned_by_path = {s.script_path: s for s in pruned_scripts}
+        for pruned_script in pruned_scripts:
+            self._write_script(pruned_script)
+        self._scripts = [pruned_by_path.get(s.script_path, s)
+                         for s in self._scripts]
+
     def append_script(self, source_script: SourceScript):
         """Append a new script. The directive UseLib will call this method"""
         self._cur_source_scripts.append(source_script)
 
     def add_script(self, script: TempScript):
-        """Add but do not process this script"""
+        """Add but do not process this script. The script is kept in memory,
+        the temp writer may write it to the temp dir."""
         self._write_script(script)
         self._scripts.append(script)
 
     def _write_script(self, script: TempScript):
-        self._ensure_dir_exists(script)
-        self._logger.debug("Writing temp script: %s (%s)",
-                           script.relative_path,
-                           script.script_path)
-        with script.script_path.open('wb') as f:
-            f.write(script.script_content)
+        self._temp_writer.write(script)
 
-    def _ensure_dir_exists(self, script: TempScript):
-        target_dir = script.script_path.parent
-        if not target_dir.exists():
-            target_dir.mkdir(parents=True)
+
+class _ScriptRecorder:
+    """Record the scripts appended or added by the directives of a script"""
+
+    def __init__(self):
+        self.appended_scripts = cast(list[SourceScript], [])
+        self.added_scripts = cast(list[TempScript], [])
+
+    def append_script(self, source_script: SourceScript):
+        self.appended_scripts.append(source_script)
+
+    def add_script(self, temp_script: TempScript):
+        self.added_scripts.append(temp_script)
 
 
 class ScriptProcessor:
@@ -114,11 +192,13 @@ class ScriptProcessor:
 
     def __init__(self, logger: logging.Logger,
                  directive_processor: DirectiveProcessor,
-                 source_script: SourceScript, target_dir: Path):
+                 source_script: SourceScript, target_dir: Path,
+                 minifier: Minifier | None = None):
         self._logger = logger
         self._directive_processor = directive_processor
         self._source_script = source_script
         self._target_dir = target_dir
+        self._minifier = minifier
 
     def parse_script(self) -> TempScript:
         self._logger.debug("Parsing script: %s (%s)",
@@ -130,9 +210,18 @@ class ScriptProcessor:
         parsed_content = parser.parse(self._source_script.export_funcs)
         target_path = self._target_dir.joinpath(
             self._source_script.relative_path)
-        script = TempScript(target_path, parsed_content.text.encode("utf-8"),
+        if self._minifier is None:
+            text = parsed_content.text
+            line_map = None
+        else:
+            minified_content = self._minifier.minify(parsed_content.text)
+            text = minified_content.text
+            line_map = [parsed_content.source_line_numbers[i - 1]
+                        for i in minified_content.line_map]
+        script = TempScript(target_path, text.encode("utf-8"),
                             self._target_dir,
-                            parsed_content.exported_func_names, exception)
+                            parsed_content.exported_func_names, exception,
+                            line_map)
         self._logger.debug("Temp output script is: %s (%s)",
                            script.script_path, script.exported_func_names)
         return script
@@ -148,7 +237,7 @@ class ScriptProcessor:
 
 
 class _ContentParser:
-    """A script parser"""
+    """A script parser: one streaming pass over the lines of the file"""
 
     _PATTERN = re.compile("^def\\s+([^_].*?)\\(.*\\):.*$")
 
@@ -160,7 +249,9 @@ class _ContentParser:
         self._script_path = script_path
         self._script = None
         self._exported_func_names = cast(list[str], [])
-        self._lines = ["# parsed by py4lo (https://github.com/jferard/py4lo)"]
+        self._output = ScriptOutput()
+        self._output.write_line(
+            "# parsed by py4lo (https://github.com/jferard/py4lo)", 0)
 
     def parse(self, export_funcs: bool) -> ParsedScriptContent:
         if self._script:
@@ -175,30 +266,31 @@ class _ContentParser:
             self._add_exported_func_names()
         else:
             exported_func_names = []
-        return ParsedScriptContent("\n".join(self._lines), exported_func_names)
+        return ParsedScriptContent(self._output.get_text(),
+                                   exported_func_names,
+                                   self._output.line_numbers)
 
     def _process_lines(self, f):
+        output = self._output
+        directive_processor = self._directive_processor
         line = None
         try:
-            for line in f:
-                self._process_line(line.rstrip())
+            for line_number, line in enumerate(f, start=1):
+                line = line.rstrip()
+                if line.startswith('#'):
+                    output.source_line_number = line_number
+                    directive_processor.process_line(line, output)
+                elif directive_processor.ignore_lines():
+                    output.write_line("### py4lo ignore: " + line,
+                                      line_number)
+                else:
+                    if line.startswith("def"):
+                        self._update_exported(line)
+                    output.write_line(line, line_number)
         except Exception:
             self._logger.critical("%s, line=%s", self._script_path, line)
             raise
 
-    def _process_line(self, line: str):
-        if line and line[0] == '#':
-            self._lines.extend(self._directive_processor.process_line(line))
-        else:
-            self._append_to_lines(line)
-
-    def _append_to_lines(self, line: str):
-        if self._directive_processor.ignore_lines():
-            self._lines.append("### py4lo ignore: " + line)
-        else:
-            self._update_exported(line)
-            self._lines.append(line)
-
     def _update_exported(self, line: str):
         m = _ContentParser._PATTERN.match(line)
         if m:
@@ -207,9 +299,6 @@ class _ContentParser:
 
     def _add_exported_func_names(self):
         if self._exported_func_names:
-            self._lines.extend([
-                "",
-                "",
-                "g_exportedScripts = ({},)".format(
-                    ", ".join(self._exported_func_names))
-            ])
+            for line in ("", "", "g_exportedScripts = ({},)".format(
+                    ", ".join(self._exported_func_names))):
+                self._output.write_line(line, 0)
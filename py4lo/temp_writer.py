@@ -0,0 +1,126 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import cast
+
+from core.script import TempScript
+
+
+class TempWriter(ABC):
+    """
+    Write the temp scripts to the temp dir. The temp scripts are kept in
+    memory and added to the archive from memory: the temp files are only
+    useful for debugging.
+    """
+
+    @abstractmethod
+    def write(self, script: TempScript):
+        """
+        Write a script, or schedule the write.
+
+        @param script: the script
+        """
+
+    def wait(self):
+        """Wait for the end of the pending writes"""
+
+
+class SyncTempWriter(TempWriter):
+    """Write the scripts immediately"""
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def write(self, script: TempScript):
+        _write_script(self._logger, script)
+
+
+class AsyncTempWriter(TempWriter):
+    """Write the scripts in a background thread"""
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+        self._executor = cast(ThreadPoolExecutor | None, None)
+        self._futures = cast(list[Future], [])
+
+    def write(self, script: TempScript):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="py4lo-temp-writer")
+        self._futures.append(
+            self._executor.submit(_write_script, self._logger, script))
+
+    def wait(self):
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        futures, self._futures = self._futures, []
+        for future in futures:
+            e = future.exception()
+            if e is not None:
+                self._logger.warning("Can't write temp script: %s", e)
+
+
+class NullTempWriter(TempWriter):
+    """Don't write anything"""
+
+    def write(self, script: TempScript):
+        pass
+
+
+def create_temp_writer(logger: logging.Logger, mode: str) -> TempWriter:
+    """
+    @param logger: the logger
+    @param mode: "sync", "async" or "off"
+    @return: the temp writer
+    """
+    if mode == "async":
+        return AsyncTempWriter(logger)
+    elif mode == "off":
+        return NullTempWriter()
+    elif mode != "sync":
+        logger.warning("Unknown temp writes mode `%s`, use `sync`", mode)
+    return SyncTempWriter(logger)
+
+
+def _write_script(logger: logging.Logger, script: TempScript):
+    _ensure_dir_exists(script)
+    logger.debug("Writing temp script: %s (%s)", script.relative_path,
+                 script.script_path)
+    with script.script_path.open('wb') as f:
+        f.write(script.script_content)
+    if script.line_map is not None:
+        _write_line_map(script)
+
+
+def _ensure_dir_exists(script: TempScript):
+    target_dir = script.script_path.parent
+    if not target_dir.exists():
+        target_dir.mkdir(parents=True)
+
+
+def _write_line_map(script: TempScript):
+    """The sidecar map: for each line of the minified script, the line
+    of the source script. Use it to read the tracebacks."""
+    map_path = script.script_path.with_name(script.script_path.name + ".map")
+    with map_path.open('w', encoding="utf-8") as f:
+        json.dump(script.line_map, f)
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Any, cast
 
 import toml
+from build_profiler import phase
 from tools import nested_merge, secure_exe
 
 
@@ -34,9 +35,11 @@ class TomlLoader:
             self._default_py4lo_toml)
         print("*** Load TOML : %s (default=%s)", self._project_py4lo_toml,
               self._default_py4lo_toml)
-        self._load_toml(self._default_py4lo_toml)
-        self._load_toml(self._project_py4lo_toml, skip_on_error=True)
-        self._check_python_target_version()
+        with phase("load toml", "config"):
+            self._load_toml(self._default_py4lo_toml)
+            self._load_toml(self._project_py4lo_toml, skip_on_error=True)
+        with phase("python version probe", "config"):
+            self._check_python_target_version()
         self._check_level()
         return self._data
 
@@ -45,7 +45,8 @@ def nested_merge(d1: dict[str, Any], d2: dict[str, Any],
         if isinstance(v, dict):
             d1[k] = nested_merge(d1.get(k, {}), v, apply)
         elif isinstance(v, list):
-            d1[k] = [apply(w) for w in d1.get(k, []) + v]
+            d1[k] = [nested_merge({}, w, apply) if isinstance(w, dict)
+                     else apply(w) for w in d1.get(k, []) + v]
         else:
             d1[k] = apply(v)
 
@@ -0,0 +1,357 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import ast
+import logging
+from collections.abc import Iterator
+from typing import NamedTuple, cast
+
+from core.script import TempScript
+
+_PRUNED_HEADER = "# pruned by py4lo: only the reachable statements were kept"
+
+
+class _Unit(NamedTuple):
+    """
+    A pruning unit: a top level statement, or a single alias of a top level
+    import statement (`alias_index` is not None).
+    """
+    stmt_index: int
+    alias_index: int | None
+
+
+class _Reference(NamedTuple):
+    """
+    A reference to a top level name of a lib. If `name` is None, the whole
+    lib is referenced.
+    """
+    module_name: str
+    name: str | None
+
+
+class _ReferenceCollector(ast.NodeVisitor):
+    """
+    Collect the references of a node to the top level names of its module
+    and to the libs.
+    """
+
+    def __init__(self, module_name: str | None, lib_names: set[str],
+                 lib_by_alias: dict[str, str]):
+        self._module_name = module_name
+        self._lib_names = lib_names
+        self._lib_by_alias = lib_by_alias
+        self.references = cast(set[_Reference], set())
+
+    def visit_Attribute(self, node: ast.Attribute):
+        value = node.value
+        if isinstance(value, ast.Name) and value.id in self._lib_by_alias:
+            self.references.add(
+                _Reference(self._lib_by_alias[value.id], node.attr))
+        else:
+            self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if not isinstance(node.ctx, ast.Load):
+            return
+        if node.id in self._lib_by_alias:  # the module itself is used
+            self.references.add(
+                _Reference(self._lib_by_alias[node.id], None))
+        elif self._module_name is not None:
+            self.references.add(_Reference(self._module_name, node.id))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.level or node.module not in self._lib_names:
+            return
+        module_name = cast(str, node.module)
+        for alias in node.names:
+            if alias.name == "*":
+                self.references.add(_Reference(module_name, None))
+            else:
+                self.references.add(_Reference(module_name, alias.name))
+
+
+class _LibModule:
+    """
+    A parsed lib: the top level statements and the names they define.
+    """
+
+    def __init__(self, name: str, temp_script: TempScript, tree: ast.Module,
+                 lib_names: set[str]):
+        self.name = name
+        self.temp_script = temp_script
+        self.tree = tree
+        self.lib_by_alias = _get_lib_by_alias(tree, lib_names)
+        self._lib_names = lib_names
+        self.units_by_name = cast(dict[str, list[_Unit]], {})
+        self.always_units = cast(list[_Unit], [])
+        self._index_units()
+
+    def _index_units(self):
+        for i, stmt in enumerate(self.tree.body):
+            if i == 0 and _is_docstring(stmt):
+                continue
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                self._index_import(i, stmt)
+                continue
+
+            names = _get_defined_names(stmt)
+            if names is None or any(n.startswith("__") for n in names):
+                self.always_units.append(_Unit(i, None))
+            else:
+                for name in names:
+                    self.units_by_name.setdefault(name, []).append(
+                        _Unit(i, None))
+
+    def _index_import(self, i: int, stmt: ast.Import | ast.ImportFrom):
+        for j, alias in enumerate(stmt.names):
+            if alias.name == "*":
+                self.always_units.append(_Unit(i, None))
+                return
+            bound = alias.asname or alias.name.split(".")[0]
+            self.units_by_name.setdefault(bound, []).append(_Unit(i, j))
+
+    def get_all_units(self) -> Iterator[_Unit]:
+        yield from self.always_units
+        for units in self.units_by_name.values():
+            yield from units
+
+    def get_references(self, unit: _Unit) -> set[_Reference]:
+        stmt = self.tree.body[unit.stmt_index]
+        if unit.alias_index is None:
+            node = stmt
+        else:
+            stmt = cast(ast.Import | ast.ImportFrom, stmt)
+            alias = stmt.names[unit.alias_index]
+            if isinstance(stmt, ast.Import):
+                if alias.name in self._lib_names:
+                    return {_Reference(alias.name, None)}
+                return set()
+            node = ast.ImportFrom(stmt.module, [alias], stmt.level)
+
+        collector = _ReferenceCollector(self.name, self._lib_names,
+                                        self.lib_by_alias)
+        collector.visit(node)
+        return collector.references
+
+    def to_pruned_script(self, units: set[_Unit]) -> TempScript:
+        text = self.temp_script.script_content.decode("utf-8")
+        lines = text.splitlines()
+        chunks = [_PRUNED_HEADER]
+        for i, stmt in enumerate(self.tree.body):
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                aliases = [alias for j, alias in enumerate(stmt.names)
+                           if _Unit(i, j) in units]
+                if _Unit(i, None) in units or len(aliases) == len(stmt.names):
+                    chunks.append(_get_source(lines, stmt))
+                elif aliases:
+                    chunks.append(_unparse_import(stmt, aliases))
+            elif _Unit(i, None) in units:
+                chunks.append(_get_source(lines, stmt))
+
+        content = "\n\n".join(chunks) + "\n"
+        return TempScript(
+            self.temp_script.script_path, content.encode("utf-8"),
+            self.temp_script.temp_dir, self.temp_script.exported_func_names,
+            self.temp_script.exception)
+
+
+class TreeShaker:
+    """
+    Prune the embedded libs: keep only the top level functions, classes,
+    constants and imports of the libs that are reachable from the other
+    scripts. The names are unchanged.
+
+    The analysis is conservative: a lib is kept as is if it is used as a
+    value (e.g. `f(py4lo_helper)`), imported with a star, or if it can't be
+    parsed.
+    """
+
+    def __init__(self, logger: logging.Logger, lib_scripts: list[TempScript],
+                 other_scripts: list[TempScript]):
+        self._logger = logger
+        self._lib_scripts = lib_scripts
+        self._other_scripts = other_scripts
+
+    def shake(self) -> list[TempScript]:
+        """
+        @return: the pruned lib scripts, in the same order.
+        """
+        lib_names = {_get_module_name(s) for s in self._lib_scripts}
+        modules = cast(dict[str, _LibModule], {})
+        for lib_script in self._lib_scripts:
+            name = _get_module_name(lib_script)
+            tree = self._parse(lib_script)
+            if tree is not None:
+                modules[name] = _LibModule(name, lib_script, tree, lib_names)
+
+        kept = self._find_reachable_units(modules, lib_names)
+
+        ret = []
+        for lib_script in self._lib_scripts:
+            name = _get_module_name(lib_script)
+            units = kept.get(name)
+            if name not in modules or units is None:
+                ret.append(lib_script)
+            else:
+                pruned = modules[name].to_pruned_script(units)
+                self._logger.debug(
+                    "Pruned lib %s: %s -> %s bytes", name,
+                    len(lib_script.script_content),
+                    len(pruned.script_content))
+                ret.append(pruned)
+        return ret
+
+    def _parse(self, temp_script: TempScript) -> ast.Module | None:
+        try:
+            return ast.parse(temp_script.script_content)
+        except SyntaxError as e:
+            self._logger.warning("Can't prune %s: %s",
+                                 temp_script.script_path, e)
+            return None
+
+    def _find_reachable_units(
+            self, modules: dict[str, _LibModule], lib_names: set[str]
+    ) -> dict[str, set[_Unit] | None]:
+        """
+        @return: a mapping module name -> kept units (None: the whole
+        module)
+        """
+        kept = cast(dict[str, set[_Unit] | None],
+                    {name: set() for name in modules})
+        stack = []
+        for module in modules.values():
+            for unit in module.always_units:
+                stack.append((module, unit))
+
+        references = set()
+        for script in self._other_scripts:
+            references |= self._get_script_references(script, lib_names)
+
+        while stack or references:
+            while references:
+                reference = references.pop()
+                module = modules.get(reference.module_name)
+                if module is None or kept[module.name] is None:
+                    continue
+                if reference.name is None:
+                    units = list(module.get_all_units())
+                    kept[module.name] = None
+                else:
+                    units = module.units_by_name.get(reference.name, [])
+                stack.extend((module, unit) for unit in units)
+
+            if stack:
+                module, unit = stack.pop()
+                module_kept = kept[module.name]
+                if module_kept is not None:
+                    if unit in module_kept:
+                        continue
+                    module_kept.add(unit)
+                references |= module.get_references(unit)
+
+        return kept
+
+    def _get_script_references(self, script: TempScript,
+                               lib_names: set[str]) -> set[_Reference]:
+        try:
+            tree = ast.parse(script.script_content)
+        except SyntaxError:
+            # can't tell what is used
+            return {_Reference(name, None) for name in lib_names}
+
+        collector = _ReferenceCollector(
+            None, lib_names, _get_lib_by_alias(tree, lib_names))
+        collector.visit(tree)
+        return collector.references
+
+
+def _get_module_name(temp_script: TempScript) -> str:
+    relative_path = temp_script.relative_path.with_suffix("")
+    parts = relative_path.parts
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _get_lib_by_alias(tree: ast.Module, lib_names: set[str]
+                      ) -> dict[str, str]:
+    lib_by_alias = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in lib_names:
+                    lib_by_alias[alias.asname or alias.name] = alias.name
+    return lib_by_alias
+
+
+def _is_docstring(stmt: ast.stmt) -> bool:
+    return (isinstance(stmt, ast.Expr)
+            and isinstance(stmt.value, ast.Constant)
+            and isinstance(stmt.value.value, str))
+
+
+def _get_defined_names(stmt: ast.stmt) -> list[str] | None:
+    """
+    @return: the names defined by a top level statement, None if the
+    statement must be kept anyway.
+    """
+    if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef,
+                         ast.ClassDef)):
+        return [stmt.name]
+    elif isinstance(stmt, ast.Assign):
+        names = []
+        for target in stmt.targets:
+            target_names = _get_target_names(target)
+            if target_names is None:
+                return None
+            names.extend(target_names)
+        return names
+    elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target,
+                                                        ast.Name):
+        return [stmt.target.id]
+    else:
+        return None
+
+
+def _get_target_names(target: ast.expr) -> list[str] | None:
+    if isinstance(target, ast.Name):
+        return [target.id]
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        names = []
+        for elt in target.elts:
+            elt_names = _get_target_names(elt)
+            if elt_names is None:
+                return None
+            names.extend(elt_names)
+        return names
+    else:
+        return None
+
+
+def _get_source(lines: list[str], stmt: ast.stmt) -> str:
+    start = stmt.lineno
+    for decorator in getattr(stmt, "decorator_list", []):
+        start = min(start, decorator.lineno)
+    return "\n".join(lines[start - 1:stmt.end_lineno])
+
+
+def _unparse_import(stmt: ast.Import | ast.ImportFrom,
+                    aliases: list[ast.alias]) -> str:
+    if isinstance(stmt, ast.Import):
+        return ast.unparse(ast.Import(aliases))
+    else:
+        return ast.unparse(ast.ImportFrom(stmt.module, aliases, stmt.level))
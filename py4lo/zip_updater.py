@@ -18,11 +18,16 @@
 import logging
 from logging import Logger
 from pathlib import Path
-from typing import cast
+from typing import IO, cast
 from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
 
+from build_profiler import phase
 from callbacks.callback import AfterCallback, BeforeCallback, ItemCallback
 
+# the entries have a fixed date: the archive is deterministic. This is the
+# default date of a `ZipInfo`.
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
 
 class ZipUpdaterBuilder:
     """
@@ -77,11 +82,12 @@ class ZipUpdater:
         ZipUpdater._logger.debug(
             "Update zip: input %s, output %s", zip_source,
             zip_dest)
-        print("Update zip: input %s, output %s", zip_source, zip_dest)
-        with ZipFile(zip_dest, 'w', compression=ZIP_DEFLATED) as zout:
+        with FixedDateZipFile(zip_dest, 'w',
+                              compression=ZIP_DEFLATED) as zout:
             self._do_before(zout)
 
-            with ZipFile(zip_source, 'r') as zin:
+            with ZipFile(zip_source, 'r') as zin, phase("zip source items",
+                                                         "zip"):
                 zout.comment = zin.comment  # preserve the comment
                 self._do_items(zin, zout)
 
@@ -110,5 +116,23 @@ class ZipUpdater:
 
     def _do_after(self, zout):
         for after_callback in self._after_callbacks:
-            if not after_callback.call(zout):
-                break
+            with phase(f"zip {type(after_callback).__name__}", "zip"):
+                if not after_callback.call(zout):
+                    break
+
+
+class FixedDateZipFile(ZipFile):
+    """
+    An archive whose entries have the same date, whatever the writer (copy,
+    `writestr` or `open`): `writestr` writes through `open`. A raw entry
+    (see `blob_cache.write_raw_entry`) must be created with this date.
+    """
+    date_time = FIXED_DATE_TIME
+
+    def open(self, name: str | ZipInfo, mode: str = "r",
+             pwd: bytes | None = None, *, force_zip64: bool = False
+             ) -> IO[bytes]:
+        if mode == "w" and isinstance(name, ZipInfo):
+            name.date_time = self.date_time
+        # else: the new `ZipInfo` has the default date
+        return super().open(name, mode, pwd, force_zip64=force_zip64)
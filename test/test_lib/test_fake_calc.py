@@ -0,0 +1,136 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import datetime as dt
+import time
+import unittest
+
+from _fake_calc import FakeCalcEngine
+from _mock_constants import NumberFormat
+from py4lo_helper import (
+    DataArrayCopier,
+    SheetFormatter,
+    get_used_range,
+    narrow_range_to_data,
+    parent_doc,
+)
+from py4lo_io import CellTyping, reader, writer
+
+
+class FakeCalcTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeCalcEngine()
+        self.oDoc = self.engine.create_document(["A", "B"])
+        self.oSheet = self.oDoc.Sheets.getByIndex(0)
+
+    def test_sheets(self):
+        self.assertEqual(("A", "B"), self.oDoc.Sheets.ElementNames)
+        self.assertEqual("B", self.oDoc.Sheets.getByName("B").Name)
+        self.assertIs(self.oDoc, parent_doc(self.oSheet))
+
+    def test_data_array(self):
+        oRange = self.oSheet.getCellRangeByPosition(1, 1, 2, 2)
+        oRange.DataArray = (("a", 1), (2.5, ""))
+
+        self.assertEqual((("a", 1.0), (2.5, "")), oRange.DataArray)
+        self.assertEqual((("a", "1"), ("2.5", "")), oRange.FormulaArray)
+        self.assertEqual("TEXT", self.oSheet.getCellByPosition(1, 1).Type.value)
+        self.assertEqual("EMPTY",
+                         self.oSheet.getCellByPosition(2, 2).Type.value)
+        with self.assertRaises(ValueError):
+            oRange.DataArray = (("a",),)
+
+    def test_formula_array(self):
+        oRange = self.oSheet.getCellRangeByPosition(0, 0, 1, 0)
+        oRange.FormulaArray = (("=A2+1", "3"),)
+
+        self.assertEqual((("=A2+1", "3"),), oRange.FormulaArray)
+        oCell = self.oSheet.getCellByPosition(0, 0)
+        self.assertEqual("FORMULA", oCell.Type.value)
+        self.assertEqual(3.0, self.oSheet.getCellByPosition(1, 0).Value)
+
+    def test_used_range_and_narrow(self):
+        self.oSheet.getCellRangeByPosition(2, 3, 3, 4).DataArray = (
+            ("a", " "), (" ", " "))
+
+        oRange = get_used_range(self.oSheet)
+        self.assertEqual((2, 3, 3, 4), _bounds(oRange))
+        self.assertEqual((2, 3, 2, 3), _bounds(narrow_range_to_data(oRange)))
+
+    def test_reader_writer(self):
+        oFormats = self.oDoc.NumberFormats
+        w = writer.from_typing(self.oSheet, CellTyping.Accurate, oFormats)
+        w.writerow(["x", 1.5, dt.date(2020, 1, 2), True])
+
+        r = reader.from_typing(get_used_range(self.oSheet),
+                               CellTyping.Accurate, oFormats)
+        self.assertEqual([["x", 1.5, dt.datetime(2020, 1, 2,
+                                                 tzinfo=dt.timezone.utc),
+                           True]], list(r))
+
+    def test_data_array_copier(self):
+        data_array = [[str(i), i] for i in range(25)]
+        DataArrayCopier(undo=True, chunk_size=10).copy(
+            self.oSheet.getCellByPosition(0, 0), data_array)
+        DataArrayCopier(undo=False).copy(
+            self.oSheet.getCellByPosition(3, 0), data_array)
+
+        undo_manager = self.oDoc.UndoManager
+        self.assertEqual(["copy"], undo_manager.contexts)
+        self.assertEqual([20, 20, 10], undo_manager.actions)
+        self.assertFalse(undo_manager.isLocked())
+        self.assertEqual((("24", 24.0, "", "24", 24.0),),
+                         self.oSheet.getCellRangeByPosition(
+                             0, 24, 4, 24).DataArray)
+
+    def test_sheet_formatter(self):
+        formatter = SheetFormatter(self.oSheet)
+        formatter.set_format("YYYY-MM-DD", 0, 2)
+        formatter.first_row_as_header()
+
+        oFormats = self.oDoc.NumberFormats
+        key = self.oSheet.getCellByPosition(2, 5).NumberFormat
+        self.assertEqual(NumberFormat.DATE, oFormats.getByKey(key).Type)
+        self.assertEqual(0, self.oSheet.getCellByPosition(1, 5).NumberFormat)
+        self.assertTrue(self.oSheet.Rows.getByIndex(0).IsTextWrapped)
+
+    def test_call_counts(self):
+        self.engine.reset_counts()
+        oCell = self.oSheet.getCellByPosition(0, 0)
+        oCell.Value = 1
+        _ = oCell.Value
+
+        self.assertEqual(3, self.engine.total_calls)
+        self.assertEqual(2, self.engine.call_counts["Cell.Value"])
+
+    def test_latency(self):
+        engine = FakeCalcEngine(latency=0.001)
+        oSheet = engine.create_document().Sheets.getByIndex(0)
+        start = time.perf_counter()
+        for i in range(10):
+            oSheet.getCellByPosition(0, i).Value = i
+        self.assertGreaterEqual(time.perf_counter() - start, 0.02)
+
+
+def _bounds(oRange):
+    address = oRange.RangeAddress
+    return (address.StartColumn, address.StartRow, address.EndColumn,
+            address.EndRow)
+
+
+if __name__ == '__main__':
+    unittest.main()
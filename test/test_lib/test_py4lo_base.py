@@ -1,8 +1,16 @@
+import datetime as dt
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from py4lo_base import DataType, open_or_create_db
+from py4lo_base import (
+    BaseSchemaBuilder,
+    ColumnSpec,
+    DataType,
+    infer_column_specs,
+    open_or_create_db,
+    read_result_set,
+)
 
 
 class Py4LOBaseTestCase(unittest.TestCase):
@@ -59,6 +67,272 @@ class Py4LOBaseTestCase(unittest.TestCase):
             mock.call.appendByDescriptor(oTableDataDescriptor)
         ], oTables.mock_calls)
 
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_prepare_execute_batch(self, cus):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        oPrepared = mock.Mock()
+        oPrepared.executeBatch.side_effect = [(1, 1), (1,)]
+        self._oConnection.prepareStatement.side_effect = [oPrepared]
+        self._oConnection.getAutoCommit.return_value = True
+
+        db = open_or_create_db(Path("./test.odb"))
+        with db.prepare("INSERT INTO t VALUES(?, ?, ?)") as stmt:
+            count = stmt.execute_batch([
+                (1, "a", None), (2**40, 1.5, True), (3, b"x", dt.date(2024, 1, 2))
+            ], chunk_size=2)
+
+        self.assertEqual(3, count)
+        self.assertEqual([
+            mock.call.setInt(1, 1),
+            mock.call.setString(2, 'a'),
+            mock.call.setNull(3, DataType.VARCHAR),
+            mock.call.addBatch(),
+            mock.call.setLong(1, 2**40),
+            mock.call.setDouble(2, 1.5),
+            mock.call.setBoolean(3, True),
+            mock.call.addBatch(),
+            mock.call.executeBatch(),
+            mock.call.setInt(1, 3),
+            mock.call.setBytes(2, b'x'),
+            mock.call.setDate(3, mock.ANY),
+            mock.call.addBatch(),
+            mock.call.executeBatch(),
+            mock.call.close()
+        ], oPrepared.mock_calls)
+        self.assertEqual([
+            mock.call.prepareStatement('INSERT INTO t VALUES(?, ?, ?)'),
+            mock.call.getAutoCommit(),
+            mock.call.setAutoCommit(False),
+            mock.call.commit(),
+            mock.call.commit(),
+            mock.call.setAutoCommit(True),
+        ], self._oConnection.mock_calls)
+
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_query(self, cus):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        oResultSet = self._create_result_set()
+        self._oStatement.executeQuery.return_value = oResultSet
+
+        db = open_or_create_db(Path("./test.odb"))
+        rows = list(db.query("SELECT * FROM t"))
+
+        self.assertEqual([
+            (1, "a", dt.date(2024, 1, 2)),
+            (None, "b", dt.date(2024, 1, 3)),
+        ], rows)
+        oResultSet.close.assert_called_once_with()
+
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_query_break(self, cus):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        oResultSet = self._create_result_set()
+        self._oStatement.executeQuery.return_value = oResultSet
+
+        db = open_or_create_db(Path("./test.odb"))
+        rows = db.query("SELECT * FROM t")
+        self.assertEqual((1, "a", dt.date(2024, 1, 2)), next(rows))
+        rows.close()
+
+        oResultSet.close.assert_called_once_with()
+
+    def test_read_result_set_null_dates(self):
+        oResultSet = mock.Mock()
+        oMetaData = oResultSet.getMetaData.return_value
+        oMetaData.getColumnCount.return_value = 2
+        oMetaData.getColumnType.side_effect = [
+            DataType.DATE.value, DataType.TIMESTAMP.value]
+        oResultSet.next.side_effect = [True, True, False]
+        # a NULL date is a zeroed struct
+        oResultSet.getDate.side_effect = [
+            mock.Mock(Year=0, Month=0, Day=0),
+            mock.Mock(Year=2024, Month=1, Day=2)]
+        oResultSet.getTimestamp.side_effect = [
+            mock.Mock(Year=2024, Month=1, Day=2, Hours=10, Minutes=0,
+                      Seconds=0, NanoSeconds=0),
+            mock.Mock(Year=0, Month=0, Day=0, Hours=0, Minutes=0,
+                      Seconds=0, NanoSeconds=0)]
+        oResultSet.wasNull.side_effect = [True, False, False, True]
+
+        self.assertEqual([
+            (None, dt.datetime(2024, 1, 2, 10, 0)),
+            (dt.date(2024, 1, 2), None),
+        ], list(read_result_set(oResultSet)))
+
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_query_to_sheet(self, cus):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        self._oStatement.executeQuery.return_value = self._create_result_set()
+        oCell = mock.Mock()
+        oCell.CellAddress = mock.Mock(Column=1, Row=2)
+        oCell.Spreadsheet.DrawPage.Forms.Parent.NullDate = mock.Mock(Day=0)
+        oSheet = oCell.Spreadsheet
+        oCell1 = mock.Mock(CellAddress=mock.Mock(Column=1, Row=2),
+                           Spreadsheet=oSheet)
+        oCell2 = mock.Mock(CellAddress=mock.Mock(Column=1, Row=3),
+                           Spreadsheet=oSheet)
+        oSheet.getCellByPosition.side_effect = [oCell1, oCell2]
+        oRange1 = mock.Mock()
+        oRange2 = mock.Mock()
+        oSheet.getCellRangeByPosition.side_effect = [oRange1, oRange2]
+        callback = mock.Mock()
+
+        db = open_or_create_db(Path("./test.odb"))
+        count = db.query_to_sheet("SELECT * FROM t", oCell, 1, callback)
+
+        self.assertEqual(2, count)
+        self.assertEqual([
+            mock.call.getCellByPosition(1, 2),
+            mock.call.getCellRangeByPosition(1, 2, 3, 2),
+            mock.call.getCellByPosition(1, 3),
+            mock.call.getCellRangeByPosition(1, 3, 3, 3),
+        ], [c for c in oSheet.mock_calls
+            if c[0] in ("getCellByPosition", "getCellRangeByPosition")])
+        self.assertEqual([(1, "a", 45293.0)], oRange1.DataArray)
+        self.assertEqual([("", "b", 45294.0)], oRange2.DataArray)
+        self.assertEqual([mock.call(1), mock.call(2)], callback.mock_calls)
+
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_query_to_sheet_partial_chunk(self, cus):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        self._oStatement.executeQuery.return_value = self._create_result_set()
+        oCell = mock.Mock()
+        oCell.CellAddress = mock.Mock(Column=1, Row=2)
+        oCell.Spreadsheet.DrawPage.Forms.Parent.NullDate = mock.Mock(Day=0)
+        oSheet = oCell.Spreadsheet
+        oSheet.getCellByPosition.return_value = mock.Mock(
+            CellAddress=mock.Mock(Column=1, Row=2), Spreadsheet=oSheet)
+        callback = mock.Mock()
+
+        db = open_or_create_db(Path("./test.odb"))
+        count = db.query_to_sheet("SELECT * FROM t", oCell, 10, callback)
+
+        self.assertEqual(2, count)
+        self.assertEqual([mock.call(2)], callback.mock_calls)
+
+    def test_schema_builder(self):
+        builder = BaseSchemaBuilder("persons")
+        builder.add_column("id", DataType.INTEGER).add_column(
+            "name", DataType.VARCHAR, 100).add_column(
+            "birth", DataType.DATE).add_column(
+            "amount", DataType.NUMERIC, 10, 2)
+        builder.primary_key("id").index("name", "birth")
+
+        self.assertEqual(
+            'CREATE TABLE "persons" (\n'
+            '    "id" INTEGER NOT NULL,\n'
+            '    "name" VARCHAR(100),\n'
+            '    "birth" DATE,\n'
+            '    "amount" NUMERIC(10, 2)\n'
+            ')', builder.create_table_sql())
+        self.assertEqual([
+            ('ALTER TABLE "persons" ADD CONSTRAINT "PK_persons" '
+             'PRIMARY KEY ("id")'),
+            ('CREATE INDEX "IDX_persons_name_birth" ON "persons" '
+             '("name", "birth")')
+        ], builder.post_load_sqls())
+        self.assertEqual(
+            'INSERT INTO "persons" ("id", "name", "birth", "amount") '
+            'VALUES (?, ?, ?, ?)', builder.insert_sql())
+
+    @mock.patch("py4lo_io.reader")
+    def test_infer_column_specs(self, r):
+        oRange = mock.Mock()
+        oRange.RangeAddress = mock.Mock(
+            StartColumn=0, StartRow=0, EndColumn=5, EndRow=1000)
+        r.from_typing.return_value = iter([
+            ["id", "name", "", "date", "ts", "flag"],
+            [1.0, "foo", 1.5, dt.datetime(2024, 1, 2),
+             dt.datetime(2024, 1, 2, 10, 0), True],
+            [2.0, None, 2.0, dt.datetime(2024, 1, 3),
+             dt.datetime(2024, 1, 3), False],
+            [3.0, 4.0],
+        ])
+
+        specs = infer_column_specs(oRange, 3)
+
+        self.assertEqual([
+            mock.call.getCellRangeByPosition(0, 0, 5, 3)
+        ], oRange.Spreadsheet.mock_calls)
+        self.assertEqual([
+            ColumnSpec("id", DataType.INTEGER),
+            ColumnSpec("name", DataType.VARCHAR, 255),
+            ColumnSpec("col3", DataType.DOUBLE),
+            ColumnSpec("date", DataType.DATE),
+            ColumnSpec("ts", DataType.TIMESTAMP),
+            ColumnSpec("flag", DataType.BOOLEAN),
+        ], specs)
+
+    @mock.patch("py4lo_io.reader")
+    @mock.patch("py4lo_base.create_uno_service")
+    def test_load_range(self, cus, r):
+        cus.side_effect = [self._oDBContext, self._oHandler]
+        self._oDBContext.getByName.side_effect = [self._oDB]
+        self._oConnection.isClosed.return_value = False
+        self._oConnection.Tables.hasByName.return_value = False
+        self._oConnection.getAutoCommit.return_value = False
+        oPrepared = mock.Mock()
+        oPrepared.executeBatch.side_effect = [(1, 1), (1,)]
+        self._oConnection.prepareStatement.side_effect = [oPrepared]
+        oRange = mock.Mock()
+        oRange.RangeAddress = mock.Mock(
+            StartColumn=0, StartRow=0, EndColumn=1, EndRow=3)
+        oRange.Spreadsheet.DrawPage.Forms.Parent.NullDate = mock.Mock(Day=0)
+        oRange.Spreadsheet.getCellRangeByPosition.side_effect = [
+            mock.Mock(),
+            mock.Mock(DataArray=((1.0, "a"), (2.0, ""))),
+            mock.Mock(DataArray=((3.0, 4.0),)),
+        ]
+        r.from_typing.return_value = iter([
+            ["id", "name"], [1.0, "a"], [2.0], [3.0, 4.0]])
+
+        db = open_or_create_db(Path("./test.odb"))
+        count = db.load_range("t", oRange, ["id"], [["name"]], chunk_size=2)
+
+        self.assertEqual(3, count)
+        self.assertEqual([
+            mock.call.executeUpdate(
+                'CREATE TABLE "t" (\n    "id" INTEGER NOT NULL,\n'
+                '    "name" VARCHAR(255)\n)'),
+            mock.call.executeUpdate(
+                'ALTER TABLE "t" ADD CONSTRAINT "PK_t" PRIMARY KEY ("id")'),
+            mock.call.executeUpdate(
+                'CREATE INDEX "IDX_t_name" ON "t" ("name")'),
+        ], self._oStatement.mock_calls)
+        self.assertEqual([
+            mock.call.setInt(1, 1), mock.call.setString(2, 'a'),
+            mock.call.addBatch(),
+            mock.call.setInt(1, 2), mock.call.setNull(2, DataType.VARCHAR),
+            mock.call.addBatch(),
+            mock.call.executeBatch(),
+            mock.call.setInt(1, 3), mock.call.setString(2, '4'),
+            mock.call.addBatch(),
+            mock.call.executeBatch(),
+            mock.call.close(),
+        ], oPrepared.mock_calls)
+
+    def _create_result_set(self) -> mock.Mock:
+        oResultSet = mock.Mock()
+        oMetaData = oResultSet.getMetaData.return_value
+        oMetaData.getColumnCount.return_value = 3
+        oMetaData.getColumnType.side_effect = [
+            DataType.INTEGER.value, DataType.VARCHAR.value,
+            DataType.DATE.value]
+        oResultSet.next.side_effect = [True, True, False]
+        oResultSet.getInt.side_effect = [1, 0]
+        oResultSet.getString.side_effect = ["a", "b"]
+        oResultSet.getDate.side_effect = [
+            mock.Mock(Year=2024, Month=1, Day=2),
+            mock.Mock(Year=2024, Month=1, Day=3)]
+        oResultSet.wasNull.side_effect = [False, False, False,
+                                          True, False, False]
+        return oResultSet
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -279,6 +279,72 @@ class TestCommons(unittest.TestCase):
         path.unlink()
         os.rmdir(t)
 
+    def test_read_duplicate_asset(self):
+        with tempfile.TemporaryDirectory() as t:
+            path = Path(t) / "file.ods"
+            c = Commons(path.as_uri())
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("Assets/a", b"abc")
+                zf.writestr("py4lo_assets.json", b'{"Assets/b": "Assets/a"}')
+
+            self.assertEqual(b"abc", c.get_asset("Assets/a"))
+            self.assertEqual(b"abc", c.get_asset("Assets/b"))
+            with self.assertRaises(KeyError):
+                c.get_asset("Assets/c")
+
+    def test_asset_cache(self):
+        with tempfile.TemporaryDirectory() as t:
+            path = Path(t) / "file.ods"
+            c = Commons(path.as_uri())
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("Assets/a", b"abc")
+
+            self.assertEqual(b"abc", c.get_asset("Assets/a"))
+            with mock.patch("zipfile.ZipFile.read") as read:
+                self.assertEqual(b"abc", c.get_asset("Assets/a"))
+            read.assert_not_called()
+
+            # the document was saved
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("Assets/a", b"defg")
+            os.utime(path, ns=(0, 0))
+
+            self.assertEqual(b"defg", c.get_asset("Assets/a"))
+            del c
+
+    def test_open_asset(self):
+        with tempfile.TemporaryDirectory() as t:
+            path = Path(t) / "file.ods"
+            c = Commons(path.as_uri())
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("Assets/a", b"abc" * 1000)
+                zf.writestr("py4lo_assets.json", b'{"Assets/b": "Assets/a"}')
+
+            with c.open_asset("Assets/b") as f:
+                self.assertEqual(b"abc", f.read(3))
+            del c
+
+    def test_asset_lru(self):
+        from py4lo_commons import _DocumentArchive
+
+        with tempfile.TemporaryDirectory() as t:
+            path = Path(t) / "file.ods"
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("a", b"a" * 10)
+                zf.writestr("b", b"b" * 10)
+                zf.writestr("c", b"c" * 30)
+
+            archive = _DocumentArchive(str(path), 25, keep_open=False)
+            archive.read("a")
+            archive.read("b")
+            archive.read("a")
+            archive.read("c")  # too big
+            self.assertEqual(["b", "a"], list(archive._cache))
+            archive.read("c")
+            archive.read("b")
+            self.assertEqual(["a", "b"], list(archive._cache))
+            self.assertIsNone(archive._zip_file)
+
     def test_read_empty_config(self):
         config = read_config([])
         self.assertEqual(['DEFAULT'], list(config))
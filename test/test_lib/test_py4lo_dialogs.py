@@ -27,10 +27,13 @@ from py4lo_dialogs import (
     ExecutableDialogResults,
     FileFilter,
     MessageBoxType,
+    ProgressActionStopped,
+    ProgressExecutor,
     ProgressExecutorBuilder,
     Size,
     StandardConsoleHandler,
     StandardProgressHandler,
+    VoidProgressHandler,
     file_dialog,
     folder_dialog,
     get_text_size,
@@ -429,6 +432,38 @@ class ProgressExecutorTestCase(unittest.TestCase):
         self.assertEqual(100, oBar.Value)
         self.assertEqual("foo", oText.Text)
 
+    def test_stop(self):
+        # arrange
+        py4lo_dialogs._oToolkit = None
+        handler = VoidProgressHandler()
+        oDialog = mock.Mock()
+        pe = ProgressExecutor(oDialog, True, handler)
+        calls = []
+
+        def func(h: VoidProgressHandler):
+            h.check_stopped()
+            calls.append(1)
+            pe.stop()
+            h.check_stopped()
+            calls.append(2)
+
+        # act
+        with mock.patch("py4lo_dialogs.create_uno_service"):
+            t = pe.execute(func)
+            t.join()
+
+        # assert
+        self.assertTrue(handler.stopped)
+        self.assertEqual([1], calls)
+        self.assertEqual(mock.call.dispose(), oDialog.mock_calls[-1])
+
+    def test_check_stopped(self):
+        handler = VoidProgressHandler()
+        handler.check_stopped()
+        handler.stop()
+        with self.assertRaises(ProgressActionStopped):
+            handler.check_stopped()
+
 
 class ConsoleExecutorTestCase(unittest.TestCase):
     @mock.patch("py4lo_dialogs.create_uno_service")
@@ -0,0 +1,200 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import py4lo_helper
+import py4lo_profiler
+from _fake_calc import FakeCalcEngine
+from py4lo_helper import get_provider, get_used_range
+from py4lo_profiler import (
+    MacroProfiler,
+    enable_from_document,
+    profiled,
+)
+
+
+class MacroProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.profiler = MacroProfiler(capacity=3)
+
+    def test_disabled(self):
+        with self.profiler.section("a"):
+            pass
+
+        self.assertEqual([], self.profiler.records)
+
+    def test_nested_sections(self):
+        self.profiler.enable()
+        with self.profiler.section("a"):
+            with self.profiler.section("b"):
+                pass
+
+        self.assertEqual([("b", 1, None, None), ("a", 0, None, None)],
+                         [(r.name, r.depth, r.uno_calls, r.memory_delta)
+                          for r in self.profiler.records])
+        b, a = self.profiler.records
+        self.assertLessEqual(a.start, b.start)
+        self.assertLessEqual(b.duration, a.duration)
+
+    def test_exception(self):
+        self.profiler.enable()
+        with self.assertRaises(ValueError):
+            with self.profiler.section("a"):
+                raise ValueError()
+
+        with self.profiler.section("b"):
+            pass
+
+        self.assertEqual([("a", 0), ("b", 0)],
+                         [(r.name, r.depth) for r in self.profiler.records])
+
+    def test_ring_buffer(self):
+        self.profiler.enable()
+        for name in "abcde":
+            with self.profiler.section(name):
+                pass
+
+        self.assertEqual(["c", "d", "e"],
+                         [r.name for r in self.profiler.records])
+        self.assertEqual(2, self.profiler.dropped)
+
+        self.profiler.enable(capacity=2)
+        self.assertEqual(["d", "e"], [r.name for r in self.profiler.records])
+
+        self.profiler.clear()
+        self.assertEqual([], self.profiler.records)
+        self.assertEqual(0, self.profiler.dropped)
+
+    def test_memory(self):
+        self.profiler.enable(trace_memory=True)
+        try:
+            with self.profiler.section("a"):
+                data = [0] * 100000
+        finally:
+            self.profiler.disable()
+
+        self.assertEqual(100000, len(data))
+        self.assertGreater(self.profiler.records[0].memory_delta, 100000)
+
+    def test_trace(self):
+        self.profiler.enable()
+        with self.profiler.section("a"):
+            pass
+
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d, "trace.json")
+            self.profiler.write_trace(path)
+            trace = json.loads(path.read_text(encoding="utf-8"))
+
+        event, = trace["traceEvents"]
+        self.assertEqual(("a", "macro", "X", {}),
+                         (event["name"], event["cat"], event["ph"],
+                          event["args"]))
+
+
+class MacroProfilerUnoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeCalcEngine()
+        self.oDoc = self.engine.create_document(["A", "B"])
+        self.old_provider = py4lo_helper.provider
+        py4lo_helper.provider = py4lo_helper._ObjectProvider(
+            self.oDoc, mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(),
+            mock.Mock(), mock.Mock(), mock.Mock())
+        self.profiler = MacroProfiler()
+
+    def tearDown(self):
+        py4lo_helper.provider = self.old_provider
+
+    def test_uno_calls(self):
+        self.profiler.enable(count_uno_calls=True)
+        with self.profiler.section("a"):
+            oSheet = get_provider().doc.Sheets.getByIndex(0)
+            with self.profiler.section("b"):
+                oSheet.getCellByPosition(0, 0).Value = 1
+
+        self.assertIs(self.oDoc, py4lo_helper.provider.doc)
+        self.assertEqual([("b", 2), ("a", 4)],
+                         [(r.name, r.uno_calls)
+                          for r in self.profiler.records])
+
+    def test_write_to_sheet(self):
+        self.profiler.enable()
+        with self.profiler.section("a"):
+            with self.profiler.section("b"):
+                pass
+
+        oSheet = self.oDoc.Sheets.getByIndex(1)
+        self.profiler.write_to_sheet(oSheet)
+
+        data_array = get_used_range(oSheet).DataArray
+        self.assertEqual(("name", "timestamp", "duration ms", "depth",
+                          "UNO calls", "memory delta"), data_array[0])
+        self.assertEqual(("  b", 1.0), (data_array[1][0], data_array[1][3]))
+        self.assertEqual(("a", 0.0), (data_array[2][0], data_array[2][3]))
+
+
+class ProfiledTestCase(unittest.TestCase):
+    def setUp(self):
+        py4lo_profiler.profiler.clear()
+
+    def tearDown(self):
+        py4lo_profiler.profiler.disable()
+        py4lo_profiler.profiler.clear()
+
+    def test_profiled(self):
+        @profiled()
+        def f(x):
+            return x + 1
+
+        @profiled("my g")
+        def g(x):
+            return f(x) * 2
+
+        self.assertEqual(4, g(1))
+        self.assertEqual([], py4lo_profiler.profiler.records)
+
+        py4lo_profiler.profiler.enable()
+        self.assertEqual(4, g(1))
+        self.assertEqual(
+            [("ProfiledTestCase.test_profiled.<locals>.f", 1), ("my g", 0)],
+            [(r.name, r.depth) for r in py4lo_profiler.profiler.records])
+
+    def _doc(self, value):
+        oDoc = mock.Mock()
+        oProps = oDoc.DocumentProperties.UserDefinedProperties
+        oInfo = oProps.getPropertySetInfo.return_value
+        oInfo.hasPropertyByName.return_value = value is not None
+        oProps.getPropertyValue.return_value = value
+        return oDoc
+
+    def test_enable_from_document(self):
+        self.assertTrue(enable_from_document(self._doc("on")))
+        self.assertFalse(py4lo_profiler.profiler._count_uno_calls)
+        self.assertTrue(enable_from_document(self._doc(" UNO")))
+        self.assertTrue(py4lo_profiler.profiler._count_uno_calls)
+        self.assertFalse(enable_from_document(self._doc("off")))
+        self.assertFalse(enable_from_document(self._doc(None)))
+        self.assertFalse(py4lo_profiler.profiler.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import ctypes
 import datetime as dt
+import io
 import random
 import string
 import threading
@@ -19,6 +20,7 @@ from py4lo_sqlite3 import (
     SQLITE_ERROR,
     SQLITE_FLOAT,
     SQLITE_INTEGER,
+    SQLITE_INTERRUPT,
     SQLITE_OK,
     SQLITE_TEXT,
     Sqlite3Database,
@@ -724,6 +726,191 @@ class Sqlite3TestCase(unittest.TestCase):
                     #     tzinfo=datetime.timezone(datetime.timedelta(seconds=3600))
                     # )}
 
+    def test_create_function(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(x)")
+            db.execute_update(
+                "INSERT INTO t VALUES ('1,5'), ('2,25'), (NULL)")
+            db.create_function(
+                "py_parse", 1,
+                lambda x: None if x is None else float(x.replace(",", ".")))
+
+            self.assertEqual(3, db.execute_update(
+                "UPDATE t SET x = py_parse(x)"))
+            with db.prepare("SELECT x, typeof(x) FROM t") as stmt:
+                self.assertEqual([
+                    [1.5, "real"], [2.25, "real"], [None, "null"]
+                ], list(stmt.execute_query()))
+
+    def test_create_function_types(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.create_function("py_id", 1, lambda x: x)
+            db.create_function("py_now", 0, lambda: dt.datetime(
+                2024, 12, 14, 13, 20, 59, tzinfo=dt.timezone.utc))
+            db.create_function("py_json", 0, lambda: {"a": 1})
+            with db.prepare(
+                    "SELECT py_id(1), py_id(2.5), py_id('a'), py_id(x'00ff'),"
+                    " py_id(NULL), py_now(), py_json()") as stmt:
+                self.assertEqual([
+                    [1, 2.5, 'a', b'\x00\xff', None,
+                     '2024-12-14T13:20:59+00:00', '{"a": 1}']
+                ], list(stmt.execute_query()))
+
+    def test_create_function_arg_decodes(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.create_function("py_year", 1, lambda d: d.year,
+                               arg_decodes=[PY4LO_UNIX_TS])
+            with db.prepare("SELECT py_year(1748528160)") as stmt:
+                self.assertEqual([[2025]], list(stmt.execute_query()))
+
+    def test_create_function_error(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.create_function("py_fail", 0, lambda: 1 / 0, False)
+            with self.assertRaises(SQLiteError) as cm:
+                with db.prepare("SELECT py_fail()") as stmt:
+                    list(stmt.execute_query())
+
+            self.assertEqual(SQLITE_ERROR, cm.exception.result_code)
+            self.assertEqual("ZeroDivisionError: division by zero",
+                             cm.exception.msg)
+
+    def test_create_aggregate(self):
+        class Concat:
+            def __init__(self):
+                self._values = []
+
+            def step(self, value):
+                self._values.append(value)
+
+            def finalize(self):
+                return ", ".join(self._values)
+
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(k INTEGER, v TEXT)")
+            db.execute_update(
+                "INSERT INTO t VALUES (1, 'a'), (2, 'b'), (1, 'c')")
+            db.create_aggregate("py_concat", 1, Concat)
+            with db.prepare(
+                    "SELECT k, py_concat(v) FROM t GROUP BY k ORDER BY k"
+            ) as stmt:
+                self.assertEqual([[1, "a, c"], [2, "b"]],
+                                 list(stmt.execute_query()))
+            with db.prepare("SELECT py_concat(v) FROM t WHERE k = 3") as stmt:
+                self.assertEqual([[""]], list(stmt.execute_query()))
+            self.assertEqual({}, db._aggregates)
+
+    def test_blob_io(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(data BLOB)")
+            with db.prepare("INSERT INTO t VALUES(?)") as stmt:
+                stmt.bind_zeroblob(1, 10)
+                stmt.execute_update()
+            rowid = db.last_insert_rowid()
+
+            with db.open_blob("t", "data", rowid, writable=True) as blob:
+                self.assertEqual(10, len(blob))
+                self.assertEqual(4, blob.write(b"abcd"))
+                blob.write(bytearray(b"efgh"))
+                with self.assertRaises(ValueError):
+                    blob.write(b"ijk")
+
+            with db.open_blob("t", "data", rowid) as blob:
+                buf = bytearray(4)
+                self.assertEqual(4, blob.readinto(buf))
+                self.assertEqual(b"abcd", buf)
+                self.assertEqual(b"efgh\x00\x00", blob.read())
+                self.assertEqual(2, blob.seek(-8, io.SEEK_END))
+                self.assertEqual(b"cd", blob.read(2))
+                with self.assertRaises(io.UnsupportedOperation):
+                    blob.write(b"x")
+
+    def test_blob_io_reopen(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(data BLOB)")
+            db.execute_update("INSERT INTO t VALUES (x'0102'), (x'030405')")
+
+            with db.open_blob("t", "data", 1) as blob:
+                self.assertEqual(b"\x01\x02", blob.read())
+                blob.reopen(2)
+                self.assertEqual(3, len(blob))
+                self.assertEqual(b"\x03\x04\x05", blob.read())
+
+    def test_blob_io_missing_row(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(data BLOB)")
+            with self.assertRaises(SQLiteError) as cm:
+                with db.open_blob("t", "data", 1):
+                    pass
+
+            self.assertEqual(SQLITE_ERROR, cm.exception.result_code)
+
+    def test_bind_blob_static(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.execute_update("CREATE TABLE t(data BLOB)")
+            with db.prepare("INSERT INTO t VALUES(?)") as stmt:
+                for data in [b"abc", bytearray(b"def"),
+                             memoryview(b"ghi"), None]:
+                    stmt.reset()
+                    stmt.bind_blob_static(1, data)
+                    stmt.execute_update()
+
+            with db.prepare("SELECT data FROM t") as stmt:
+                self.assertEqual([[b"abc"], [b"def"], [b"ghi"], [None]],
+                                 list(stmt.execute_query()))
+
+    def test_progress(self):
+        calls = []
+
+        def callback():
+            calls.append(1)
+            if len(calls) == 3:
+                raise KeyboardInterrupt()
+
+        with sqlite_open(":memory:", "crw") as db:
+            with self.assertRaises(KeyboardInterrupt):
+                with db.progress(100, callback):
+                    db.execute_update(self._LONG_QUERY)
+
+            self.assertEqual(3, len(calls))
+            with db.prepare("SELECT 1") as stmt:  # no more handler
+                self.assertEqual([[1]], list(stmt.execute_query()))
+            self.assertEqual(3, len(calls))
+
+    def test_set_progress_handler_interrupt(self):
+        with sqlite_open(":memory:", "crw") as db:
+            db.set_progress_handler(100, lambda: True)
+            with self.assertRaises(SQLiteError) as cm:
+                db.execute_update(self._LONG_QUERY)
+
+            self.assertEqual(SQLITE_INTERRUPT, cm.exception.result_code)
+
+    def test_execute_with_progress(self):
+        class Stopped(Exception):
+            pass
+
+        handler = mock.Mock(response=None)
+        handler.check_stopped.side_effect = [None, Stopped()]
+        executor = mock.Mock()
+        executor.execute.side_effect = lambda func: func(handler)
+
+        with sqlite_open(":memory:", "crw") as db:
+            with self.assertRaises(Stopped):
+                db.execute_with_progress(
+                    executor, lambda db: db.execute_update(self._LONG_QUERY),
+                    100, 5)
+
+            self.assertEqual([mock.call(5), mock.call(5)],
+                             handler.progress.mock_calls)
+
+            handler.check_stopped.side_effect = None
+            db.execute_with_progress(
+                executor, lambda db: db.execute_update("SELECT 1"))
+            self.assertEqual(0, handler.response)
+
+    _LONG_QUERY = (
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c "
+        "WHERE x < 1000000) SELECT count(*) FROM c")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,95 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+from logging import Logger
+from unittest import mock
+
+import py4lo_helper
+from _fake_calc import FakeCalcEngine
+from py4lo_helper import (
+    get_provider,
+    get_used_range,
+    narrow_range_to_data,
+    parent_doc,
+    to_iter,
+)
+from py4lo_uno_stats import UnoStats, instrument_uno
+
+
+class UnoStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeCalcEngine()
+        self.oDoc = self.engine.create_document(["A", "B"])
+        self.old_provider = py4lo_helper.provider
+        py4lo_helper.provider = py4lo_helper._ObjectProvider(
+            self.oDoc, mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(),
+            mock.Mock(), mock.Mock(), mock.Mock())
+
+    def tearDown(self):
+        py4lo_helper.provider = self.old_provider
+
+    def test_instrument_provider(self):
+        provider = py4lo_helper.provider
+        logger: Logger = mock.Mock()
+        with instrument_uno(logger) as stats:
+            oDoc = get_provider().doc
+            oSheet = oDoc.Sheets.getByIndex(0)
+            oSheet.getCellRangeByPosition(0, 0, 1, 1).DataArray = (
+                ("a", " "), (" ", " "))
+            narrow_range_to_data(get_used_range(oSheet))
+            self.assertEqual(oDoc, parent_doc(oSheet))
+            self.assertEqual(["A", "B"],
+                             [s.Name for s in to_iter(oDoc.Sheets)])
+
+        self.assertIs(provider, py4lo_helper.provider)
+        members = {(caller.split(":")[0], member)
+                   for caller, member, _, _ in stats.get_rows()}
+        self.assertIn(("py4lo_helper.narrow_range_to_data", "DataArray"),
+                      members)
+        self.assertIn(("py4lo_helper.get_used_range_address",
+                       "createCursor()"), members)
+        self.assertIn(("py4lo_helper.to_iter", "getByIndex()"), members)
+        self.assertIn((("test_py4lo_uno_stats.UnoStatsTestCase."
+                       "test_instrument_provider"), "set DataArray"),
+                      members)
+        # structs are not wrapped
+        self.assertNotIn("StartRow", {member for _, member in members})
+        self.assertEqual("info", logger.mock_calls[0][0])
+        self.assertIn("narrow_range_to_data", logger.mock_calls[0][1][1])
+
+    def test_write_to_sheet(self):
+        stats = UnoStats()
+        oSheet = stats.wrap(self.oDoc.Sheets.getByIndex(0))
+        oSheet.getCellByPosition(0, 0).Value = 1
+
+        oReportSheet = self.oDoc.Sheets.getByIndex(1)
+        stats.write_to_sheet(stats.wrap(oReportSheet))
+
+        data_array = get_used_range(oReportSheet).DataArray
+        self.assertEqual(("caller", "member", "count", "total ms"),
+                         data_array[0])
+        self.assertEqual(3, len(data_array))
+        self.assertEqual(2, stats.total_calls)
+
+    def test_disabled(self):
+        provider = py4lo_helper.provider
+        self.assertIs(self.oDoc, provider.doc)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import io
+import os
+import tempfile
+import time
+import unittest
+from logging import Logger
+from pathlib import Path
+from unittest import mock
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+from blob_cache import BlobCache
+from compression_policy import STORED, Compression
+
+
+class TestBlobCache(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._cache_dir = Path(self._dir.name)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_miss_then_hit(self):
+        logger: Logger = mock.Mock()
+        cache = BlobCache(logger, self._cache_dir)
+        content = b"some text " * 1000
+        compression = Compression(ZIP_DEFLATED, 9)
+
+        for _ in range(2):
+            out = io.BytesIO()
+            with ZipFile(out, 'w') as zout:
+                zout.writestr("first", b"1")
+                self.assertTrue(cache.write(
+                    zout, ZipInfo("a.txt"), io.BytesIO(content), "abcdef",
+                    compression))
+                zout.writestr("last", b"2")
+
+            with ZipFile(out) as zin:
+                self.assertIsNone(zin.testzip())
+                self.assertEqual(content, zin.read("a.txt"))
+                self.assertEqual(b"2", zin.read("last"))
+                self.assertEqual(ZIP_DEFLATED,
+                                 zin.getinfo("a.txt").compress_type)
+
+        self.assertEqual([
+            mock.call.debug("Blob cache miss: %s", "a.txt"),
+            mock.call.debug("Blob cache hit: %s", "a.txt"),
+        ], logger.mock_calls)
+        self.assertEqual([self._cache_dir.joinpath("ab", "abcdef-9.blob")],
+                         list(self._cache_dir.rglob("*.blob")))
+
+    def test_stored(self):
+        logger: Logger = mock.Mock()
+        cache = BlobCache(logger, self._cache_dir)
+        out = io.BytesIO()
+        with ZipFile(out, 'w') as zout:
+            self.assertFalse(cache.write(
+                zout, ZipInfo("a.png"), io.BytesIO(b""), "abcdef", STORED))
+
+        self.assertEqual([], logger.mock_calls)
+
+    def test_no_raw_write(self):
+        # e.g. another version of Python: fall back to ZipFile.open
+        logger: Logger = mock.Mock()
+        cache = BlobCache(logger, self._cache_dir)
+        zout = mock.Mock(spec=["open", "writestr"])
+
+        self.assertFalse(cache.write(
+            zout, ZipInfo("a.txt"), io.BytesIO(b"text"), "abcdef",
+            Compression(ZIP_DEFLATED, 9)))
+        self.assertEqual([], list(self._cache_dir.rglob("*.blob")))
+
+    def test_evict_age(self):
+        logger: Logger = mock.Mock()
+        old_path = self._create_blob("ab", "abcdef-9.blob", 10, 1000)
+        new_path = self._create_blob("cd", "cdef01-9.blob", 10, 0)
+        cache = BlobCache(logger, self._cache_dir, max_age=100)
+
+        cache.evict()
+
+        self.assertFalse(old_path.exists())
+        self.assertTrue(new_path.exists())
+
+    def test_evict_size(self):
+        logger: Logger = mock.Mock()
+        paths = [self._create_blob("ab", f"ab{i}-9.blob", 10, 100 - i)
+                 for i in range(4)]
+        cache = BlobCache(logger, self._cache_dir, max_size=25)
+
+        cache.evict()
+
+        self.assertEqual([False, False, True, True],
+                         [path.exists() for path in paths])
+        self.assertEqual([mock.call.debug("Blob cache: %s blobs removed", 2)],
+                         logger.mock_calls)
+
+    def test_evict_no_limit(self):
+        logger: Logger = mock.Mock()
+        path = self._create_blob("ab", "abcdef-9.blob", 10, 10 ** 9)
+        BlobCache(logger, self._cache_dir).evict()
+        self.assertTrue(path.exists())
+
+    def _create_blob(self, dir_name: str, name: str, size: int,
+                     age: float) -> Path:
+        path = self._cache_dir.joinpath(dir_name, name)
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+
+
+if __name__ == '__main__':
+    unittest.main()
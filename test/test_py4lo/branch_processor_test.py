@@ -16,6 +16,7 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import unittest
+from unittest import mock
 
 from branch_processor import BranchProcessor
 
@@ -61,5 +62,41 @@ class TestBranchProcessor(unittest.TestCase):
         self.assertTrue(self.bp.handle_directive("endif", []))
         self.bp.end()
 
+    def test_else_after_taken_branch(self):
+        self.assertTrue(self.bp.handle_directive("if", [True]))
+        self.assertTrue(self.bp.handle_directive("elif", [True]))
+        self.assertTrue(self.bp.skip())
+        self.assertTrue(self.bp.handle_directive("else", []))
+        self.assertTrue(self.bp.skip())
+        self.assertTrue(self.bp.handle_directive("endif", []))
+        self.assertFalse(self.bp.skip())
+
+    def test_else_after_no_taken_branch(self):
+        self.assertTrue(self.bp.handle_directive("if", [False]))
+        self.assertTrue(self.bp.handle_directive("elif", [False]))
+        self.assertTrue(self.bp.skip())
+        self.assertTrue(self.bp.handle_directive("else", []))
+        self.assertFalse(self.bp.skip())
+        self.assertTrue(self.bp.handle_directive("endif", []))
+        self.assertFalse(self.bp.skip())
+
+    def test_nested_in_skipped_block(self):
+        tester = mock.Mock(return_value=False)
+        bp = BranchProcessor(tester)
+        self.assertTrue(bp.handle_directive("if", ["a"]))
+        self.assertTrue(bp.handle_directive("if", ["b"]))
+        self.assertTrue(bp.handle_directive("elif", ["c"]))
+        self.assertTrue(bp.handle_directive("else", []))
+        self.assertTrue(bp.skip())
+        self.assertTrue(bp.handle_directive("endif", []))
+        self.assertTrue(bp.skip())
+        self.assertTrue(bp.handle_directive("endif", []))
+        self.assertFalse(bp.skip())
+        bp.end()
+
+        # the nested conditions are not evaluated
+        self.assertEqual([mock.call(["a"])], tester.mock_calls)
+
+
 if __name__ == '__main__':
     unittest.main()
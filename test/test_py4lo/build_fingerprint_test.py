@@ -0,0 +1,105 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import build_fingerprint
+from build_fingerprint import (
+    BuildFingerprint,
+    read_fingerprint,
+    set_fingerprint,
+)
+from core.source_dest import Sources
+
+
+class TestBuildFingerprint(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._base = Path(self._tmp.name)
+        for d in ("inc", "lib", "src", "opt", "assets"):
+            self._base.joinpath(d).mkdir()
+        self._base.joinpath("src", "a.py").write_text("a = 1")
+        self._base.joinpath("assets", "x.txt").write_text("x")
+        self._base.joinpath("source.ods").write_bytes(b"ods")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _compute(self, config=None, variables=None) -> str:
+        # a new index: the files are scanned again
+        sources = Sources(
+            self._base / "source.ods", self._base / "inc",
+            self._base / "lib", self._base / "src", [], self._base / "opt",
+            self._base / "assets", [], self._base / "test")
+        return BuildFingerprint(mock.Mock(), sources, config or {"a": 1},
+                                variables).compute()
+
+    def test_stable(self):
+        fingerprint = self._compute()
+        pycache = self._base.joinpath("src", "__pycache__")
+        pycache.mkdir()
+        pycache.joinpath("a.cpython-311.pyc").write_bytes(b"pyc")
+        self.assertEqual(fingerprint, self._compute())
+
+    def test_inputs(self):
+        fingerprint = self._compute()
+        self.assertNotEqual(fingerprint, self._compute({"a": 2}))
+        self.assertNotEqual(fingerprint,
+                            self._compute(variables={"edition": "pro"}))
+
+        self._base.joinpath("assets", "x.txt").write_text("y")
+        fingerprint2 = self._compute()
+        self.assertNotEqual(fingerprint, fingerprint2)
+
+        self._base.joinpath("src", "b.py").write_text("")
+        fingerprint3 = self._compute()
+        self.assertNotEqual(fingerprint2, fingerprint3)
+
+        self._base.joinpath("source.ods").write_bytes(b"ods2")
+        self.assertNotEqual(fingerprint3, self._compute())
+
+    def test_version(self):
+        fingerprint = self._compute()
+        with mock.patch.object(build_fingerprint, "_py4lo_version", "x"):
+            self.assertNotEqual(fingerprint, self._compute())
+
+    def test_read_fingerprint(self):
+        path = self._base / "dest.ods"
+        self.assertIsNone(read_fingerprint(path))
+
+        path.write_bytes(b"not a zip")
+        self.assertIsNone(read_fingerprint(path))
+
+        with zipfile.ZipFile(path, "w") as zout:
+            zout.writestr("mimetype", "x")
+            zout.comment = set_fingerprint(b"a comment", "0123abcd")
+        self.assertEqual("0123abcd", read_fingerprint(path))
+
+    def test_set_fingerprint(self):
+        self.assertEqual(b"py4lo-fingerprint:01",
+                         set_fingerprint(b"", "01"))
+        self.assertEqual(b"a comment\npy4lo-fingerprint:02",
+                         set_fingerprint(b"a comment\npy4lo-fingerprint:01",
+                                         "02"))
+
+
+if __name__ == '__main__':
+    unittest.main()
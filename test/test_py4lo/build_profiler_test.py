@@ -0,0 +1,144 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import build_profiler
+from build_profiler import BuildProfiler, NullProfiler, phase
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def setUp(self):
+        self._clock = mock.Mock(return_value=0.0)
+        self._profiler = BuildProfiler(clock=self._clock)
+
+    def test_phases(self):
+        self._clock.side_effect = [0.0, 1.0, 1.5, 2.0]
+        with self._profiler.phase("a.py", "script"):
+            with self._profiler.phase("rewrite manifest", "zip", size=10):
+                pass
+
+        self.assertEqual(
+            [("rewrite manifest", "zip", 1.0, 0.5, {"size": 10}),
+             ("a.py", "script", 0.0, 2.0, {})],
+            [(p.name, p.category, p.start, p.duration, p.args)
+             for p in self._profiler.phases])
+
+    def test_phase_exception(self):
+        self._clock.side_effect = [0.0, 1.0]
+        with self.assertRaises(ValueError):
+            with self._profiler.phase("a.py", "script"):
+                raise ValueError()
+
+        self.assertEqual(["a.py"], [p.name for p in self._profiler.phases])
+
+    @mock.patch("build_profiler.get_peak_rss")
+    def test_summary(self, get_peak_rss):
+        get_peak_rss.side_effect = [2 * 1024 * 1024, 3 * 1024 * 1024, None]
+        self._clock.side_effect = [0.0, 1.0, 1.0, 1.5, 1.5, 2.25, 4.0]
+        for name in ("a.py", "a.py", "load toml"):
+            with self._profiler.phase(name, "script"):
+                pass
+
+        self.assertEqual(
+            "category   phase                                     count"
+            "   total ms     max ms   peak MiB\n"
+            "script     a.py                                          2"
+            "     1500.0     1000.0        3.0\n"
+            "script     load toml                                     1"
+            "      750.0      750.0          -\n"
+            "Total: 4000.0 ms",
+            self._profiler.get_summary())
+
+    @mock.patch("build_profiler.get_peak_rss")
+    def test_summary_limit(self, get_peak_rss):
+        get_peak_rss.return_value = None
+        self._clock.side_effect = [0.0, 3.0, 3.0, 5.0, 5.0, 6.0, 7.0]
+        for name in ("a.py", "b.py", "c.py"):
+            with self._profiler.phase(name, "script"):
+                pass
+
+        lines = self._profiler.get_summary(2).splitlines()
+        self.assertEqual(["a.py", "b.py"],
+                         [line.split()[1] for line in lines[1:3]])
+        self.assertEqual("... 1 more phases in the trace", lines[3])
+
+    @mock.patch("build_profiler.get_peak_rss")
+    def test_trace(self, get_peak_rss):
+        get_peak_rss.return_value = 1024 * 1024
+        self._clock.side_effect = [0.0, 1.0]
+        with self._profiler.phase("a.py", "script", lines=3):
+            pass
+
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d, "trace.json")
+            self._profiler.write_trace(path)
+            trace = json.loads(path.read_text(encoding="utf-8"))
+
+        complete, counter = trace["traceEvents"]
+        self.assertEqual(("a.py", "script", "X", 0.0, 1e6, {"lines": "3"}),
+                         (complete["name"], complete["cat"], complete["ph"],
+                          complete["ts"], complete["dur"], complete["args"]))
+        self.assertEqual(("C", 1e6, {"MiB": 1.0}),
+                         (counter["ph"], counter["ts"], counter["args"]))
+
+    def test_no_cprofile(self):
+        with self._profiler.phase("a.py", "script"):
+            pass
+
+        self.assertIsNone(self._profiler.get_cprofile_summary())
+        self.assertFalse(self._profiler.write_cprofile(Path("never.prof")))
+
+    def test_cprofile(self):
+        profiler = BuildProfiler("zip")
+        with profiler.phase("a.py", "script"):
+            pass
+        with profiler.phase("zip AddAssets", "zip"):
+            with profiler.phase("rewrite manifest", "zip"):
+                sorted([3, 2, 1])
+
+        self.assertIn("sorted", profiler.get_cprofile_summary())
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d, "trace.prof")
+            self.assertTrue(profiler.write_cprofile(path))
+            self.assertTrue(path.is_file())
+
+
+class TestCurrentProfiler(unittest.TestCase):
+    def tearDown(self):
+        build_profiler.set_profiler(NullProfiler())
+
+    def test_null(self):
+        self.assertIsInstance(build_profiler.get_profiler(), NullProfiler)
+        with phase("a.py", "script"):
+            pass
+
+    def test_set(self):
+        profiler = BuildProfiler()
+        build_profiler.set_profiler(profiler)
+        with phase("a.py", "script"):
+            pass
+
+        self.assertEqual(["a.py"], [p.name for p in profiler.phases])
+
+
+if __name__ == '__main__':
+    unittest.main()
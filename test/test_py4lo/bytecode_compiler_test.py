@@ -0,0 +1,140 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import importlib.util
+import sys
+import tempfile
+import unittest
+import zipimport
+from logging import Logger
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile
+
+from bytecode_compiler import BytecodeCompiler
+from core.script import TempScript
+
+
+class TestBytecodeCompiler(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._temp_dir = Path(self._dir.name)
+        self._path = self._temp_dir.joinpath("mod.py")
+        self._path.write_bytes(b"X = 42\n")
+        self._temp_script = TempScript(self._path, b"X = 42\n",
+                                       self._temp_dir, [], None)
+        self._bytecode_dir = self._temp_dir.joinpath("bytecode")
+        self._version = "{}.{}".format(*sys.version_info[:2])
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_compile(self):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, self._version)
+
+        scripts = compiler.compile([self._temp_script], self._bytecode_dir)
+
+        self.assertEqual(1, len(scripts))
+        script = scripts[0]
+        self.assertEqual(self._bytecode_dir.joinpath("mod.pyc"),
+                         script.script_path)
+        self.assertEqual(Path("mod.pyc"), script.relative_path)
+        self.assertEqual(importlib.util.MAGIC_NUMBER,
+                         script.script_content[:4])
+        self.assertFalse(self._temp_dir.joinpath("mod.pyc").exists())
+
+    def test_compile_not_written(self):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, self._version)
+        path = self._temp_dir.joinpath("sub", "mod2.py")
+        temp_script = TempScript(path, b"Y = 1\n", self._temp_dir, [], None)
+
+        scripts = compiler.compile([temp_script], self._bytecode_dir)
+
+        self.assertFalse(path.exists())
+        self.assertEqual([Path("sub/mod2.pyc")],
+                         [s.relative_path for s in scripts])
+
+    def test_compile_source_dir_untouched(self):
+        # e.g. an embedded script: the temp script is a source file
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, self._version)
+        opt_dir = self._temp_dir.joinpath("opt")
+        opt_dir.mkdir()
+        path = opt_dir.joinpath("alib.py")
+        path.write_bytes(b"Z = 2\n")
+        temp_script = TempScript(path, b"Z = 2\n", opt_dir, [], None)
+
+        scripts = compiler.compile([temp_script], self._bytecode_dir)
+
+        self.assertEqual([path], list(opt_dir.iterdir()))
+        self.assertEqual([Path("alib.pyc")],
+                         [s.relative_path for s in scripts])
+
+    def test_zipimport_uses_bytecode(self):
+        code = self._zipimport_code(b"X = 42\n")
+        # the code was compiled in the temp dir
+        self.assertEqual(str(self._path), code.co_filename)
+
+    def test_zipimport_source_changed(self):
+        code = self._zipimport_code(b"X = 43\n")
+        # the pyc hash does not match: the code was compiled from the source
+        self.assertEqual(str(self._temp_dir.joinpath("doc.zip", "mod.py")),
+                         code.co_filename)
+
+    def _zipimport_code(self, source: bytes):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, self._version)
+        script = compiler.compile([self._temp_script], self._bytecode_dir)[0]
+
+        zip_path = self._temp_dir.joinpath("doc.zip")
+        with ZipFile(zip_path, "w") as zout:
+            zout.writestr("mod.py", source)
+            zout.writestr("mod.pyc", script.script_content)
+
+        importer = zipimport.zipimporter(str(zip_path))
+        return importer.get_code("mod")
+
+    def test_version_mismatch(self):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, "2.7")
+
+        self.assertEqual([], compiler.compile([self._temp_script],
+                                              self._bytecode_dir))
+        self.assertEqual([mock.call.warning(
+            'Bytecode version %s does not match Python %s: use sources only',
+            self._version, '2.7')], logger.mock_calls)
+
+    def test_no_exe(self):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, "/no/such/python", self._version)
+
+        self.assertEqual([], compiler.compile([self._temp_script],
+                                              self._bytecode_dir))
+        self.assertEqual([mock.call.warning("Can't compile bytecode: %s",
+                                            mock.ANY)], logger.mock_calls)
+
+    def test_no_script(self):
+        logger: Logger = mock.Mock()
+        compiler = BytecodeCompiler(logger, sys.executable, self._version)
+
+        self.assertEqual([], compiler.compile([], self._bytecode_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,12 +15,16 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import io
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 from callbacks import AddAssets
+from compression_policy import STORED, CompressionPolicy, CompressionRule
 from core.asset import DestinationAsset
 
 
@@ -34,10 +38,48 @@ class AddAssetsTest(unittest.TestCase):
 
     def test_empty2(self):
         zout: ZipFile = mock.Mock()
-        asset: DestinationAsset = mock.Mock(path=Path("asset"), content=b"")
+        asset = DestinationAsset(Path("asset"), b"")
 
         cb = AddAssets([asset])
         cb.call(zout)
 
         self.assertEqual([mock.call.writestr('asset', b'')],
                          zout.mock_calls)
+
+    def test_policy(self):
+        policy = CompressionPolicy([CompressionRule("*.png", STORED)], 9)
+        with tempfile.TemporaryDirectory() as d:
+            png_path = Path(d, "a.png")
+            png_path.write_bytes(b"not a png" * 20000)
+            bin_content = os.urandom(2048)
+            assets = [
+                DestinationAsset(Path("Assets/a.png"), source_path=png_path),
+                DestinationAsset(Path("Assets/b.txt"), b"text " * 100),
+                DestinationAsset(Path("Assets/c.bin"), bin_content),
+            ]
+
+            out = io.BytesIO()
+            with ZipFile(out, 'w', compression=ZIP_DEFLATED) as zout:
+                AddAssets(assets, policy).call(zout)
+
+        with ZipFile(out) as zin:
+            self.assertEqual(
+                [("Assets/a.png", ZIP_STORED), ("Assets/b.txt", ZIP_DEFLATED),
+                 ("Assets/c.bin", ZIP_STORED)],
+                [(i.filename, i.compress_type) for i in zin.infolist()])
+            self.assertEqual(b"not a png" * 20000,
+                             zin.read("Assets/a.png"))
+            self.assertEqual(b"text " * 100, zin.read("Assets/b.txt"))
+            self.assertEqual(bin_content, zin.read("Assets/c.bin"))
+
+    def test_policy_level(self):
+        policy = CompressionPolicy([], 1)
+        asset = DestinationAsset(Path("Assets/b.txt"), b"text " * 1000)
+        zout = mock.MagicMock()
+
+        AddAssets([asset], policy).call(zout)
+
+        zinfo = zout.open.call_args.args[0]
+        self.assertEqual(ZIP_DEFLATED, zinfo.compress_type)
+        self.assertEqual(1, getattr(zinfo, "compress_level",
+                                    getattr(zinfo, "_compresslevel", None)))
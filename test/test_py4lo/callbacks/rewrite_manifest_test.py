@@ -91,5 +91,39 @@ class TestRewriteManifest(unittest.TestCase):
             "META-INF/manifest.xml").decode("utf-8")))
 
 
+    def test_rewrite_manifest_existing_entries(self):
+        temp = io.BytesIO()
+        with zipfile.ZipFile(temp, 'w') as ztemp:
+            ztemp.writestr("META-INF/manifest.xml", """<?xml version="1.0" encoding="UTF-8"?>
+<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">
+ <manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>
+ <manifest:file-entry manifest:full-path="Basic/" manifest:media-type="application/binary"/>
+ <manifest:file-entry manifest:full-path="x.xml" manifest:media-type="text/xml"><manifest:encryption-data/></manifest:file-entry>
+</manifest:manifest>""")
+        zin = zipfile.ZipFile(temp, 'r')
+        out = io.BytesIO()
+        zout = zipfile.ZipFile(out, 'w')
+
+        RewriteManifest(
+            [DestinationScript(Path("s/t/a&b.py"), b'', Path("s"), [], None),
+             DestinationScript(Path("s/t/c.py"), b'', Path("s"), [], None)],
+            []).call(zin, zout, zin.getinfo("META-INF/manifest.xml"))
+        expected = """<?xml version="1.0" ?><manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" manifest:version="1.2">
+ <manifest:file-entry manifest:full-path="/" manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>
+ <manifest:file-entry manifest:full-path="Basic/" manifest:media-type="application/binary"/>
+ <manifest:file-entry manifest:full-path="x.xml" manifest:media-type="text/xml"><manifest:encryption-data/></manifest:file-entry>
+    <manifest:file-entry manifest:full-path="Basic/Standard/" manifest:media-type="application/binary"/>
+    <manifest:file-entry manifest:full-path="Basic/Standard/py4lo.xml" manifest:media-type="text/xml"/>
+    <manifest:file-entry manifest:full-path="Basic/Standard/script-lb.xml" manifest:media-type="text/xml"/>
+    <manifest:file-entry manifest:full-path="Basic/script-lc.xml" manifest:media-type="text/xml"/>
+    <manifest:file-entry manifest:full-path="s/" manifest:media-type="application/binary"/>
+    <manifest:file-entry manifest:full-path="s/t/" manifest:media-type="application/binary"/>
+    <manifest:file-entry manifest:full-path="s/t/a&amp;b.py" manifest:media-type=""/>
+    <manifest:file-entry manifest:full-path="s/t/c.py" manifest:media-type=""/>
+</manifest:manifest>"""
+        self.assertTrue(compare_xml_strings(expected, zout.read(
+            "META-INF/manifest.xml").decode("utf-8")))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ from logging import Logger
 from pathlib import Path
 from unittest import mock
 
+from bytecode_compiler import BytecodeCompiler
 from commands.ods_updater import OdsUpdaterHelper
 from core.asset import DestinationAsset, SourceAsset
 from core.script import DestinationScript, SourceScript, TempScript
@@ -56,12 +57,14 @@ class TestOdsUpdaterHelper(unittest.TestCase):
         sources: Sources = mock.Mock()
         destinations: Destinations = mock.Mock()
         source_scripts: list[SourceScript] = mock.Mock()
-        destination_script: DestinationScript = mock.Mock()
+        destination_script = DestinationScript(
+            Path("Scripts/python/a.py"), b"", Path("Scripts/python"), [], None)
         temp_script: TempScript = mock.Mock()
 
         # play
         sources.get_src_scripts.return_value = source_scripts
         destinations.to_destination_scripts.return_value = [destination_script]
+        destinations.dest_dir = Path("Scripts/python")
         SSPMock.return_value.process.return_value = [temp_script]
         h = OdsUpdaterHelper(logger, sources, destinations, "3.1")
         scripts = h.get_destination_scripts()
@@ -69,8 +72,39 @@ class TestOdsUpdaterHelper(unittest.TestCase):
         # verify
         self.assertEqual([mock.call.debug('Directives tree: %s', mock.ANY)],
                          logger.mock_calls)
-        self.assertEqual([destination_script], scripts)
+        self.assertEqual(destination_script, scripts[0])
+        self.assertEqual(Path("Scripts/python/py4lo_hashes.json"),
+                         scripts[1].script_path)
+        self.assertEqual(b'{"a": "e3b0c44298fc1c14"}', scripts[1].script_content)
         self.assertEqual([mock.call.get_src_scripts(), mock.call.get_module_names()],
                          sources.mock_calls)
         self.assertEqual([mock.call.to_destination_scripts([temp_script])],
                          destinations.mock_calls)
+
+    @mock.patch("commands.ods_updater.ScriptSetProcessor", autospec=True)
+    def test_destination_scripts_bytecode(self, SSPMock):
+        # mocks
+        logger: Logger = mock.Mock()
+        sources: Sources = mock.Mock()
+        destinations: Destinations = mock.Mock()
+        bytecode_compiler: BytecodeCompiler = mock.Mock()
+        temp_script: TempScript = mock.Mock()
+        pyc_script: TempScript = mock.Mock()
+
+        # play
+        SSPMock.return_value.process.return_value = [temp_script]
+        bytecode_compiler.compile.return_value = [pyc_script]
+        destinations.to_destination_scripts.return_value = []
+        destinations.dest_dir = Path("Scripts/python")
+        destinations.temp_dir = Path("temp")
+        h = OdsUpdaterHelper(logger, sources, destinations, "3.1",
+                             bytecode_compiler)
+        h.get_destination_scripts()
+
+        # verify
+        self.assertEqual(
+            [mock.call.compile([temp_script], Path("temp/__bytecode__"))],
+            bytecode_compiler.mock_calls)
+        self.assertEqual(
+            [mock.call.to_destination_scripts([temp_script, pyc_script])],
+            destinations.mock_calls)
@@ -26,6 +26,7 @@ from core.properties import PropertiesProvider
 class TestRunCommand(unittest.TestCase):
     def setUp(self):
         self.provider: PropertiesProvider = mock.Mock()
+        self.provider.get_targets.return_value = []
 
     @mock.patch("commands.run_command.secure_exe", autospec=True)
     @mock.patch("commands.test_command.secure_exe", autospec=True)
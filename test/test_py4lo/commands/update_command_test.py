@@ -20,8 +20,10 @@ from logging import Logger
 from pathlib import Path
 from unittest import mock
 
+from build_fingerprint import BuildFingerprint
+from callbacks import SetFingerprint
 from commands.ods_updater import OdsUpdaterHelper
-from commands.update_command import UpdateCommand
+from commands.update_command import MultiUpdateCommand, UpdateCommand
 from zip_updater import ZipUpdaterBuilder
 
 
@@ -48,12 +50,122 @@ class TestUpdateCommand(unittest.TestCase):
                        Path('dest.ods'), Path('source.ods'), '3.1')],
             logger.mock_calls)
         self.assertEqual(
-            [mock.call.get_destination_scripts(), mock.call.get_assets()],
+            [mock.call.get_destination_scripts(), mock.call.get_assets(),
+             mock.call.wait_temp_writes()],
             helper.mock_calls)
         self.assertEqual(
             mock.call.build().update(Path('source.ods'), Path('dest.ods')),
             zub.mock_calls[-1])
 
+    @mock.patch("commands.update_command.read_fingerprint", autospec=True)
+    @mock.patch("commands.update_command.ZipUpdaterBuilder", autospec=True)
+    def test_execute_up_to_date(self, ZubMock, read_mock):
+        logger: Logger = mock.Mock()
+        helper: OdsUpdaterHelper = mock.Mock()
+        build_fingerprint: BuildFingerprint = mock.Mock()
+        build_fingerprint.compute.return_value = "0123"
+        read_mock.return_value = "0123"
+
+        command = UpdateCommand(logger, helper, Path("source.ods"),
+                                Path("dest.ods"), "3.1", None,
+                                build_fingerprint=build_fingerprint)
+        execute = command.execute(10)
+
+        self.assertEqual((10, Path("dest.ods")), execute)
+        self.assertEqual([mock.call.info("Update. '%s' is up to date",
+                                         Path("dest.ods"))],
+                         logger.mock_calls)
+        self.assertEqual([], helper.mock_calls)
+        self.assertEqual([], ZubMock.mock_calls)
+        read_mock.assert_called_once_with(Path("dest.ods"))
+
+    @mock.patch("commands.update_command.read_fingerprint", autospec=True)
+    @mock.patch("commands.update_command.ZipUpdaterBuilder", autospec=True)
+    def test_execute_changed(self, ZubMock, read_mock):
+        logger: Logger = mock.Mock()
+        helper: OdsUpdaterHelper = mock.Mock()
+        zub: ZipUpdaterBuilder = mock.Mock()
+        ZubMock.return_value = zub
+        build_fingerprint: BuildFingerprint = mock.Mock()
+        build_fingerprint.compute.return_value = "0123"
+        read_mock.return_value = "4567"
+
+        command = UpdateCommand(logger, helper, Path("source.ods"),
+                                Path("dest.ods"), "3.1", None,
+                                build_fingerprint=build_fingerprint)
+        command.execute(10)
+
+        set_fingerprints = [c.args[0] for c in zub.after.mock_calls
+                            if isinstance(c.args[0], SetFingerprint)]
+        self.assertEqual(1, len(set_fingerprints))
+        self.assertEqual(
+            mock.call.build().update(Path('source.ods'), Path('dest.ods')),
+            zub.mock_calls[-1])
+
+    def test_multi_execute(self):
+        logger: Logger = mock.Mock()
+        update_commands = [mock.Mock(dest_ods_file=Path(f"dest-{i}.ods"))
+                           for i in range(3)]
+        zip_updaters = [mock.Mock() for _ in range(3)]
+        for update_command, zip_updater in zip(update_commands,
+                                               zip_updaters):
+            update_command.prepare.return_value = zip_updater
+
+        command = MultiUpdateCommand(logger, update_commands)
+        execute = command.execute(10)
+
+        self.assertEqual((10, Path("dest-0.ods")), execute)
+        for update_command, zip_updater in zip(update_commands,
+                                               zip_updaters):
+            self.assertEqual([mock.call.prepare(),
+                              mock.call.write(zip_updater),
+                              mock.call.wait_temp_writes()],
+                             update_command.mock_calls)
+
+    @mock.patch("commands.update_command.ZipUpdaterBuilder", autospec=True)
+    def test_execute_evict(self, ZubMock):
+        logger: Logger = mock.Mock()
+        helper: OdsUpdaterHelper = mock.Mock()
+        blob_cache = mock.Mock()
+
+        command = UpdateCommand(logger, helper, Path("source.ods"),
+                                Path("dest.ods"), "3.1", None,
+                                blob_cache=blob_cache)
+        command.execute(10)
+
+        self.assertEqual([mock.call.evict()], blob_cache.mock_calls)
+
+    def test_multi_execute_evict(self):
+        logger: Logger = mock.Mock()
+        update_commands = [mock.Mock(dest_ods_file=Path(f"dest-{i}.ods"))
+                           for i in range(3)]
+        blob_cache = mock.Mock()
+
+        MultiUpdateCommand(logger, update_commands,
+                           blob_cache=blob_cache).execute(10)
+
+        self.assertEqual([mock.call.evict()], blob_cache.mock_calls)
+
+    def test_multi_execute_wait_after_writes(self):
+        # the targets share the temp writer
+        logger: Logger = mock.Mock()
+        parent = mock.Mock()
+        update_commands = [getattr(parent, f"command{i}") for i in range(3)]
+
+        MultiUpdateCommand(logger, update_commands).execute(10)
+
+        names = [c[0].split(".")[1] for c in parent.mock_calls
+                 if c[0].endswith((".write", ".wait_temp_writes"))]
+        self.assertEqual(["write"] * 3 + ["wait_temp_writes"] * 3, names)
+
+    def test_multi_execute_error(self):
+        logger: Logger = mock.Mock()
+        update_commands = [mock.Mock(), mock.Mock()]
+        update_commands[1].write.side_effect = OSError("disk full")
+
+        with self.assertRaises(OSError):
+            MultiUpdateCommand(logger, update_commands).execute(0)
+
     # @patch('zip_updater.ZipUpdaterBuilder', autospec=True)
     # def test_helper(self, ZupdaterB):
     #     logger: Logger = Mock()
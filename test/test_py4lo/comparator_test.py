@@ -60,3 +60,7 @@ class TestComparator(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+    def test_check_var_with_underscore(self):
+        c = Comparator({"python_version": "3.7"})
+        self.assertTrue(c.check("$python_version", ">=", "3.0"))
@@ -0,0 +1,87 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import unittest
+from logging import Logger
+from unittest import mock
+from zipfile import ZIP_DEFLATED, ZIP_STORED
+
+from compression_policy import (
+    STORED,
+    Compression,
+    CompressionPolicy,
+    CompressionRule,
+    create_compression_policy,
+    entropy,
+)
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def test_entropy(self):
+        self.assertEqual(0.0, entropy(b"aaaa"))
+        self.assertEqual(1.0, entropy(b"abab"))
+        self.assertEqual(8.0, entropy(bytes(range(256))))
+
+    def test_rule(self):
+        policy = CompressionPolicy(
+            [CompressionRule("*.png", STORED)], 6)
+
+        self.assertEqual(STORED, policy.get_compression("Assets/a.PNG", b""))
+        self.assertEqual(Compression(ZIP_DEFLATED, 6),
+                         policy.get_compression("Assets/a.txt", b"text"))
+
+    def test_last_rule_wins(self):
+        policy = CompressionPolicy([
+            CompressionRule("*.pdf", STORED),
+            CompressionRule("*.pdf", Compression(ZIP_DEFLATED, 9)),
+        ])
+
+        self.assertEqual(Compression(ZIP_DEFLATED, 9),
+                         policy.get_compression("a.pdf", b""))
+
+    def test_entropy_probe(self):
+        policy = CompressionPolicy([])
+
+        self.assertEqual(STORED,
+                         policy.get_compression("a.bin", os.urandom(1024)))
+        self.assertEqual(Compression(ZIP_DEFLATED),
+                         policy.get_compression("a.bin", b"a" * 1024))
+
+    def test_create(self):
+        logger: Logger = mock.Mock()
+        policy = create_compression_policy(logger, {
+            "level": 3, "entropy_threshold": 9.0,
+            "rules": {"*.png": "stored", "*.csv": 9, "*.pdf": "deflated",
+                      "*.foo": "bar"}})
+
+        self.assertEqual(Compression(ZIP_STORED),
+                         policy.get_compression("a.png", b""))
+        self.assertEqual(Compression(ZIP_DEFLATED, 9),
+                         policy.get_compression("a.csv", b""))
+        self.assertEqual(Compression(ZIP_DEFLATED, 3),
+                         policy.get_compression("a.pdf", b""))
+        self.assertEqual(Compression(ZIP_DEFLATED, 3),
+                         policy.get_compression("a.bin", os.urandom(1024)))
+        self.assertEqual([
+            mock.call.warning("Unknown compression `%s` for `%s`: ignored",
+                              "bar", "*.foo")
+        ], logger.mock_calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import unittest
+from pathlib import Path
+
+from core.asset import ASSETS_INDEX_NAME, DestinationAsset, deduplicate_assets
+
+
+class TestAsset(unittest.TestCase):
+    def test_content_hash(self):
+        asset = DestinationAsset(Path("a"), b"")
+        self.assertEqual(
+            "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+            asset.get_content_hash())
+
+    def test_deduplicate(self):
+        a = DestinationAsset(Path("Assets/a/logo.png"), b"logo")
+        b = DestinationAsset(Path("Assets/b.csv"), b"csv")
+        c = DestinationAsset(Path("Assets/c/logo.png"), b"logo")
+
+        assets = deduplicate_assets([a, b, c])
+
+        self.assertEqual([a, b], assets[:2])
+        self.assertEqual(Path(ASSETS_INDEX_NAME), assets[2].path)
+        self.assertEqual({"Assets/c/logo.png": "Assets/a/logo.png"},
+                         json.loads(assets[2].content))
+
+    def test_deduplicate_no_duplicate(self):
+        a = DestinationAsset(Path("Assets/a"), b"a")
+        b = DestinationAsset(Path("Assets/b"), b"b")
+
+        self.assertEqual([a, b], deduplicate_assets([a, b]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core.project_index import GlobMatcher, ProjectIndex
+
+
+class TestGlobMatcher(unittest.TestCase):
+    def test_rglob_semantics(self):
+        matcher = GlobMatcher(["*.py"])
+        self.assertTrue(matcher.matches("a.py"))
+        self.assertTrue(matcher.matches("dir/a.py"))
+        self.assertFalse(matcher.matches("a.pyc"))
+
+    def test_dir_pattern(self):
+        matcher = GlobMatcher(["dir/*.py"])
+        self.assertTrue(matcher.matches("dir/a.py"))
+        self.assertTrue(matcher.matches("x/dir/a.py"))
+        self.assertFalse(matcher.matches("dir/sub/a.py"))
+        self.assertFalse(matcher.matches("xdir/a.py"))
+
+    def test_double_star(self):
+        matcher = GlobMatcher(["dir/**/a.py"])
+        self.assertTrue(matcher.matches("dir/a.py"))
+        self.assertTrue(matcher.matches("dir/sub/sub/a.py"))
+
+    def test_several_patterns(self):
+        matcher = GlobMatcher(["node_modules", "*.tmp", "a?[0-9].txt"])
+        self.assertTrue(matcher.matches("node_modules"))
+        self.assertTrue(matcher.matches("x/y.tmp"))
+        self.assertTrue(matcher.matches("ab1.txt"))
+        self.assertFalse(matcher.matches("ab.txt"))
+
+    def test_no_pattern(self):
+        self.assertFalse(GlobMatcher([]).matches("a"))
+
+
+class TestProjectIndex(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._root = Path(self._dir.name)
+        for name in ["a.py", "b.txt", "pkg/__init__.py", "pkg/c.py",
+                     "node_modules/x/d.py", "__pycache__/a.cpython-311.pyc"]:
+            path = self._root.joinpath(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_get_paths(self):
+        index = ProjectIndex()
+        self.assertEqual(
+            {self._root / "a.py", self._root / "pkg/__init__.py",
+             self._root / "pkg/c.py"},
+            index.get_paths(self._root, ["node_modules"], "*.py"))
+        self.assertEqual(
+            {self._root / "b.txt"},
+            index.get_paths(self._root, ["*.py", "node_modules", "*.pyc"]))
+
+    def test_get_module_names(self):
+        index = ProjectIndex()
+        self.assertEqual(
+            {"a", "pkg", "pkg.c"},
+            index.get_module_names(self._root, ["node_modules"], "*.py"))
+
+    def test_records(self):
+        records = ProjectIndex().get_records(self._root, ["node_modules"])
+        self.assertEqual(["__pycache__/a.cpython-311.pyc", "a.py", "b.txt",
+                          "pkg/__init__.py", "pkg/c.py"],
+                         [r.relative_path for r in records])
+        self.assertEqual(1, records[1].size)
+        self.assertEqual(os.stat(self._root / "a.py").st_mtime_ns,
+                         records[1].mtime_ns)
+
+    def test_scan_once(self):
+        index = ProjectIndex()
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            index.get_paths(self._root, ["node_modules"], "*.py")
+            index.get_module_names(self._root, ["node_modules"])
+            index.get_paths(self._root, ["node_modules"])
+        # root, __pycache__, pkg: node_modules is not explored
+        self.assertEqual(3, len(scandir.mock_calls))
+
+        index.invalidate()
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            index.get_paths(self._root, ["node_modules"])
+        self.assertEqual(3, len(scandir.mock_calls))
+
+    def test_missing_root(self):
+        self.assertEqual(set(),
+                         ProjectIndex().get_paths(self._root / "missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,13 +17,17 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import io
 import logging
+import sys
 import unittest
 from pathlib import Path
 from unittest import mock
 from zipfile import ZipFile
 
+from bytecode_compiler import BytecodeCompiler
+from compression_policy import STORED
 from core.properties import PropertiesProvider, PropertiesProviderFactory
-from core.source_dest import _get_paths
+from core.source_dest import Destinations, Sources
+from temp_writer import AsyncTempWriter, SyncTempWriter
 
 
 class TestProperties(unittest.TestCase):
@@ -79,20 +83,103 @@ class TestProperties(unittest.TestCase):
                               'Basic/Standard/script-lb.xml',
                               'Basic/Standard/py4lo.xml'], zin.namelist())
 
-    def test_get_paths(self):
-        source_dir: Path = mock.Mock()
-        path_a: Path = mock.Mock()
-        path_b: Path = mock.Mock()
+    def test_bytecode_compiler(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'python_exe': sys.executable, 'python_version': '3.1',
+             'dest': {'compile_bytecode': True}})
+        compiler = provider.get_bytecode_compiler()
+        self.assertIsInstance(compiler, BytecodeCompiler)
 
-        source_dir.rglob.side_effect = [[path_a, path_b, Path("./oTextRange")],
-                                        [Path("oTextRange")]]
-        path_a.is_file.return_value = True
-        path_b.is_file.return_value = False
+    def test_no_bytecode_compiler(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'python_exe': sys.executable, 'dest': {}})
+        self.assertIsNone(provider.get_bytecode_compiler())
 
-        self.assertEqual({path_a},
-                         _get_paths(source_dir, ["oTextRange"], "*"))
-        self.assertEqual([mock.call.rglob('*'), mock.call.rglob('oTextRange')],
-                         source_dir.mock_calls)
+    def test_minify_dirs(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'src': {'minify_dirs': ['lib', 'opt']}})
+        self.assertEqual([Path("lib"), Path("opt")],
+                         provider.get_minify_dirs())
+
+    def test_temp_writer(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'temp_writes': 'async'}})
+        self.assertIsInstance(provider.get_temp_writer(), AsyncTempWriter)
+
+    def test_compression_policy(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'compression': {'rules': {'*.png': 'stored'}}}})
+        policy = provider.get_compression_policy()
+        self.assertEqual(STORED, policy.get_compression("a.png", b""))
+
+    def test_blob_cache(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'assets_cache_dir': 'cache'}})
+        self.assertIsNotNone(provider.get_blob_cache())
+
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'assets_cache_dir': 'cache', 'assets_cache_max_mb': 2,
+                      'assets_cache_max_days': 1}})
+        with mock.patch("core.properties.BlobCache") as BlobCacheMock:
+            provider.get_blob_cache()
+        BlobCacheMock.assert_called_once_with(
+            logger, Path("cache"), 2 * 1024 * 1024, 24 * 60 * 60)
+
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'assets_cache_dir': ''}})
+        self.assertIsNone(provider.get_blob_cache())
+
+    def test_default_temp_writer(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(), {})
+        self.assertIsInstance(provider.get_temp_writer(), SyncTempWriter)
+
+    def test_build_fingerprint(self):
+        logger: logging.Logger = mock.Mock()
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'skip_unchanged': True}})
+        self.assertIsNotNone(provider.get_build_fingerprint(mock.Mock()))
+
+        provider = PropertiesProvider(
+            logger, Path("base"), mock.Mock(), mock.Mock(),
+            {'dest': {'skip_unchanged': False}})
+        self.assertIsNone(provider.get_build_fingerprint(mock.Mock()))
+
+    def test_targets(self):
+        logger: logging.Logger = mock.Mock()
+        sources = Sources(Path("s.ods"), Path("inc"), Path("lib"),
+                          Path("src"), [], Path("opt"), Path("asset"), [],
+                          Path("test"))
+        destinations = Destinations(Path("s-py4lo.ods"), Path("temp"),
+                                    Path("dest"), Path("Assets"))
+        provider = PropertiesProvider(
+            logger, Path("base"), sources, destinations,
+            {'targets': [{'name': 'pro', 'variables': {'edition': 'pro'}},
+                         {'name': 'free'}]})
+
+        targets = provider.get_targets()
+
+        self.assertEqual(["pro", "free"], [t.name for t in targets])
+        self.assertEqual([Path("s-py4lo-pro.ods"), Path("s-py4lo-free.ods")],
+                         [t.destinations.dest_ods_file for t in targets])
+        self.assertEqual([], PropertiesProvider(
+            logger, Path("base"), sources, destinations, {}).get_targets())
 
 
 if __name__ == '__main__':
@@ -22,6 +22,7 @@ from pathlib import Path
 from unittest import mock
 
 from core.asset import DestinationAsset, SourceAsset
+from core.project_index import ProjectIndex
 from core.script import DestinationScript, SourceScript, TempScript
 from core.source_dest import Destinations, Sources
 
@@ -30,37 +31,49 @@ from test.test_helper import file_path_mock
 
 class TestSourcesDests(unittest.TestCase):
     def setUp(self):
+        self._index: ProjectIndex = mock.Mock()
         self._sources = Sources(Path("ods_file"), Path("inc"), Path("lib"),
                                 Path("src"), [], Path("opt"), Path("asset"), [],
-                                Path("test"))
+                                Path("test"), self._index)
         self._destinations = Destinations(Path("ods_file"), Path("temp"),
                                           Path("dest"), mock.Mock())
 
-    @mock.patch("core.source_dest._get_paths", autospec=True)
-    def test_sources_src(self, gp_mock):
-        gp_mock.return_value = [Path("a")]
+    def test_sources_src(self):
+        self._index.get_paths.return_value = {Path("a")}
 
-        self.assertEqual([Path("a")], self._sources.get_src_paths())
-        self.assertEqual([mock.call(Path('src'), [], '*.py')], gp_mock.mock_calls)
+        self.assertEqual({Path("a")}, self._sources.get_src_paths())
+        self.assertEqual([mock.call.get_paths(Path('src'), [], '*.py')],
+                         self._index.mock_calls)
 
-    @mock.patch("core.source_dest._get_paths", autospec=True)
-    def test_sources_assets(self, gp_mock):
-        gp_mock.return_value = [Path("b")]
+    def test_sources_assets(self):
+        self._index.get_paths.return_value = {Path("b")}
 
         self.assertEqual(
             [SourceAsset(path=Path('b'), assets_dir=Path('asset'))],
             self._sources.get_assets())
-        self.assertEqual([mock.call(Path('asset'), [])], gp_mock.mock_calls)
+        self.assertEqual([mock.call.get_paths(Path('asset'), [])],
+                         self._index.mock_calls)
 
-    @mock.patch("core.source_dest._get_paths", autospec=True)
-    def test_sources_scripts(self, gp_mock):
-        gp_mock.return_value = [Path("oTextRange")]
+    def test_sources_scripts(self):
+        self._index.get_paths.return_value = {Path("oTextRange")}
 
         self.assertEqual(
             [SourceScript(script_path=Path('oTextRange'), source_dir=Path('src'),
                           export_funcs=True)],
             self._sources.get_src_scripts())
-        self.assertEqual([mock.call(Path('src'), [], '*.py')], gp_mock.mock_calls)
+        self.assertEqual([mock.call.get_paths(Path('src'), [], '*.py')],
+                         self._index.mock_calls)
+
+    def test_sources_all_module_names(self):
+        self._index.get_module_names.side_effect = [{"a"}, {"b"}, {"c"}]
+
+        self.assertEqual({"a", "b", "c"},
+                         self._sources.get_all_module_names())
+        self.assertEqual([
+            mock.call.get_module_names(Path('src'), [], '*.py'),
+            mock.call.get_module_names(Path('lib'), []),
+            mock.call.get_module_names(Path('opt'), []),
+        ], self._index.mock_calls)
 
     def test_destinations_scripts(self):
         dscript = DestinationScript(Path('dest/scr'), b'abc', Path('dest'),
@@ -77,10 +90,13 @@ class TestSourcesDests(unittest.TestCase):
         self._destinations.assets_dest_dir.joinpath.return_value = Path(
             "dest_s")
 
+        dest_assets = self._destinations.to_destination_assets(
+            [SourceAsset(path, assets_dir)])
         self.assertEqual(
-            [DestinationAsset(path=Path('dest_s'), content=b'asset content')],
-            self._destinations.to_destination_assets(
-                [SourceAsset(path, assets_dir)]))
+            [DestinationAsset(path=Path('dest_s'), source_path=path)],
+            dest_assets)
+        with dest_assets[0].open() as f:
+            self.assertEqual(b'asset content', f.read())
 
 
 if __name__ == '__main__':
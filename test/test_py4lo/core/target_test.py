@@ -0,0 +1,67 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core.project_index import ProjectIndex
+from core.source_dest import Destinations, Sources
+from core.target import create_target
+
+
+class TestTarget(unittest.TestCase):
+    def setUp(self):
+        self._index: ProjectIndex = mock.Mock()
+        self._sources = Sources(Path("s.ods"), Path("inc"), Path("lib"),
+                                Path("src"), [], Path("opt"), Path("asset"),
+                                [], Path("test"), self._index)
+        self._destinations = Destinations(Path("s-py4lo.ods"), Path("temp"),
+                                          Path("dest"), Path("Assets"))
+
+    def test_default(self):
+        target = create_target(self._sources, self._destinations, 1, {})
+
+        self.assertEqual("target1", target.name)
+        self.assertEqual(Path("s.ods"), target.sources.source_ods_file)
+        self.assertEqual(Path("src"), target.sources.src_dir)
+        self.assertIs(self._index, target.sources.index)
+        self.assertEqual(Path("s-py4lo-target1.ods"),
+                         target.destinations.dest_ods_file)
+        self.assertEqual(Path("temp", "target1"),
+                         target.destinations.temp_dir)
+        self.assertEqual({}, target.variables)
+
+    def test_config(self):
+        target = create_target(self._sources, self._destinations, 0, {
+            "name": "pro", "source_ods_file": "pro.ods",
+            "dest_ods_file": "pro-py4lo.ods", "src_dir": "src/pro",
+            "variables": {"edition": "pro"}})
+
+        self.assertEqual("pro", target.name)
+        self.assertEqual(Path("pro.ods"), target.sources.source_ods_file)
+        self.assertEqual(Path("src/pro"), target.sources.src_dir)
+        self.assertEqual(Path("pro-py4lo.ods"),
+                         target.destinations.dest_ods_file)
+        self.assertEqual(Path("temp", "pro"), target.destinations.temp_dir)
+        self.assertEqual({"edition": "pro"}, target.variables)
+        # the project is unchanged
+        self.assertEqual(Path("s.ods"), self._sources.source_ods_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
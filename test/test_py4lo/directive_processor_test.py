@@ -21,7 +21,11 @@ from unittest import mock
 
 from branch_processor import BranchProcessor
 from core.script import SourceScript
-from directive_processor import DirectiveProcessor
+from directive_processor import (
+    BranchTester,
+    DirectiveProcessor,
+    ScriptOutput,
+)
 from directives import DirectiveProvider
 from script_set_processor import ScriptProcessor
 
@@ -54,8 +58,9 @@ class TestDirectiveProcessor(unittest.TestCase):
     def test_process_line_comment(self):
         self._branch_processor.skip.return_value = True
 
-        line = self._dp.process_line("ok")
-        self.assertEqual(["### ok"], line)
+        output = ScriptOutput()
+        self._dp.process_line("ok", output)
+        self.assertEqual(["### ok"], output.lines)
 
         self.assertEqual([], self._scripts_path.mock_calls)
         self.assertEqual([], self._scripts_processor.mock_calls)
@@ -65,8 +70,9 @@ class TestDirectiveProcessor(unittest.TestCase):
     def test_process_line_write(self):
         self._branch_processor.skip.return_value = False
 
-        line = self._dp.process_line("ok")
-        self.assertEqual(["ok"], line)
+        output = ScriptOutput()
+        self._dp.process_line("ok", output)
+        self.assertEqual(["ok"], output.lines)
 
         self.assertEqual([], self._scripts_path.mock_calls)
         self.assertEqual([], self._scripts_processor.mock_calls)
@@ -76,8 +82,9 @@ class TestDirectiveProcessor(unittest.TestCase):
     def test_process_line_directive(self):
         self._branch_processor.skip.return_value = True
 
-        line = self._dp.process_line("# py4lo: ok")
-        self.assertEqual([], line)
+        output = ScriptOutput()
+        self._dp.process_line("# py4lo: ok", output)
+        self.assertEqual([], output.lines)
 
         self.assertEqual([], self._scripts_path.mock_calls)
         self.assertEqual([], self._scripts_processor.mock_calls)
@@ -89,8 +96,9 @@ class TestDirectiveProcessor(unittest.TestCase):
         self._branch_processor.skip.return_value = False
         self._branch_processor.handle_directive.return_value = True
 
-        line = self._dp.process_line("# py4lo: ok")
-        self.assertEqual([], line)
+        output = ScriptOutput()
+        self._dp.process_line("# py4lo: ok", output)
+        self.assertEqual([], output.lines)
 
         self.assertEqual([], self._scripts_path.mock_calls)
         self.assertEqual([], self._scripts_processor.mock_calls)
@@ -104,8 +112,9 @@ class TestDirectiveProcessor(unittest.TestCase):
         directive = mock.Mock()
         self._directive_provider.get.return_value = (directive, [""])
 
-        line = self._dp.process_line("# py4lo: ok")
-        self.assertEqual([], line)
+        output = ScriptOutput()
+        self._dp.process_line("# py4lo: ok", output)
+        self.assertEqual([], output.lines)
 
         self.assertEqual([], self._scripts_path.mock_calls)
         self.assertEqual([], self._scripts_processor.mock_calls)
@@ -114,9 +123,29 @@ class TestDirectiveProcessor(unittest.TestCase):
             self._branch_processor.mock_calls)
         self.assertEqual([mock.call.get(["ok"])],
                          self._directive_provider.mock_calls)
-        self.assertEqual([mock.call.execute(self._dp, mock.ANY, [""])],
+        self.assertEqual([mock.call.execute(self._dp, output, [""])],
                          directive.mock_calls)
 
+    def test_process_line_no_py4lo(self):
+        self._branch_processor.skip.return_value = False
+
+        output = ScriptOutput()
+        self._dp.process_line("# a comment: py 4 lo", output)
+        self.assertEqual(["# a comment: py 4 lo"], output.lines)
+
+        self.assertEqual([mock.call.skip()], self._branch_processor.mock_calls)
+        self.assertEqual([], self._directive_provider.mock_calls)
+
+    def test_process_line_wrong_quotes(self):
+        self._branch_processor.skip.return_value = False
+
+        output = ScriptOutput()
+        self._dp.process_line("# py4lo: include \"a", output)
+        self.assertEqual(["# py4lo: include \"a"], output.lines)
+
+        self.assertEqual([mock.call.skip()], self._branch_processor.mock_calls)
+        self.assertEqual([], self._directive_provider.mock_calls)
+
     # def test_include(self):
     #     lines = self._dp.include("py4lo_import.py")
     #     self.assertEqual([
@@ -137,3 +166,29 @@ class TestDirectiveProcessor(unittest.TestCase):
     #     self.assertEqual([], self._scripts_processor.mock_calls)
     #     self.assertEqual([], self._branch_processor.mock_calls)
     #     self.assertEqual([], self._directive_provider.mock_calls)
+
+
+class TestScriptOutput(unittest.TestCase):
+    def test_line_numbers(self):
+        output = ScriptOutput()
+        output.write_line("# header", 0)
+        output.write_line("x = 1", 1)
+        output.source_line_number = 2
+        output.append("# begin include\ny = 2\n# end include")
+        output.append("z = 3")
+
+        self.assertEqual(
+            "# header\nx = 1\n# begin include\ny = 2\n# end include\nz = 3",
+            output.get_text())
+        self.assertEqual([0, 1, 2, 2, 2, 2], output.line_numbers)
+
+
+class TestBranchTester(unittest.TestCase):
+    def test_used_variables(self):
+        tester = BranchTester({"python_version": "3.7", "edition": "pro",
+                               "lang": "fr"})
+
+        self.assertTrue(tester(["$edition", "==", "pro"]))
+        self.assertFalse(tester(["3.0", ">=", "$python_version"]))
+        self.assertEqual({"edition": "pro", "python_version": "3.7"},
+                         tester.get_used_variables())
@@ -0,0 +1,95 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import ast
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from directives import EmbedData
+
+
+class TestEmbedData(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._opt = Path(self._tmp.name, "opt")
+        self._opt.mkdir()
+        self._temp = Path(self._tmp.name, "temp")
+        self._directive = EmbedData(self._opt, self._temp)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _execute(self, args: list[str]) -> dict:
+        proc = mock.Mock()
+        self.assertTrue(self._directive.execute(proc, None, args))
+        [call] = proc.mock_calls
+        self.assertEqual("add_script", call[0])
+        temp_script = call.args[0]
+        self.assertEqual(self._temp.joinpath(f"{args[0]}.py"),
+                         temp_script.script_path)
+        self.assertEqual(Path(f"{args[0]}.py"), temp_script.relative_path)
+        tree = ast.parse(temp_script.script_content)
+        [value] = [stmt.value for stmt in tree.body
+                   if isinstance(stmt, ast.Assign)
+                   and [t.id for t in stmt.targets
+                        if isinstance(t, ast.Name)] == ["DATA"]]
+        return ast.literal_eval(value)
+
+    def test_sig_elements(self):
+        self.assertEqual(["embed", "data"], self._directive.sig_elements())
+
+    def test_json(self):
+        self._opt.joinpath("t.json").write_text(
+            '{"a": [1, 2.5, true, null], "b": "\\u00e9"}', encoding="utf-8")
+        self.assertEqual({"a": [1, 2.5, True, None], "b": "é"},
+                         self._execute(["table", "t.json"]))
+
+    def test_json_nan(self):
+        self._opt.joinpath("t.json").write_text('[NaN]')
+        with self.assertRaises(ValueError):
+            self._execute(["table", "t.json"])
+
+    def test_csv(self):
+        self._opt.joinpath("t.csv").write_text(
+            "\ufeffcode,label\n1,\"a, b\"\n2,c\n", encoding="utf-8")
+        self.assertEqual([{"code": "1", "label": "a, b"},
+                          {"code": "2", "label": "c"}],
+                         self._execute(["table", "t.csv"]))
+
+    def test_columns(self):
+        self._opt.joinpath("t.txt").write_text(
+            "code,label\n1,a\n2,b\n", encoding="utf-8")
+        self.assertEqual({"code": ("1", "2"), "label": ("a", "b")},
+                         self._execute(["table", "t.txt", "columns"]))
+
+    def test_columns_empty(self):
+        self._opt.joinpath("t.csv").write_text("code,label\n")
+        self.assertEqual({"code": (), "label": ()},
+                         self._execute(["table", "t.csv", "columns"]))
+
+    def test_wrong_args(self):
+        self._opt.joinpath("t.csv").write_text("a\n")
+        for args in (["table"], ["my-table", "t.csv"],
+                     ["table", "t.csv", "xml"], ["table", "t.xml"]):
+            with self.assertRaises(ValueError):
+                self._directive.execute(mock.Mock(), None, args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile
+
+from directives.entry import RELOAD_MODULES_FORMAT, Entry
+
+
+class TestEntry(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._doc_path = Path(self._dir.name, "doc.ods")
+        self._uno = mock.Mock(fileUrlToSystemPath=lambda url: url)
+        self._xsc = mock.Mock()
+        self._xsc.getDocument.return_value.URL = str(self._doc_path)
+        self._code = RELOAD_MODULES_FORMAT.format(
+            hashes_path="Scripts/python/py4lo_hashes.json",
+            module_names=["py4lo_test_a", "py4lo_test_b"])
+        sys.modules.pop("_py4lo_registry", None)
+
+    def tearDown(self):
+        for name in ("_py4lo_registry", "py4lo_test_a", "py4lo_test_b"):
+            sys.modules.pop(name, None)
+        self._dir.cleanup()
+
+    def test_execute(self):
+        processor = mock.Mock()
+        line_processor = mock.Mock()
+        inc_dir = Path(__file__).parent.parent.parent.parent.joinpath("inc")
+
+        Entry(inc_dir, {"a"}).execute(processor, line_processor, [])
+
+        self.assertEqual(2, len(line_processor.append.mock_calls))
+        code = line_processor.append.mock_calls[1].args[0]
+        self.assertIn('"Scripts/python/py4lo_hashes.json"', code)
+        self.assertIn("_py4lo_reload_modules(['a', ", code)
+        compile(code, "<entry>", "exec")
+
+    def _write_doc(self, hashes):
+        with ZipFile(self._doc_path, "w") as zout:
+            zout.writestr("Scripts/python/py4lo_hashes.json",
+                          json.dumps(hashes))
+
+    def _run_entry(self, a=mock.sentinel.a):
+        sys.modules["py4lo_test_a"] = a
+        sys.modules["py4lo_test_b"] = mock.sentinel.b
+        # don't use mock.patch.dict: sys.modules would be restored
+        previous_uno = sys.modules.get("uno")
+        sys.modules["uno"] = self._uno
+        try:
+            exec(self._code,  # noqa: S102 # nosec: B102
+                 {"XSCRIPTCONTEXT": self._xsc})
+        finally:
+            if previous_uno is None:
+                del sys.modules["uno"]
+            else:
+                sys.modules["uno"] = previous_uno
+        return {name for name in ("py4lo_test_a", "py4lo_test_b")
+                if name in sys.modules}
+
+    def test_first_run(self):
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        self.assertEqual(set(), self._run_entry())
+
+    def test_unchanged_document(self):
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        self._run_entry()
+        self.assertEqual({"py4lo_test_a", "py4lo_test_b"}, self._run_entry())
+
+    def test_one_module_changed(self):
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        self._run_entry()
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "3",
+                         "py4lo_test_c": "4"})
+        self.assertEqual(set(), self._run_entry())
+
+    def test_dependency_changed(self):
+        # py4lo_test_a is unchanged, but it imports py4lo_test_b: its
+        # reference to py4lo_test_b would be stale
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        self._run_entry()
+        a = types.ModuleType("py4lo_test_a")
+        a.py4lo_test_b = mock.sentinel.b
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "3"})
+
+        self.assertEqual(set(), self._run_entry(a=a))
+
+    def test_document_saved_scripts_unchanged(self):
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        self._run_entry()
+        self._write_doc({"py4lo_test_a": "1", "py4lo_test_b": "2"})
+        os.utime(self._doc_path, ns=(0, 0))
+        self.assertEqual({"py4lo_test_a", "py4lo_test_b"}, self._run_entry())
+
+    def test_no_hashes(self):
+        with ZipFile(self._doc_path, "w") as zout:
+            zout.writestr("content.xml", "")
+        self.assertEqual(set(), self._run_entry())
+        self.assertEqual(set(), self._run_entry())
+
+
+if __name__ == '__main__':
+    unittest.main()
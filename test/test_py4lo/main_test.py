@@ -16,9 +16,13 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+import tempfile
 import unittest
+from pathlib import Path
 from unittest import mock
 
+import build_profiler
 import main
 
 
@@ -31,6 +35,49 @@ class MainTest(unittest.TestCase):
         args = main.get_args(["run", "notest"])
         self.assertEqual("run", args.command)
         self.assertEqual(["notest"], args.parameters)
+        self.assertFalse(args.profile)
+
+    def test_args_profile(self):
+        args = main.get_args(["--profile", "--profile-phase", "zip",
+                              "update"])
+        self.assertTrue(args.profile)
+        self.assertEqual("py4lo-trace.json", args.profile_output)
+        self.assertEqual("zip", args.profile_phase)
+        self.assertEqual("update", args.command)
+
+    def test_args_profile_command(self):
+        # the flag does not consume the command
+        args = main.get_args(["--profile", "update"])
+        self.assertTrue(args.profile)
+        self.assertEqual("update", args.command)
+
+    def test_args_profile_output(self):
+        args = main.get_args(["--profile", "--profile-output", "t.json",
+                              "update"])
+        self.assertEqual("t.json", args.profile_output)
+        self.assertEqual("update", args.command)
+
+    @mock.patch("main.commands")
+    def test_profile(self, commands):
+        def execute():
+            with build_profiler.phase("a.py", "script"):
+                pass
+
+        factory = mock.MagicMock()
+        commands.get.return_value.execute.side_effect = execute
+        with tempfile.TemporaryDirectory() as d:
+            trace_path = Path(d, "trace.json")
+            main.main(factory, ["--profile", "--profile-output",
+                                str(trace_path), "update"])
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        self.assertIsInstance(build_profiler.get_profiler(),
+                              build_profiler.NullProfiler)
+        self.assertEqual(["a.py"], [e["name"] for e in trace["traceEvents"]
+                                    if e["ph"] == "X"])
+        logger = factory.create.return_value.get_logger.return_value
+        self.assertEqual("Build profile:\n%s",
+                         logger.warning.mock_calls[0].args[0])
 
 if __name__ == '__main__':
     unittest.main()
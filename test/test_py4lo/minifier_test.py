@@ -0,0 +1,110 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+
+from minifier import Minifier
+
+SCRIPT = '''# a comment
+"""The module docstring"""
+from typing import TYPE_CHECKING, Any, cast, List
+import logging  # the logger
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+
+class A:
+    """The class docstring"""
+    x: int = 0
+
+    def f(self, a: int, *args: Any, b: "Sequence[int]" = (),
+          **kwargs: Any) -> List[int]:
+        """The method docstring"""
+        s = """a
+
+multiline string"""
+        return cast(list, [a])  # comment
+
+
+def g() -> None:
+    """Only a docstring"""
+'''
+
+
+class TestMinifier(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def test_minify(self):
+        minified = Minifier().minify(SCRIPT)
+        self.assertEqual(
+            "from typing import cast\n"
+            "import logging\n"
+            "class A:\n"
+            "    x: int = 0\n"
+            "    def f(self, a, *args, b = (),\n"
+            "          **kwargs):\n"
+            "        s = \"\"\"a\n"
+            "\n"
+            "multiline string\"\"\"\n"
+            "        return cast(list, [a])\n"
+            "def g():\n"
+            "    pass\n", minified.text)
+        self.assertEqual([3, 4, 10, 12, 14, 15, 17, 18, 19, 20, 23, 24],
+                         minified.line_map)
+
+    def test_minify_is_valid(self):
+        minified = Minifier().minify(SCRIPT)
+        namespace = {}
+        exec(minified.text, namespace)  # noqa: S102 # nosec: B102
+        self.assertEqual([1], namespace["A"]().f(1))
+
+    def test_syntax_error(self):
+        minified = Minifier().minify("def f(:\n    pass\n")
+        self.assertEqual("def f(:\n    pass\n", minified.text)
+        self.assertEqual([1, 2, 3], minified.line_map)
+
+    def test_type_checking_only(self):
+        minified = Minifier().minify(
+            "import typing\n"
+            "try:\n"
+            "    if typing.TYPE_CHECKING:\n"
+            "        import os\n"
+            "except ImportError:\n"
+            "    pass\n")
+        self.assertEqual(
+            "import typing\ntry:\n    pass\nexcept ImportError:\n    pass\n",
+            minified.text)
+
+    def test_blank_line_in_fstring(self):
+        # Python 3.12+ splits the f-strings in several tokens
+        script = ("y = 1\n"
+                  "s = f\"\"\"a {y}\n"
+                  "\n"
+                  "b {f\'\'\'c\n"
+                  "\n"
+                  "d\'\'\'}\"\"\"\n")
+        minified = Minifier().minify(script)
+        self.assertEqual(script, minified.text)
+        namespace = {}
+        exec(minified.text, namespace)  # noqa: S102 # nosec: B102
+        self.assertEqual("a 1\n\nb c\n\nd", namespace["s"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import py_compile
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from zipfile import ZipFile
+
+INC_PATH = Path(__file__).parent.parent.parent.joinpath(
+    "inc", "py4lo_import.py")
+
+
+class TestPy4LOImport(unittest.TestCase):
+    """The document finder installed by inc/py4lo_import.py"""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._doc_path = Path(self._dir.name, "doc.ods")
+        self._meta_path = list(sys.meta_path)
+        self._sys_path = list(sys.path)
+        self._module_names = ["py4lo_doc_a", "py4lo_doc_pkg",
+                              "py4lo_doc_pkg.sub"]
+
+    def tearDown(self):
+        sys.meta_path[:] = self._meta_path
+        sys.path[:] = self._sys_path
+        for name in self._module_names:
+            sys.modules.pop(name, None)
+        self._dir.cleanup()
+
+    def _write_doc(self, a_source: str, a_pyc: bytes | None = None):
+        with ZipFile(self._doc_path, "w") as zout:
+            zout.writestr("content.xml", "")
+            zout.writestr("Scripts/python/py4lo_doc_a.py", a_source)
+            if a_pyc is not None:
+                zout.writestr("Scripts/python/py4lo_doc_a.pyc", a_pyc)
+            zout.writestr("Scripts/python/py4lo_doc_pkg/__init__.py",
+                          "X = 1\n")
+            zout.writestr("Scripts/python/py4lo_doc_pkg/sub.py",
+                          "from py4lo_doc_pkg import X\nY = X + 1\n")
+
+    def _run_include(self):
+        uno = mock.Mock(fileUrlToSystemPath=lambda url: url)
+        xsc = mock.Mock()
+        xsc.getDocument.return_value.URL = str(self._doc_path)
+        with INC_PATH.open("r", encoding="utf-8") as f:
+            code = f.read()
+        with mock.patch.dict(sys.modules, {"uno": uno}):
+            exec(code, {"XSCRIPTCONTEXT": xsc})  # noqa: S102 # nosec: B102
+        for name in self._module_names:
+            sys.modules.pop(name, None)
+
+    def test_import(self):
+        self._write_doc("def f():\n    return 'a'\n")
+        self._run_include()
+
+        import py4lo_doc_a  # type: ignore
+        import py4lo_doc_pkg.sub  # type: ignore
+
+        self.assertEqual("a", py4lo_doc_a.f())
+        self.assertEqual(str(self._doc_path.joinpath(
+            "Scripts/python/py4lo_doc_a.py")), py4lo_doc_a.__file__)
+        self.assertEqual(2, py4lo_doc_pkg.sub.Y)
+        self.assertEqual("def f():\n    return 'a'\n",
+                         py4lo_doc_a.__loader__.get_source("py4lo_doc_a"))
+
+    def test_code_cache(self):
+        self._write_doc("def f():\n    return 'a'\n")
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        code = py4lo_doc_a.f.__code__
+
+        self._run_include()  # reset the modules
+        import py4lo_doc_a  # type: ignore
+        self.assertIs(code, py4lo_doc_a.f.__code__)
+
+    def test_code_cache_other_document(self):
+        self._write_doc("def f():\n    return 'a'\n")
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        code = py4lo_doc_a.f.__code__
+
+        self._doc_path = Path(self._dir.name, "other.ods")
+        self._write_doc("def f():\n    return 'a'\n")
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        self.assertIsNot(code, py4lo_doc_a.f.__code__)
+        self.assertEqual(str(self._doc_path.joinpath(
+            "Scripts/python/py4lo_doc_a.py")),
+            py4lo_doc_a.f.__code__.co_filename)
+
+    def test_modified_document(self):
+        self._write_doc("def f():\n    return 'a'\n")
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        self.assertEqual("a", py4lo_doc_a.f())
+
+        self._write_doc("def f():\n    return 'modified'\n")
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        self.assertEqual("modified", py4lo_doc_a.f())
+
+    def test_bytecode(self):
+        source = "def f():\n    return 'a'\n"
+        source_path = Path(self._dir.name, "py4lo_doc_a.py")
+        source_path.write_text(source)
+        py_compile.compile(
+            str(source_path), cfile=str(source_path) + "c",
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        pyc = Path(str(source_path) + "c").read_bytes()
+
+        self._write_doc(source, pyc)
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        # the code object comes from the pyc file
+        self.assertEqual(str(source_path), py4lo_doc_a.f.__code__.co_filename)
+
+    def test_bytecode_mismatch(self):
+        source_path = Path(self._dir.name, "py4lo_doc_a.py")
+        source_path.write_text("def f():\n    return 'a'\n")
+        py_compile.compile(
+            str(source_path), cfile=str(source_path) + "c",
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        pyc = Path(str(source_path) + "c").read_bytes()
+
+        self._write_doc("def f():\n    return 'b'\n", pyc)
+        self._run_include()
+        import py4lo_doc_a  # type: ignore
+        self.assertEqual("b", py4lo_doc_a.f())
+
+
+if __name__ == '__main__':
+    unittest.main()
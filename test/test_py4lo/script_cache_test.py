@@ -0,0 +1,76 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+from pathlib import Path
+
+from core.script import SourceScript, TempScript
+from script_cache import ProcessedScript, ScriptCache
+
+
+class TestScriptCache(unittest.TestCase):
+    def setUp(self):
+        self._source_script = SourceScript(Path("src", "a.py"), Path("src"),
+                                           True)
+        self._processed = ProcessedScript(
+            TempScript(Path("temp", "pro", "a.py"), b"x", Path("temp", "pro"),
+                       [], None),
+            used_variables={"edition": "pro", "python_version": "3.7"})
+
+    def test_get(self):
+        cache = ScriptCache()
+        self.assertIsNone(cache.get(self._source_script, "3.7", False,
+                                    {"edition": "pro"}))
+
+        cache.put(self._source_script, "3.7", False, self._processed)
+
+        self.assertIs(self._processed, cache.get(
+            self._source_script, "3.7", False, {"edition": "pro"}))
+        self.assertIsNone(cache.get(self._source_script, "3.7", False,
+                                    {"edition": "free"}))
+        self.assertIsNone(cache.get(self._source_script, "3.7", True,
+                                    {"edition": "pro"}))
+        self.assertIsNone(cache.get(self._source_script, "3.8", False,
+                                    {"edition": "pro"}))
+
+    def test_rebase(self):
+        rebased = self._processed.rebase(Path("temp", "free"))
+
+        self.assertEqual(Path("temp", "free", "a.py"),
+                         rebased.temp_script.script_path)
+        self.assertEqual(Path("a.py"), rebased.temp_script.relative_path)
+        self.assertEqual(b"x", rebased.temp_script.script_content)
+        self.assertIs(self._processed,
+                      self._processed.rebase(Path("temp", "pro")))
+
+    def test_rebase_added_scripts(self):
+        data_script = TempScript(Path("temp", "pro", "data.py"), b"DATA = 1",
+                                 Path("temp", "pro"), [], None)
+        opt_script = TempScript(Path("opt", "b.py"), b"b = 1", Path("opt"),
+                                [], None)
+        processed = ProcessedScript(self._processed.temp_script,
+                                    added_scripts=[data_script, opt_script])
+
+        rebased = processed.rebase(Path("temp", "free"))
+
+        self.assertEqual(
+            [Path("temp", "free", "data.py"), Path("opt", "b.py")],
+            [s.script_path for s in rebased.added_scripts])
+
+
+if __name__ == '__main__':
+    unittest.main()
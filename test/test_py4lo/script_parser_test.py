@@ -65,7 +65,11 @@ some line""",
         self.verify_open(path)
 
     def test_script_parser_directve_line(self):
-        self._dp.process_line.return_value = ["line1", "line2"]
+        def process_line(_line, output):
+            output.append("line1")
+            output.append("line2")
+
+        self._dp.process_line.side_effect = process_line
         path = file_path_mock(io.StringIO("#some line"))
 
         sp = script_set_processor._ContentParser(self._logger, self._dp, path)
@@ -74,7 +78,7 @@ some line""",
             []), sp.parse(True))
 
         self.assertEqual([], self._logger.mock_calls)
-        self.assertEqual([mock.call.process_line('#some line'),
+        self.assertEqual([mock.call.process_line('#some line', mock.ANY),
                           mock.call.end()],
                          self._dp.mock_calls)
         self.verify_open(path)
@@ -16,6 +16,7 @@
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import io
+import tempfile
 import unittest
 from logging import Logger
 from pathlib import Path
@@ -23,7 +24,9 @@ from unittest import mock
 
 import script_set_processor
 from core.script import SourceScript
-from directives import DirectiveProvider
+from directives import DirectiveProvider, EmbedLib
+from directives.directive_provider import _DirectiveProviderFactory
+from script_cache import ScriptCache
 
 from test.test_helper import file_path_mock, verify_open_path
 
@@ -65,3 +68,115 @@ class TestScriptSetProcessor(unittest.TestCase):
             b'# parsed by py4lo (https://github.com/jferard/py4lo)\nsome line',
             dest.getbuffer())
         verify_open_path(self, source_path, 'r', encoding='utf-8')
+
+    def test_tree_shaking(self):
+        logger: Logger = mock.Mock()
+        with tempfile.TemporaryDirectory() as d:
+            base = Path(d)
+            src_dir = base.joinpath("src")
+            lib_dir = base.joinpath("lib")
+            target_dir = base.joinpath("target")
+            src_dir.mkdir()
+            lib_dir.mkdir()
+            src_dir.joinpath("main.py").write_text(
+                "# py4lo: embed lib mylib\n"
+                "from mylib import used\n"
+                "def main():\n"
+                "    used()\n")
+            lib_dir.joinpath("mylib.py").write_text(
+                "def used():\n    pass\n\n\ndef unused():\n    pass\n")
+            dp = _DirectiveProviderFactory(
+                logger, EmbedLib(lib_dir)).create_provider()
+
+            sp = script_set_processor.ScriptSetProcessor(
+                logger, target_dir, "3.7", dp,
+                [SourceScript(src_dir.joinpath("main.py"), src_dir, True)],
+                True)
+            scripts = sp.process()
+
+            lib_text = target_dir.joinpath("mylib.py").read_text()
+
+        self.assertEqual([Path("main.py"), Path("mylib.py")],
+                         [s.relative_path for s in scripts])
+        self.assertEqual(lib_text.encode("utf-8"),
+                         scripts[1].script_content)
+        self.assertIn("def used():", lib_text)
+        self.assertNotIn("def unused():", lib_text)
+
+    def test_minify(self):
+        logger: Logger = mock.Mock()
+        with tempfile.TemporaryDirectory() as d:
+            base = Path(d)
+            src_dir = base.joinpath("src")
+            target_dir = base.joinpath("target")
+            src_dir.mkdir()
+            src_dir.joinpath("main.py").write_text(
+                '"""doc"""\n'
+                "# comment\n"
+                "\n"
+                "def main():\n"
+                "    pass\n")
+            dp = _DirectiveProviderFactory(logger).create_provider()
+
+            sp = script_set_processor.ScriptSetProcessor(
+                logger, target_dir, "3.7", dp,
+                [SourceScript(src_dir.joinpath("main.py"), src_dir, True)],
+                minify_dirs=[src_dir])
+            scripts = sp.process()
+
+            text = target_dir.joinpath("main.py").read_text()
+            line_map = target_dir.joinpath("main.py.map").read_text()
+
+        self.assertEqual(
+            "def main():\n    pass\ng_exportedScripts = (main,)\n", text)
+        self.assertEqual([4, 5, 0], scripts[0].line_map)
+        self.assertEqual("[4, 5, 0]", line_map)
+
+    def test_targets(self):
+        logger: Logger = mock.Mock()
+        with tempfile.TemporaryDirectory() as d:
+            base = Path(d)
+            src_dir = base.joinpath("src")
+            src_dir.mkdir()
+            src_dir.joinpath("common.py").write_text(
+                "# py4lo: if $python_version >= 3.0\n"
+                "X = 3\n"
+                "# py4lo: endif\n")
+            src_dir.joinpath("edition.py").write_text(
+                "# py4lo: if $edition == pro\n"
+                "PRO = True\n"
+                "# py4lo: else\n"
+                "PRO = False\n"
+                "# py4lo: endif\n")
+            source_scripts = [
+                SourceScript(src_dir.joinpath("common.py"), src_dir, True),
+                SourceScript(src_dir.joinpath("edition.py"), src_dir, True)]
+            dp = _DirectiveProviderFactory(logger).create_provider()
+            script_cache = ScriptCache()
+
+            scripts_by_edition = {}
+            with mock.patch.object(
+                    script_set_processor.ScriptSetProcessor, "_parse_script",
+                    autospec=True, side_effect=script_set_processor
+                    .ScriptSetProcessor._parse_script) as parse_mock:
+                for edition in ("pro", "free", "pro"):
+                    sp = script_set_processor.ScriptSetProcessor(
+                        logger, base.joinpath(edition), "3.7", dp,
+                        source_scripts, variables={"edition": edition},
+                        script_cache=script_cache)
+                    scripts_by_edition[edition] = sp.process()
+
+        # common.py once, edition.py once by edition
+        self.assertEqual(3, len(parse_mock.mock_calls))
+        content_by_path = {}
+        for edition, scripts in scripts_by_edition.items():
+            self.assertEqual(
+                [base.joinpath(edition, "common.py"),
+                 base.joinpath(edition, "edition.py")],
+                sorted(s.script_path for s in scripts))
+            content_by_path.update(
+                (s.script_path, s.script_content) for s in scripts)
+        self.assertIn(b"PRO = True",
+                      content_by_path[base.joinpath("pro", "edition.py")])
+        self.assertIn(b"PRO = False",
+                      content_by_path[base.joinpath("free", "edition.py")])
@@ -0,0 +1,113 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import tempfile
+import unittest
+from logging import Logger
+from pathlib import Path
+from unittest import mock
+
+from core.script import TempScript
+from temp_writer import (
+    AsyncTempWriter,
+    NullTempWriter,
+    SyncTempWriter,
+    create_temp_writer,
+)
+
+
+class TestTempWriter(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._temp_dir = Path(self._dir.name)
+        self._script = TempScript(self._temp_dir.joinpath("a", "b.py"),
+                                  b"X = 1\n", self._temp_dir, [], None)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_sync(self):
+        logger: Logger = mock.Mock()
+        SyncTempWriter(logger).write(self._script)
+
+        self.assertEqual(b"X = 1\n", self._script.script_path.read_bytes())
+        self.assertEqual([
+            mock.call.debug("Writing temp script: %s (%s)", Path("a/b.py"),
+                            self._script.script_path)
+        ], logger.mock_calls)
+
+    def test_line_map(self):
+        logger: Logger = mock.Mock()
+        script = TempScript(self._script.script_path, b"X = 1\n",
+                            self._temp_dir, [], None, [3])
+        SyncTempWriter(logger).write(script)
+
+        map_path = self._temp_dir.joinpath("a", "b.py.map")
+        self.assertEqual([3], json.loads(map_path.read_text("utf-8")))
+
+    def test_async(self):
+        logger: Logger = mock.Mock()
+        writer = AsyncTempWriter(logger)
+        writer.write(self._script)
+        writer.wait()
+
+        self.assertEqual(b"X = 1\n", self._script.script_path.read_bytes())
+
+    def test_async_error(self):
+        logger: Logger = mock.Mock()
+        self._temp_dir.joinpath("a").write_bytes(b"")  # not a dir
+        writer = AsyncTempWriter(logger)
+        writer.write(self._script)
+        writer.wait()
+
+        self.assertEqual("warning", logger.mock_calls[-1][0])
+        self.assertFalse(self._script.script_path.exists())
+
+    def test_async_wait_without_write(self):
+        logger: Logger = mock.Mock()
+        AsyncTempWriter(logger).wait()
+
+        self.assertEqual([], logger.mock_calls)
+
+    def test_null(self):
+        NullTempWriter().write(self._script)
+
+        self.assertFalse(self._script.script_path.exists())
+
+    def test_create(self):
+        logger: Logger = mock.Mock()
+        self.assertIsInstance(create_temp_writer(logger, "sync"),
+                              SyncTempWriter)
+        self.assertIsInstance(create_temp_writer(logger, "async"),
+                              AsyncTempWriter)
+        self.assertIsInstance(create_temp_writer(logger, "off"),
+                              NullTempWriter)
+        self.assertEqual([], logger.mock_calls)
+
+    def test_create_unknown(self):
+        logger: Logger = mock.Mock()
+        self.assertIsInstance(create_temp_writer(logger, "foo"),
+                              SyncTempWriter)
+        self.assertEqual([
+            mock.call.warning("Unknown temp writes mode `%s`, use `sync`",
+                              "foo")
+        ], logger.mock_calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,8 @@ class TestTools(unittest.TestCase):
              lambda x: x * 2),
             ({'a': {'b': [2, 4, 6, 8]}}, {'a': {'b': [1]}},
              {'a': {'b': [2, 3, 4]}},
-             lambda x: x * 2)
+             lambda x: x * 2),
+            ({'a': [{'b': 2}, {'c': 4}]}, {}, {'a': [{'b': 1}, {'c': 2}]},
+             lambda x: x * 2),
         ]:
             self.assertEqual(expected, nested_merge(d1, d2, func))
@@ -0,0 +1,133 @@
+#  Py4LO - Python Toolkit For LibreOffice Calc
+#     Copyright (C) 2016-2026 J. Férard <https://github.com/jferard>
+#
+#     This file is part of Py4LO.
+#
+#     Py4LO is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Py4LO is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+from logging import Logger
+from pathlib import Path
+from unittest import mock
+
+from core.script import TempScript
+from tree_shaker import TreeShaker
+
+LIB_A = '''"""lib a"""
+import logging
+import os, sys
+from lib_b import g, h
+
+_logger = logging.getLogger(__name__)
+CONST = 1
+UNUSED_CONST = 2
+
+try:
+    import uno
+except ImportError:
+    uno = None
+
+
+def f():
+    return g() + CONST
+
+
+@decorator
+def decorated():
+    return os.sep
+
+
+def unused():
+    return h()
+
+
+class A:
+    def m(self):
+        return decorated()
+'''
+
+LIB_B = '''
+def g():
+    return 1
+
+
+def h():
+    return 2
+'''
+
+
+def _temp_script(name: str, text: str) -> TempScript:
+    return TempScript(Path("temp", name), text.encode("utf-8"),
+                      Path("temp"), [], None)
+
+
+class TestTreeShaker(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self._lib_scripts = [_temp_script("lib_a.py", LIB_A),
+                             _temp_script("lib_b.py", LIB_B)]
+
+    def _shake(self, text: str) -> list[str]:
+        logger: Logger = mock.Mock()
+        shaker = TreeShaker(logger, self._lib_scripts,
+                            [_temp_script("main.py", text)])
+        return [s.script_content.decode("utf-8") for s in shaker.shake()]
+
+    def test_from_import(self):
+        a, b = self._shake("from lib_a import f\nf()\n")
+        self.assertEqual(
+            "# pruned by py4lo: only the reachable statements were kept\n\n"
+            "from lib_b import g\n\n"
+            "CONST = 1\n\n"
+            "try:\n"
+            "    import uno\n"
+            "except ImportError:\n"
+            "    uno = None\n\n"
+            "def f():\n"
+            "    return g() + CONST\n", a)
+        self.assertEqual(
+            "# pruned by py4lo: only the reachable statements were kept\n\n"
+            "def g():\n"
+            "    return 1\n", b)
+
+    def test_attribute(self):
+        a, b = self._shake("import lib_a as la\nla.A().m()\n")
+        self.assertIn("import os", a)
+        self.assertNotIn("import os, sys", a)
+        self.assertIn("@decorator\ndef decorated():", a)
+        self.assertIn("class A:", a)
+        self.assertNotIn("def f():", a)
+        self.assertNotIn("def g():", b)
+
+    def test_module_as_value(self):
+        a, b = self._shake("import lib_a\nprint(lib_a)\n")
+        self.assertEqual(LIB_A, a)
+        self.assertIn("def h():", b)
+
+    def test_star_import(self):
+        a, b = self._shake("from lib_b import *\n")
+        self.assertNotIn("def f():", a)  # lib_a is not used
+        self.assertEqual(LIB_B, b)
+
+    def test_syntax_error(self):
+        a, b = self._shake("from lib_a import f\nf(\n")
+        self.assertEqual(LIB_A, a)
+        self.assertEqual(LIB_B, b)
+
+    def test_pruned_scripts_compile(self):
+        for text in self._shake("from lib_a import A, f\n"):
+            compile(text, "<pruned>", "exec")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,18 +15,26 @@
 #
 #     You should have received a copy of the GNU General Public License
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import tempfile
+import time
 import unittest
+import zipfile
 from logging import Logger
 from pathlib import Path
 from unittest import mock
 
-from callbacks import BeforeCallback
-from zip_updater import ZipUpdaterBuilder
+from blob_cache import BlobCache
+from callbacks import AddAssets, AddScripts, BeforeCallback
+from compression_policy import STORED, CompressionPolicy, CompressionRule
+from core.asset import DestinationAsset
+from core.script import DestinationScript
+from zip_updater import FIXED_DATE_TIME, ZipUpdaterBuilder
 
 
 class TestZipUpdater(unittest.TestCase):
+    @mock.patch('zip_updater.FixedDateZipFile', autospec=True)
     @mock.patch('zip_updater.ZipFile', autospec=True)
-    def test(self, zf):
+    def test(self, zf, fzf):
         logger: Logger = mock.Mock()
         zub = ZipUpdaterBuilder(logger)
 
@@ -37,7 +45,7 @@ class TestZipUpdater(unittest.TestCase):
         a1 = mock.Mock()
         a2 = mock.Mock()
 
-        zout = mock.Mock()
+        zout = mock.MagicMock()
         p = mock.PropertyMock()
         type(zout).comment = p
         zin = mock.Mock(comment="a")
@@ -50,7 +58,8 @@ class TestZipUpdater(unittest.TestCase):
         rin.__enter__.return_value = zin
         rin.__exit__.return_value = False
 
-        zf.side_effect = [rout, rin]
+        fzf.side_effect = [rout]
+        zf.side_effect = [rin]
 
         b1.call.return_value = True
         b2.call.return_value = False
@@ -74,3 +83,67 @@ class TestZipUpdater(unittest.TestCase):
             i2.call.mock_calls)
         a1.call.assert_called_once_with(zout)
         a2.call.assert_called_once_with(zout)
+
+    def test_deterministic(self):
+        logger: Logger = mock.Mock()
+        scripts = [DestinationScript(Path("Scripts/python/a.py"), b"a = 1",
+                                     Path("Scripts/python"), [], None)]
+        with tempfile.TemporaryDirectory() as d:
+            source = Path(d, "source.ods")
+            with zipfile.ZipFile(source, "w") as zsource:
+                zsource.writestr("mimetype", "x")
+                zsource.writestr(zipfile.ZipInfo(
+                    "content.xml", (2020, 5, 6, 7, 8, 10)), "<x/>")
+            datas = []
+            for i in range(2):
+                dest = Path(d, f"dest{i}.ods")
+                # one hour later
+                with mock.patch("time.time",
+                                return_value=time.time() + i * 3600):
+                    ZipUpdaterBuilder(logger).after(
+                        AddScripts(logger, scripts)).build().update(
+                        source, dest)
+                datas.append(dest.read_bytes())
+            with zipfile.ZipFile(Path(d, "dest0.ods")) as zdest:
+                date_times = [zi.date_time for zi in zdest.infolist()]
+                names = zdest.namelist()
+                content = zdest.read("Scripts/python/a.py")
+
+        self.assertEqual(datas[0], datas[1])
+        self.assertEqual(["mimetype", "content.xml", "Scripts/python/a.py"],
+                         names)
+        self.assertEqual([FIXED_DATE_TIME] * 3, date_times)
+        self.assertEqual(b"a = 1", content)
+
+    def test_deterministic_assets(self):
+        # streamed and raw (blob cache) entries
+        logger: Logger = mock.Mock()
+        policy = CompressionPolicy([CompressionRule("*.png", STORED)], 6)
+        with tempfile.TemporaryDirectory() as d:
+            source = Path(d, "source.ods")
+            with zipfile.ZipFile(source, "w") as zsource:
+                zsource.writestr("mimetype", "x")
+            asset_path = Path(d, "a.txt")
+            asset_path.write_bytes(b"text " * 1000)
+            assets = [
+                DestinationAsset(Path("Assets/a.txt"), source_path=asset_path),
+                DestinationAsset(Path("Assets/b.png"), b"png"),
+            ]
+            blob_cache = BlobCache(logger, Path(d, "cache"))
+            datas = []
+            for i in range(3):
+                dest = Path(d, f"dest{i}.ods")
+                with mock.patch("time.time",
+                                return_value=time.time() + i * 3600):
+                    ZipUpdaterBuilder(logger).after(
+                        AddAssets(assets, policy, blob_cache)
+                    ).build().update(source, dest)
+                datas.append(dest.read_bytes())
+            with zipfile.ZipFile(Path(d, "dest2.ods")) as zdest:
+                date_times = [zi.date_time for zi in zdest.infolist()]
+                content = zdest.read("Assets/a.txt")
+
+        self.assertEqual(datas[0], datas[1])
+        self.assertEqual(datas[0], datas[2])
+        self.assertEqual([FIXED_DATE_TIME] * 3, date_times)
+        self.assertEqual(b"text " * 1000, content)